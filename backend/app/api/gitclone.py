@@ -1,10 +1,9 @@
 import tempfile
 import subprocess
 import os
-import json
 import uuid
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Literal
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
@@ -13,10 +12,15 @@ import app.server as state
 from app.engine_rag.retriever import GraphRetriever
 
 from app.engine_rag.chunker import SmartChunker
-from app.engine_rag.vector_db import ChromaCloudDB
-from app.engine_ast.analyzer import build_unified_model
+from app.engine_rag.streaming import prefetch
+from app.engine_rag.vector_db import get_vector_store
+from app.engine_ast.analyzer import build_unified_model, upgrade_unified_model
+from app.engine_ast.cache import AnalysisCache
+from app.engine_ast.gitrepo import clone_bytes_report, load_checkout_sources, load_git_sources, sparse_clone
+from app.engine_ast.isolation import FileLimits
 from app.engine_ast.flowchart.flow_builder import build_simple_file_graph
 from app.engine_ast.flowchart.exporter import export_mermaid
+from app.instrumentation import Profiler
 
 logger = logging.getLogger(__name__)
 
@@ -24,75 +28,151 @@ logger = logging.getLogger(__name__)
 jobs: Dict[str, Any] = {}
 
 
-def ingest_github_repo(job_id: str, repo_url: str):
-    try:
-        jobs[job_id] = {"status": "cloning", "message": "Cloning repository..."}
+def render_mermaid(graph: Dict[str, Any], output_dir: str) -> str:
+    flowchart_file = os.path.join(output_dir, "flowchart.md")
+    export_mermaid(graph, flowchart_file)
+    with open(flowchart_file, "r", encoding="utf-8") as f:
+        return f.read()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
 
-            result = subprocess.run(
-                ["git", "clone", "--depth=1", repo_url, temp_dir],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode != 0:
-                jobs[job_id] = {
-                    "status": "failed",
-                    "message": f"Git clone failed: {result.stderr.strip()}"
-                }
-                return
-
-            jobs[job_id] = {"status": "analyzing", "message": "Running AST analysis..."}
-            analysis_result = build_unified_model(temp_dir)
+def ingest_github_repo(
+    job_id: str,
+    repo_url: str,
+    clone_mode: str = "checkout",
+    skim_first: bool = False
+):
+    """
+    clone_mode "checkout" analyzes a regular shallow clone; "objects" clones
+    bare and streams sources from git objects, so no working tree is written;
+    "sparse" is a blobless partial clone that only checks out Python files.
 
-            # Attach file source text so frontend can render code tabs and function bodies.
-            for file_path, file_meta in analysis_result.get("files", {}).items():
-                source_path = os.path.join(temp_dir, file_path)
-                try:
-                    with open(source_path, "r", encoding="utf-8") as source_file:
-                        file_meta["source"] = source_file.read()
-                except FileNotFoundError:
-                    file_meta["source"] = ""
+    skim_first publishes the file graph from a skim analysis while the job is
+    still running, then upgrades that model with the full call analysis.
 
-            analysis_file = os.path.join(temp_dir, "analysis.json")
-            with open(analysis_file, "w", encoding="utf-8") as f:
-                json.dump(analysis_result, f, indent=2)
+    Every job status carries "profile": wall/CPU time and peak memory per
+    stage plus the slowest analyzed files (see app.instrumentation).
+    """
+    profiler = Profiler()
 
-            jobs[job_id] = {"status": "ingesting", "message": "Uploading to vector database..."}
-            chunker = SmartChunker(analysis_file, temp_dir)
-            chunks = chunker.extract_chunks()
+    def set_job(status: str, message: str, **extra: Any) -> None:
+        # Stage timings so far travel with every status update, so slow phases show up live.
+        jobs[job_id] = {"status": status, "message": message, **extra, "profile": profiler.report()}
 
-            db = ChromaCloudDB(collection_name="codesherpa_real_repo")
-            db.ingest_chunks(chunks)
+    try:
+        set_job("cloning", "Cloning repository...")
 
-            state.retriever = GraphRetriever(db)
-            logger.info("Global retriever updated to new collection.")
+        with tempfile.TemporaryDirectory() as temp_dir:
 
-            jobs[job_id] = {"status": "charting", "message": "Generating architecture graph..."}
-            graph = build_simple_file_graph(analysis_result)
+            repo_dir = os.path.join(temp_dir, "repo.git") if clone_mode == "objects" else temp_dir
+
+            with profiler.stage("clone"):
+                if clone_mode == "sparse":
+                    try:
+                        clone_bytes = sparse_clone(repo_url, repo_dir)
+                    except RuntimeError as exc:
+                        set_job("failed", f"Git clone failed: {exc}")
+                        return
+                else:
+                    clone_cmd = ["git", "clone", "--depth=1", repo_url, repo_dir]
+                    if clone_mode == "objects":
+                        clone_cmd.insert(2, "--bare")
+                    result = subprocess.run(
+                        clone_cmd,
+                        capture_output=True,
+                        text=True
+                    )
+                    if result.returncode != 0:
+                        set_job("failed", f"Git clone failed: {result.stderr.strip()}")
+                        return
+                    clone_bytes = clone_bytes_report(repo_dir, bare=clone_mode == "objects")
+            logger.info(f"Clone ({clone_mode}) bytes: {clone_bytes}")
+
+            set_job("analyzing", "Running AST analysis...")
+            # Every file is read exactly once; analysis, the API payload and chunking share the text.
+            if clone_mode == "objects":
+                with profiler.stage("read_objects"):
+                    sources = load_git_sources(repo_dir)
+            else:
+                with profiler.stage("read_sources"):
+                    sources = load_checkout_sources(repo_dir)
+            analysis_cache = AnalysisCache.from_env()
+            # SHERPA_FILE_LIMITS=on: one pathological file must not stall or kill the job.
+            file_limits = FileLimits.from_env()
+            cache_stats = None
+            try:
+                if skim_first:
+                    with profiler.stage("skim"):
+                        skim_result = build_unified_model(
+                            repo_dir, workers=None, cache=analysis_cache, sources=sources, skim=True,
+                            profiler=profiler, limits=file_limits
+                        )
+                        skim_graph = build_simple_file_graph(skim_result)
+                        skim_chart = render_mermaid(skim_graph, temp_dir)
+                    set_job(
+                        "analyzing",
+                        "File graph ready; resolving calls...",
+                        mermaid_chart=skim_chart,
+                        raw_ast={
+                            "entry_point": skim_result.get("entry_point"),
+                            "files": skim_result.get("files", {}),
+                            "graph": skim_graph
+                        }
+                    )
+                    with profiler.stage("upgrade"):
+                        analysis_result = upgrade_unified_model(
+                            repo_dir, skim_result, workers=None, cache=analysis_cache, sources=sources,
+                            profiler=profiler, limits=file_limits
+                        )
+                else:
+                    with profiler.stage("analysis"):
+                        analysis_result = build_unified_model(
+                            repo_dir, workers=None, cache=analysis_cache, sources=sources, profiler=profiler,
+                            limits=file_limits
+                        )
+            finally:
+                if analysis_cache:
+                    cache_stats = analysis_cache.stats()
+                    analysis_cache.close()
+                    logger.info(f"Analysis cache: {cache_stats}")
 
-            flowchart_file = os.path.join(temp_dir, "flowchart.md")
-            export_mermaid(graph, flowchart_file)
+            # Attach file source text so frontend can render code tabs and function bodies.
+            with profiler.stage("attach_sources"):
+                for file_path, file_meta in analysis_result.get("files", {}).items():
+                    source = sources.get(file_path)
+                    file_meta["source"] = source if isinstance(source, str) else ""
+
+            set_job("ingesting", "Uploading to vector database...")
+            # Chunking runs on a background thread while batches upload; Chroma computes
+            # the embeddings inside upsert, so chunking, embedding and upload are timed together.
+            with profiler.stage("chunk_embed_upload") as record:
+                chunker = SmartChunker(model=analysis_result, sources=sources)
+                db = get_vector_store(collection_name="codesherpa_real_repo")
+                upload_stats = db.ingest_chunks(prefetch(chunker.iter_chunks()))
+                record.update(upload_stats)
 
-            with open(flowchart_file, "r", encoding="utf-8") as f:
-                mermaid_string = f.read()
+            state.retriever = GraphRetriever(db)
+            logger.info("Global retriever updated to new collection.")
 
-        jobs[job_id] = {
-            "status": "complete",
-            "message": "Repository fully mapped and ingested.",
-            "mermaid_chart": mermaid_string,
-            "raw_ast": {
+            set_job("charting", "Generating architecture graph...")
+            with profiler.stage("flowchart"):
+                graph = build_simple_file_graph(analysis_result)
+                mermaid_string = render_mermaid(graph, temp_dir)
+
+        set_job(
+            "complete",
+            "Repository fully mapped and ingested.",
+            mermaid_chart=mermaid_string,
+            analysis_cache=cache_stats,
+            clone_bytes=clone_bytes,
+            raw_ast={
                 "entry_point": analysis_result.get("entry_point"),
                 "files": analysis_result.get("files", {}),
                 "graph": graph
             }
-        }
+        )
 
     except Exception as e:
-        jobs[job_id] = {
-            "status": "failed",
-            "message": str(e)
-        }
+        set_job("failed", str(e))
 
 
 router = APIRouter()
@@ -100,13 +180,17 @@ router = APIRouter()
 
 class IngestRequest(BaseModel):
     repo_url: str
+    clone_mode: Literal["checkout", "objects", "sparse"] = "checkout"
+    skim_first: bool = False
 
 
 @router.post("/github-repo")
 async def ingest_github_repo_endpoint(request: IngestRequest, background_tasks: BackgroundTasks):
     job_id = str(uuid.uuid4())
     jobs[job_id] = {"status": "queued", "message": "Job queued."}
-    background_tasks.add_task(ingest_github_repo, job_id, request.repo_url)
+    background_tasks.add_task(
+        ingest_github_repo, job_id, request.repo_url, request.clone_mode, request.skim_first
+    )
     return {"status": "queued", "job_id": job_id}
 
 
@@ -121,10 +205,10 @@ async def get_job_status(job_id: str):
 @router.post("/reset")
 async def reset_session_endpoint():
     try:
-        db = ChromaCloudDB(collection_name="codesherpa_real_repo")
+        db = get_vector_store(collection_name="codesherpa_real_repo")
         db.clear_collection()
 
-        db_ast = ChromaCloudDB(collection_name="codesherpa_ast")
+        db_ast = get_vector_store(collection_name="codesherpa_ast")
         db_ast.clear_collection()
 
         return {"status": "success", "message": "Chroma DB collections cleared."}
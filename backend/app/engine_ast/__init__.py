@@ -3,25 +3,50 @@ Analyzer package for CODE_Sherpa.
 
 Public API:
 - get_python_files
+- iter_python_files
 - analyze_file
 - analyze_repo_files
 - build_unified_model
+- upgrade_unified_model
+- trace_call_chain
+- get_callers
+- AnalysisCache
+- CallGraph
+- ReachabilityIndex
+- find_dead_code_candidates
+- read_model
+- write_model
 """
 
-from .parser import get_python_files
+from .parser import get_python_files, iter_python_files
 from .analyzer import (
     analyze_file,
     analyze_repo_files,
     build_unified_model,
+    upgrade_unified_model,
     build_resolved_call_adjacency,
     trace_call_chain,
+    get_callers,
 )
+from .cache import AnalysisCache
+from .callgraph import CallGraph
+from .reachability import ReachabilityIndex, find_dead_code_candidates
+from .serialization import read_model, write_model
 
 __all__ = [
     "get_python_files",
+    "iter_python_files",
     "analyze_file",
     "analyze_repo_files",
     "build_unified_model",
+    "upgrade_unified_model",
     "build_resolved_call_adjacency",
     "trace_call_chain",
+    "get_callers",
+    "AnalysisCache",
+    "CallGraph",
+    "ReachabilityIndex",
+    "find_dead_code_candidates",
+    "read_model",
+    "write_model",
 ]
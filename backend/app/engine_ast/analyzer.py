@@ -6,12 +6,35 @@ Now includes:
 - Intra-file raw call extraction
 - Inter-file call target resolution (best-effort, deterministic)
 - Global resolved call edges in unified model metadata
+- Reverse call index (callee -> callers) in unified model metadata
+- Import cycles, condensation DAG and layering of the file dependency graph
+- Optional process-pool fan-out for large repositories
+- Optional content-addressed cache of per-file results
+- Incremental model updates for a set of changed files
+- Analysis of in-memory sources (e.g. blobs read from git objects)
+- Skim mode (imports and definitions only) with a later upgrade to full call analysis
+- Optional per-stage and per-file timing through app.instrumentation.Profiler
+- Optional per-file CPU / memory limits in isolated workers (app.engine_ast.isolation)
 """
 
 import ast
+import hashlib
+import heapq
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Set, Optional, List, Tuple, Any
+from typing import Callable, Dict, Set, Optional, List, Tuple, Any, Union, TYPE_CHECKING
+
+from app.engine_ast.skim import parse_outline
+from app.instrumentation import FileTiming, stage
+
+if TYPE_CHECKING:
+    from app.engine_ast.cache import AnalysisCache
+    from app.engine_ast.callgraph import CallGraph
+    from app.engine_ast.isolation import FileLimits
+    from app.instrumentation import Profiler
 
 
 def rel_file_to_module(rel_path: str) -> str:
@@ -37,12 +60,70 @@ def canonicalize_module(module_name: str, alias_map: Dict[str, str]) -> str:
     return alias_map.get(module_name, module_name)
 
 
-def parse_python_file(file_path: Path) -> Tuple[Optional[ast.AST], Optional[str]]:
+# Bump whenever per-file output (analyze_source, failed_analysis) changes shape or
+# semantics; invalidates cached results.
+# 2: failure_reason on failed files, reported as parse_errors[].reason.
+ANALYZER_VERSION = "2"
+
+
+def module_alias_context(alias_map: Dict[str, str]) -> str:
+    # Identity entries never change canonicalize_module output, so only true aliases count.
+    aliases = sorted((alias, canonical) for alias, canonical in alias_map.items() if alias != canonical)
+    return hashlib.sha1(json.dumps(aliases).encode("utf-8")).hexdigest()
+
+
+def analysis_cache_key(source: str, rel_path: str, alias_context: str, skim: bool = False) -> str:
+    version = f"{ANALYZER_VERSION}-skim" if skim else ANALYZER_VERSION
+    digest = hashlib.sha256()
+    digest.update(f"{version}\0{rel_path}\0{alias_context}\0".encode("utf-8"))
+    digest.update(source.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+class UnreadableSource:
+    """Stands in a sources mapping for a file that exists but could not be read or decoded."""
+
+    __slots__ = ("error", "reason")
+
+    def __init__(self, error: str, reason: str):
+        self.error = error
+        self.reason = reason
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, UnreadableSource) and (self.error, self.reason) == (other.error, other.reason)
+
+    def __repr__(self) -> str:
+        return f"UnreadableSource({self.error!r}, {self.reason!r})"
+
+    def analysis(self) -> Dict:
+        return failed_analysis(self.error, self.reason)
+
+
+# Relative path -> source text, or UnreadableSource for files that are kept but fail analysis.
+SourceMap = Dict[str, Union[str, UnreadableSource]]
+
+
+def read_python_source(file_path: Path) -> Union[str, UnreadableSource]:
     try:
-        source = file_path.read_text(encoding="utf-8")
-        return ast.parse(source, filename=str(file_path)), None
+        return file_path.read_text(encoding="utf-8")
+    except UnicodeDecodeError as exc:
+        return UnreadableSource(str(exc), "decode_error")
     except Exception as exc:
-        return None, str(exc)
+        return UnreadableSource(str(exc), "read_error")
+
+
+def failed_analysis(parse_error: Optional[str], failure_reason: Optional[str] = None) -> Dict:
+    """Empty result for a file that could not be analyzed; failure_reason says why (a limit, a bad encoding)."""
+    result = {
+        "entry": False,
+        "imports": [],
+        "classes": {},
+        "functions": {},
+        "parse_error": parse_error
+    }
+    if failure_reason is not None:
+        result["failure_reason"] = failure_reason
+    return result
 
 
 def resolve_relative_import(
@@ -77,17 +158,91 @@ def resolve_relative_import(
 
 
 def get_attr_chain(node: ast.AST) -> Optional[List[str]]:
-    if isinstance(node, ast.Name):
-        return [node.id]
-    if isinstance(node, ast.Attribute):
-        parent = get_attr_chain(node.value)
-        if parent is None:
-            return None
-        return parent + [node.attr]
-    return None
+    parts: List[str] = []
+    while type(node) is ast.Attribute:
+        parts.append(node.attr)
+        node = node.value
+    if type(node) is not ast.Name:
+        return None
+    parts.append(node.id)
+    parts.reverse()
+    return parts
+
+
+# Body events recorded by collect_body_events, replayed by FunctionBodyResolver.
+CALL_EVENT = 0
+BIND_EVENT = 1
+
+# Fields that only ever hold operator/context singletons, never calls or bindings.
+LEAF_FIELDS = {"ctx", "op", "ops"}
+_child_fields_by_type: Dict[type, Tuple[str, ...]] = {}
+
+
+def child_fields(node_type: type) -> Tuple[str, ...]:
+    fields = _child_fields_by_type.get(node_type)
+    if fields is None:
+        fields = tuple(name for name in reversed(node_type._fields) if name not in LEAF_FIELDS)
+        _child_fields_by_type[node_type] = fields
+    return fields
+
+
+def collect_body_events(body: List[ast.stmt]) -> List[Tuple[int, Optional[str], List[str]]]:
+    """
+    Walk a function body once, in source (pre-)order, recording call sites and
+    instance-type bindings as attribute chains. Nothing is resolved here, so
+    collection can run before the module's symbol tables are complete.
+    """
+    events: List[Tuple[int, Optional[str], List[str]]] = []
+    # Call nodes whose chain was already computed for a binding.
+    known_chains: Dict[int, Optional[List[str]]] = {}
+    stack: List[ast.AST] = list(reversed(body))
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is ast.Call:
+            node_id = id(node)
+            chain = known_chains.pop(node_id) if node_id in known_chains else get_attr_chain(node.func)
+            if chain:
+                events.append((CALL_EVENT, None, chain))
+        elif node_type is ast.Assign:
+            value = node.value
+            if type(value) is ast.Call:
+                chain = get_attr_chain(value.func)
+                known_chains[id(value)] = chain
+                if chain is not None:
+                    for target in node.targets:
+                        if type(target) is ast.Name:
+                            events.append((BIND_EVENT, target.id, chain))
+        elif node_type is ast.AnnAssign:
+            value = node.value
+            if type(value) is ast.Call and type(node.target) is ast.Name:
+                chain = get_attr_chain(value.func)
+                known_chains[id(value)] = chain
+                if chain is not None:
+                    events.append((BIND_EVENT, node.target.id, chain))
+        elif node_type is ast.With or node_type is ast.AsyncWith:
+            for item in node.items:
+                context_expr = item.context_expr
+                if type(item.optional_vars) is ast.Name and type(context_expr) is ast.Call:
+                    chain = get_attr_chain(context_expr.func)
+                    known_chains[id(context_expr)] = chain
+                    if chain is not None:
+                        events.append((BIND_EVENT, item.optional_vars.id, chain))
+        # Push children in reverse field order so they pop in ast.iter_child_nodes order.
+        for field in child_fields(node_type):
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in reversed(value):
+                    if isinstance(item, ast.AST):
+                        stack.append(item)
+            elif isinstance(value, ast.AST):
+                stack.append(value)
+    return events
+
 
+class FunctionBodyResolver:
+    """Resolves recorded body events against one module's symbol tables."""
 
-class FunctionBodyResolver(ast.NodeVisitor):
     def __init__(
         self,
         current_module: str,
@@ -106,6 +261,14 @@ class FunctionBodyResolver(ast.NodeVisitor):
         self.local_var_types: Dict[str, str] = {}
         self.raw_calls: Set[str] = set()
         self.resolved_calls: Set[str] = set()
+        self._adapter_symbols: Optional[List[str]] = None
+
+    def begin_function(self, current_class: Optional[str]) -> None:
+        """Reset per-function state so one resolver can serve a whole file."""
+        self.current_class = current_class
+        self.local_var_types = {}
+        self.raw_calls = set()
+        self.resolved_calls = set()
 
     def qualify_local(self, name: str) -> str:
         if self.current_class:
@@ -125,6 +288,14 @@ class FunctionBodyResolver(ast.NodeVisitor):
             return f"{self.current_module}.{name}"
         return None
 
+    def adapter_symbols(self) -> List[str]:
+        if self._adapter_symbols is None:
+            self._adapter_symbols = sorted(
+                value for value in self.import_symbols.values()
+                if value.split(".")[-1].endswith("Adapter")
+            )
+        return self._adapter_symbols
+
     def resolve_attribute_chain(self, chain: List[str]) -> Optional[str]:
         if not chain:
             return None
@@ -137,10 +308,7 @@ class FunctionBodyResolver(ast.NodeVisitor):
             var_type = self.local_var_types[base]
             # Heuristic: adapter objects returned from get_adapter map to known Adapter classes.
             if var_type.endswith(".get_adapter"):
-                adapter_symbols = sorted(
-                    value for value in self.import_symbols.values()
-                    if value.split(".")[-1].endswith("Adapter")
-                )
+                adapter_symbols = self.adapter_symbols()
                 if adapter_symbols:
                     return f"{adapter_symbols[0]}.{'.'.join(tail)}"
             return f"{var_type}.{'.'.join(tail)}"
@@ -152,66 +320,114 @@ class FunctionBodyResolver(ast.NodeVisitor):
             return f"{self.current_module}.{self.current_class}.{'.'.join(tail)}"
         return None
 
-    def maybe_capture_instance_type(self, target: ast.AST, value: ast.AST) -> None:
-        if not isinstance(target, ast.Name):
-            return
-        if not isinstance(value, ast.Call):
-            return
-        class_target = self.resolve_call_target(value.func)
-        if class_target:
-            self.local_var_types[target.id] = class_target
+    def resolve_chain(self, chain: List[str]) -> Optional[str]:
+        if len(chain) == 1:
+            return self.resolve_name(chain[0])
+        return self.resolve_attribute_chain(chain)
 
     def resolve_call_target(self, call_func: ast.AST) -> Optional[str]:
         chain = get_attr_chain(call_func)
         if chain is None:
             return None
-        if len(chain) == 1:
-            return self.resolve_name(chain[0])
-        return self.resolve_attribute_chain(chain)
+        return self.resolve_chain(chain)
+
+    def replay(self, events: List[Tuple[int, Optional[str], List[str]]]) -> None:
+        for kind, name, chain in events:
+            resolved = self.resolve_chain(chain)
+            if kind == CALL_EVENT:
+                self.raw_calls.add(chain[-1])
+                if resolved:
+                    self.resolved_calls.add(resolved)
+            elif resolved:
+                self.local_var_types[name] = resolved
+
+
+def is_main_guard(node: ast.If) -> bool:
+    test = node.test
+    if not isinstance(test, ast.Compare):
+        return False
+    if not (len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq) and len(test.comparators) == 1):
+        return False
+    left = test.left
+    right = test.comparators[0]
+    return (
+        (isinstance(left, ast.Name) and left.id == "__name__" and isinstance(right, ast.Constant) and right.value == "__main__")
+        or (isinstance(right, ast.Name) and right.id == "__name__" and isinstance(left, ast.Constant) and left.value == "__main__")
+    )
+
+
+def analyze_file(
+    file_path: Path,
+    rel_path: str,
+    module_alias_map: Dict[str, str],
+    skim: bool = False
+) -> Dict:
+    return analyze_file_timed(file_path, rel_path, module_alias_map, skim=skim)[0]
+
+
+def analyze_file_timed(
+    file_path: Path,
+    rel_path: str,
+    module_alias_map: Dict[str, str],
+    skim: bool = False
+) -> Tuple[Dict, float]:
+    source = read_python_source(file_path)
+    if isinstance(source, UnreadableSource):
+        return source.analysis(), 0.0
+    return analyze_source_timed(source, rel_path, module_alias_map, filename=str(file_path), skim=skim)
 
-    def visit_Assign(self, node: ast.Assign) -> Any:
-        for target in node.targets:
-            self.maybe_capture_instance_type(target, node.value)
-        self.generic_visit(node)
-
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> Any:
-        if node.value is not None:
-            self.maybe_capture_instance_type(node.target, node.value)
-        self.generic_visit(node)
-
-    def visit_With(self, node: ast.With) -> Any:
-        for item in node.items:
-            if item.optional_vars is not None:
-                self.maybe_capture_instance_type(item.optional_vars, item.context_expr)
-        self.generic_visit(node)
-
-    def visit_AsyncWith(self, node: ast.AsyncWith) -> Any:
-        for item in node.items:
-            if item.optional_vars is not None:
-                self.maybe_capture_instance_type(item.optional_vars, item.context_expr)
-        self.generic_visit(node)
-
-    def visit_Call(self, node: ast.Call) -> Any:
-        chain = get_attr_chain(node.func)
-        if chain:
-            self.raw_calls.add(chain[-1])
-        resolved = self.resolve_call_target(node.func)
-        if resolved:
-            self.resolved_calls.add(resolved)
-        self.generic_visit(node)
-
-
-def analyze_file(file_path: Path, rel_path: str, module_alias_map: Dict[str, str]) -> Dict:
-    tree, parse_error = parse_python_file(file_path)
-    if tree is None:
-        return {
-            "entry": False,
-            "imports": [],
-            "classes": {},
-            "functions": {},
-            "parse_error": parse_error
-        }
 
+def analyze_source(
+    source: str,
+    rel_path: str,
+    module_alias_map: Dict[str, str],
+    filename: Optional[str] = None,
+    skim: bool = False
+) -> Dict:
+    return analyze_source_timed(source, rel_path, module_alias_map, filename=filename, skim=skim)[0]
+
+
+def analyze_source_timed(
+    source: str,
+    rel_path: str,
+    module_alias_map: Dict[str, str],
+    filename: Optional[str] = None,
+    skim: bool = False
+) -> Tuple[Dict, float]:
+    """analyze_source, plus the seconds spent parsing."""
+    parse_start = time.perf_counter()
+    try:
+        if skim:
+            tree = parse_outline(source, filename or rel_path)
+        else:
+            tree = ast.parse(source, filename=filename or rel_path)
+    except RecursionError as exc:
+        # Deeply nested expressions exhaust the parser's recursion limit.
+        return failed_analysis(f"RecursionError: {exc}", "recursion_limit"), time.perf_counter() - parse_start
+    except MemoryError as exc:
+        # Raised both for a real allocation failure and for the parser's own stack overflow.
+        error = f"MemoryError: {exc}" if str(exc) else "MemoryError"
+        return failed_analysis(error, "memory_limit"), time.perf_counter() - parse_start
+    except Exception as exc:
+        return failed_analysis(str(exc)), time.perf_counter() - parse_start
+    parse_seconds = time.perf_counter() - parse_start
+    return analyze_tree(tree, rel_path, module_alias_map, skim=skim), parse_seconds
+
+
+def analyze_tree(
+    tree: ast.Module,
+    rel_path: str,
+    module_alias_map: Dict[str, str],
+    skim: bool = False
+) -> Dict:
+    """
+    Single traversal of the module: imports, definitions, the main guard and
+    every function body's call sites / instance bindings are collected in one
+    pass; calls are resolved afterwards, once the symbol tables are complete.
+
+    With skim=True function bodies are never visited: functions only get their
+    line span (no "calls" / "resolved_calls") and FunctionBodyResolver is skipped.
+    """
     current_module = canonicalize_module(rel_file_to_module(rel_path), module_alias_map)
     is_package_module = rel_path.endswith("__init__.py")
 
@@ -221,16 +437,20 @@ def analyze_file(file_path: Path, rel_path: str, module_alias_map: Dict[str, str
     import_symbols: Dict[str, str] = {}
 
     top_level_functions: Set[str] = set()
-    class_methods: Dict[str, Set[str]] = {}
     local_classes: Set[str] = set()
 
+    # (output key, class name, definition node, body events) in source order; no events when skimming.
+    function_records: List[Tuple[str, Optional[str], ast.AST, Optional[List[Tuple[int, Optional[str], List[str]]]]]] = []
+    classes_out: Dict[str, Dict[str, Any]] = {}
+
     for node in tree.body:
-        if isinstance(node, ast.Import):
+        node_type = type(node)
+        if node_type is ast.Import:
             for alias in node.names:
                 imports.add(alias.name)
                 local_name = alias.asname or alias.name.split(".")[0]
                 import_modules[local_name] = canonicalize_module(alias.name, module_alias_map)
-        elif isinstance(node, ast.ImportFrom):
+        elif node_type is ast.ImportFrom:
             imported_names = [a.name for a in node.names]
             resolved_modules = resolve_relative_import(
                 current_module=current_module,
@@ -256,77 +476,59 @@ def analyze_file(file_path: Path, rel_path: str, module_alias_map: Dict[str, str
                     canonical_module = canonicalize_module(resolved_module, module_alias_map)
                     imports.add(canonical_module)
                     import_symbols[local] = canonical_module
-        elif isinstance(node, ast.FunctionDef):
-            top_level_functions.add(node.name)
-        elif isinstance(node, ast.AsyncFunctionDef):
+        elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
             top_level_functions.add(node.name)
-        elif isinstance(node, ast.ClassDef):
+            function_records.append((node.name, None, node, None if skim else collect_body_events(node.body)))
+        elif node_type is ast.ClassDef:
             local_classes.add(node.name)
-            methods: Set[str] = set()
-            for child in node.body:
-                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    methods.add(child.name)
-            class_methods[node.name] = methods
-        elif isinstance(node, ast.If):
-            test = node.test
-            if isinstance(test, ast.Compare):
-                if (
-                    len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)
-                    and len(test.comparators) == 1
-                ):
-                    left = test.left
-                    right = test.comparators[0]
-                    if (
-                        (isinstance(left, ast.Name) and left.id == "__name__" and isinstance(right, ast.Constant) and right.value == "__main__")
-                        or (isinstance(right, ast.Name) and right.id == "__name__" and isinstance(left, ast.Constant) and left.value == "__main__")
-                    ):
-                        has_main_guard = True
-
-    functions_out: Dict[str, Dict[str, Any]] = {}
-    classes_out: Dict[str, Dict[str, Any]] = {}
-
-    for node in tree.body:
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            resolver = FunctionBodyResolver(
-                current_module=current_module,
-                current_class=None,
-                top_level_functions=top_level_functions,
-                local_classes=local_classes,
-                import_modules=import_modules,
-                import_symbols=import_symbols
-            )
-            for body_node in node.body:
-                resolver.visit(body_node)
-            functions_out[node.name] = {
-                "lineno": getattr(node, "lineno", -1),
-                "end_lineno": getattr(node, "end_lineno", -1),
-                "calls": sorted(resolver.raw_calls),
-                "resolved_calls": sorted(resolver.resolved_calls)
-            }
-        elif isinstance(node, ast.ClassDef):
             classes_out[node.name] = {
                 "lineno": getattr(node, "lineno", -1),
                 "end_lineno": getattr(node, "end_lineno", -1)
             }
             for child in node.body:
                 if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    resolver = FunctionBodyResolver(
-                        current_module=current_module,
-                        current_class=node.name,
-                        top_level_functions=top_level_functions,
-                        local_classes=local_classes,
-                        import_modules=import_modules,
-                        import_symbols=import_symbols
-                    )
-                    for body_node in child.body:
-                        resolver.visit(body_node)
-                    key = f"{node.name}.{child.name}"
-                    functions_out[key] = {
-                        "lineno": getattr(child, "lineno", -1),
-                        "end_lineno": getattr(child, "end_lineno", -1),
-                        "calls": sorted(resolver.raw_calls),
-                        "resolved_calls": sorted(resolver.resolved_calls)
-                    }
+                    function_records.append((
+                        f"{node.name}.{child.name}",
+                        node.name,
+                        child,
+                        None if skim else collect_body_events(child.body)
+                    ))
+        elif node_type is ast.If and is_main_guard(node):
+            has_main_guard = True
+
+    if skim:
+        return {
+            "entry": has_main_guard,
+            "imports": sorted(imports),
+            "classes": classes_out,
+            "functions": {
+                key: {
+                    "lineno": getattr(definition, "lineno", -1),
+                    "end_lineno": getattr(definition, "end_lineno", -1)
+                }
+                for key, _, definition, _ in function_records
+            },
+            "parse_error": None
+        }
+
+    resolver = FunctionBodyResolver(
+        current_module=current_module,
+        current_class=None,
+        top_level_functions=top_level_functions,
+        local_classes=local_classes,
+        import_modules=import_modules,
+        import_symbols=import_symbols
+    )
+    functions_out: Dict[str, Dict[str, Any]] = {}
+    for key, class_name, definition, events in function_records:
+        resolver.begin_function(class_name)
+        resolver.replay(events)
+        functions_out[key] = {
+            "lineno": getattr(definition, "lineno", -1),
+            "end_lineno": getattr(definition, "end_lineno", -1),
+            "calls": sorted(resolver.raw_calls),
+            "resolved_calls": sorted(resolver.resolved_calls)
+        }
 
     return {
         "entry": has_main_guard,
@@ -337,38 +539,362 @@ def analyze_file(file_path: Path, rel_path: str, module_alias_map: Dict[str, str
     }
 
 
-def analyze_repo_files(repo_path: str) -> Dict[str, Dict]:
+# Below this many files the process pool costs more to start than it saves.
+PARALLEL_MIN_FILES = 200
+
+
+def resolve_worker_count(workers: Optional[int]) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def pack_size_balanced_batches(sized: List[Tuple[int, Any]], batch_count: int) -> List[List[Any]]:
+    """Greedy longest-first packing of (size, item) pairs into batches of similar total size."""
+    ordered = sorted(sized, key=lambda pair: -pair[0])
+    batch_count = max(1, min(batch_count, len(ordered)))
+    batches: List[List[Any]] = [[] for _ in range(batch_count)]
+    loads = [0] * batch_count
+    for size, item in ordered:
+        lightest = loads.index(min(loads))
+        batches[lightest].append(item)
+        loads[lightest] += size
+    return [batch for batch in batches if batch]
+
+
+def build_size_balanced_batches(
+    repo_path: str,
+    files: List[str],
+    batch_count: int
+) -> List[List[str]]:
+    sized: List[Tuple[int, str]] = []
+    for file_rel_path in sorted(files):
+        try:
+            size = os.path.getsize(os.path.join(repo_path, file_rel_path))
+        except OSError:
+            size = 0
+        sized.append((size, file_rel_path))
+    return pack_size_balanced_batches(sized, batch_count)
+
+
+def analyze_file_batch(
+    batch: List[str],
+    repo_path: str,
+    module_alias_map: Dict[str, str],
+    skim: bool = False
+) -> Tuple[List[Tuple[str, Dict]], List[FileTiming]]:
+    """(file, result) pairs and (file, seconds, parse seconds) timings for a batch."""
+    root = Path(repo_path)
+    results: List[Tuple[str, Dict]] = []
+    timings: List[FileTiming] = []
+    for file_rel_path in batch:
+        start = time.perf_counter()
+        result, parse_seconds = analyze_file_timed(root / file_rel_path, file_rel_path, module_alias_map, skim=skim)
+        timings.append((file_rel_path, time.perf_counter() - start, parse_seconds))
+        results.append((file_rel_path, result))
+    return results, timings
+
+
+def analyze_source_batch(
+    batch: List[Tuple[str, str]],
+    module_alias_map: Dict[str, str],
+    skim: bool = False
+) -> Tuple[List[Tuple[str, Dict]], List[FileTiming]]:
+    results: List[Tuple[str, Dict]] = []
+    timings: List[FileTiming] = []
+    for file_rel_path, source in batch:
+        start = time.perf_counter()
+        result, parse_seconds = analyze_source_timed(source, file_rel_path, module_alias_map, skim=skim)
+        timings.append((file_rel_path, time.perf_counter() - start, parse_seconds))
+        results.append((file_rel_path, result))
+    return results, timings
+
+
+def run_batches_in_pool(
+    worker_count: int,
+    batch_fn: Callable[..., Tuple[List[Tuple[str, Dict]], List[FileTiming]]],
+    batches: List[List[Any]],
+    *context: Any
+) -> Tuple[Dict[str, Dict], List[FileTiming]]:
+    analyzed: Dict[str, Dict] = {}
+    timings: List[FileTiming] = []
+    with ProcessPoolExecutor(max_workers=min(worker_count, len(batches))) as pool:
+        futures = [pool.submit(batch_fn, batch, *context) for batch in batches]
+        for future in futures:
+            results, batch_timings = future.result()
+            analyzed.update(results)
+            timings.extend(batch_timings)
+    return analyzed, timings
+
+
+def analyze_repo_files(
+    repo_path: str,
+    workers: Optional[int] = 1,
+    min_parallel_files: int = PARALLEL_MIN_FILES,
+    cache: Optional["AnalysisCache"] = None,
+    sources: Optional[SourceMap] = None,
+    skim: bool = False
+) -> Dict[str, Dict]:
+    """
+    Analyze every Python file in the repository.
+
+    workers=1 keeps the single-process loop; workers=None uses one process per CPU.
+    Runs with fewer than min_parallel_files files to analyze are always serial.
+    When a cache is given, files whose content and alias context are unchanged
+    skip parsing entirely. The result is keyed and ordered exactly like the serial path.
+    When sources (relative path -> text) is given, exactly those files are
+    analyzed and nothing is read from repo_path. skim=True skips function
+    bodies (see analyze_tree).
+    """
+    files = list_repo_files(repo_path, sources)
+    return analyze_files(
+        repo_path,
+        files,
+        build_module_alias_map(files),
+        workers=workers,
+        min_parallel_files=min_parallel_files,
+        cache=cache,
+        sources=sources,
+        skim=skim
+    )
+
+
+def list_repo_files(repo_path: str, sources: Optional[SourceMap] = None) -> List[str]:
+    if sources is not None:
+        return sorted(sources)
+
     from app.engine_ast.parser import get_python_files
 
+    return get_python_files(repo_path)
+
+
+def analyze_files(
+    repo_path: str,
+    files: List[str],
+    module_alias_map: Dict[str, str],
+    workers: Optional[int] = 1,
+    min_parallel_files: int = PARALLEL_MIN_FILES,
+    cache: Optional["AnalysisCache"] = None,
+    sources: Optional[SourceMap] = None,
+    skim: bool = False,
+    profiler: Optional["Profiler"] = None,
+    limits: Optional["FileLimits"] = None
+) -> Dict[str, Dict]:
+    """
+    Analyze the given files; per-file timings go to profiler when one is given.
+
+    With limits, every file is analyzed in an isolated worker process under
+    those CPU / memory caps (see isolation.analyze_isolated); a file that
+    exceeds them fails with a failure_reason instead of stalling the run.
+    """
+    worker_count = resolve_worker_count(workers)
+
+    def use_pool(item_count: int) -> bool:
+        return worker_count > 1 and item_count >= max(min_parallel_files, 2)
+
+    if cache is None and sources is None and limits is None:
+        if not use_pool(len(files)):
+            results, timings = analyze_file_batch(files, repo_path, module_alias_map, skim)
+            if profiler is not None:
+                profiler.record_files(timings)
+            return dict(results)
+        # A few batches per worker keeps the pool busy when file sizes are skewed.
+        batches = build_size_balanced_batches(repo_path, files, worker_count * 4)
+        analyzed, timings = run_batches_in_pool(
+            worker_count, analyze_file_batch, batches, repo_path, module_alias_map, skim
+        )
+        if profiler is not None:
+            profiler.record_files(timings)
+        return {file_rel_path: analyzed[file_rel_path] for file_rel_path in files}
+
+    root = Path(repo_path)
+    alias_context = module_alias_context(module_alias_map)
     results: Dict[str, Dict] = {}
-    files = get_python_files(repo_path)
-    module_alias_map = build_module_alias_map(files)
+    pending: List[Tuple[str, str]] = []
+    pending_keys: Dict[str, str] = {}
 
     for file_rel_path in files:
-        full_path = Path(repo_path) / file_rel_path
-        results[file_rel_path] = analyze_file(full_path, file_rel_path, module_alias_map)
-    return results
+        if sources is not None:
+            source = sources.get(file_rel_path)
+            if source is None:
+                source = UnreadableSource(f"No source for {file_rel_path}", "read_error")
+        else:
+            source = read_python_source(root / file_rel_path)
+        if isinstance(source, UnreadableSource):
+            results[file_rel_path] = source.analysis()
+            continue
+        if cache is None:
+            pending.append((file_rel_path, source))
+            continue
+        key = analysis_cache_key(source, file_rel_path, alias_context, skim)
+        cached = cache.get(key)
+        if cached is not None:
+            results[file_rel_path] = cached
+        else:
+            pending.append((file_rel_path, source))
+            pending_keys[file_rel_path] = key
+
+    if limits is not None and pending:
+        from app.engine_ast.isolation import analyze_isolated
+
+        fresh, timings = analyze_isolated(pending, module_alias_map, limits, worker_count, skim)
+    elif use_pool(len(pending)):
+        sized = [(len(source), (file_rel_path, source)) for file_rel_path, source in pending]
+        batches = pack_size_balanced_batches(sized, worker_count * 4)
+        fresh, timings = run_batches_in_pool(worker_count, analyze_source_batch, batches, module_alias_map, skim)
+    else:
+        fresh_results, timings = analyze_source_batch(pending, module_alias_map, skim)
+        fresh = dict(fresh_results)
+    if profiler is not None:
+        profiler.record_files(timings)
+
+    if cache is not None:
+        for file_rel_path, file_result in fresh.items():
+            # Limit failures may depend on the machine and the configured caps; retry them next time.
+            if "failure_reason" not in file_result:
+                cache.put(pending_keys[file_rel_path], file_result)
+        cache.flush()
+    results.update(fresh)
+
+    return {file_rel_path: results[file_rel_path] for file_rel_path in files}
+
+
+def build_unified_model(
+    repo_path: str,
+    workers: Optional[int] = 1,
+    cache: Optional["AnalysisCache"] = None,
+    previous_model: Optional[Dict] = None,
+    changed_files: Optional[List[str]] = None,
+    sources: Optional[SourceMap] = None,
+    skim: bool = False,
+    profiler: Optional["Profiler"] = None,
+    limits: Optional["FileLimits"] = None
+) -> Dict:
+    """
+    Build the unified model for a repository.
+
+    Passing the previous unified model together with the changed file paths
+    re-analyzes only what those changes can affect (see update_unified_model).
+    Passing sources (relative path -> text, e.g. from gitrepo.load_git_sources)
+    analyzes them in memory instead of reading a checkout at repo_path.
+    skim=True builds the file dependency graph and symbol lists without call
+    resolution (metadata.analysis_mode "skim"); upgrade_unified_model adds the
+    calls later. A profiler records the traverse / analyze / resolve / assemble
+    stages and per-file timings. limits (isolation.FileLimits) caps the CPU time
+    and memory of each file's analysis; files over a cap are listed in
+    metadata.parse_errors with a reason.
+    """
+    if previous_model is not None and changed_files is not None:
+        return update_unified_model(
+            repo_path, previous_model, changed_files, workers=workers, cache=cache, sources=sources,
+            skim=skim, profiler=profiler, limits=limits
+        )
+
+    from app.engine_ast.dependency import ModuleResolver, build_file_dependency_graph
+
+    with stage(profiler, "traverse") as record:
+        files = list_repo_files(repo_path, sources)
+        # One resolver serves both symbol canonicalization and import -> file resolution.
+        resolver = ModuleResolver.from_files(files)
+        record["files"] = len(files)
+    with stage(profiler, "analyze"):
+        analysis_results = analyze_files(
+            repo_path, files, resolver.alias_map, workers=workers, cache=cache, sources=sources,
+            skim=skim, profiler=profiler, limits=limits
+        )
+    with stage(profiler, "resolve"):
+        dependency_graph = build_file_dependency_graph(analysis_results, resolver)
+    with stage(profiler, "assemble"):
+        return assemble_unified_model(analysis_results, dependency_graph, skim=skim)
+
+
+def model_is_skim(unified_model: Dict) -> bool:
+    return unified_model.get("metadata", {}).get("analysis_mode") == "skim"
+
+
+def upgrade_unified_model(
+    repo_path: str,
+    skim_model: Dict,
+    workers: Optional[int] = 1,
+    cache: Optional["AnalysisCache"] = None,
+    sources: Optional[SourceMap] = None,
+    profiler: Optional["Profiler"] = None,
+    limits: Optional["FileLimits"] = None
+) -> Dict:
+    """
+    Turn a skim model into the full model of the same repository state.
 
+    Skim and full analysis extract identical imports, so the skim model's
+    depends_on graph is reused and only the per-file call analysis runs. The
+    result equals build_unified_model(repo_path). If the file set changed
+    since skimming, the model is rebuilt from scratch.
+    """
+    files = list_repo_files(repo_path, sources)
+    previous_files = skim_model.get("files", {})
+    if not model_is_skim(skim_model) or set(files) != set(previous_files):
+        return build_unified_model(
+            repo_path, workers=workers, cache=cache, sources=sources, profiler=profiler, limits=limits
+        )
 
-def build_unified_model(repo_path: str) -> Dict:
-    analysis_results = analyze_repo_files(repo_path)
+    with stage(profiler, "analyze"):
+        analysis_results = analyze_files(
+            repo_path, files, build_module_alias_map(files), workers=workers, cache=cache,
+            sources=sources, profiler=profiler, limits=limits
+        )
+    dependency_graph = {
+        file_path: previous_files[file_path].get("depends_on", []) for file_path in files
+    }
+    with stage(profiler, "assemble"):
+        return assemble_unified_model(analysis_results, dependency_graph)
+
+
+def function_call_edges(
+    file_path: str,
+    file_data: Dict,
+    only_sources: Optional[Set[str]] = None
+) -> List[Dict[str, str]]:
+    file_module = rel_file_to_module(file_path)
+    edges: List[Dict[str, str]] = []
+    for function_name, function_data in file_data["functions"].items():
+        src = f"{file_module}.{function_name}"
+        if only_sources is not None and src not in only_sources:
+            continue
+        for target in function_data.get("resolved_calls", []):
+            edges.append({
+                "from": src,
+                "to": target
+            })
+    return edges
 
-    from app.engine_ast.dependency import build_file_dependency_graph, identify_entry_point
 
-    dependency_graph = build_file_dependency_graph(analysis_results)
-    entry_point = identify_entry_point(analysis_results)
+def assemble_unified_model(
+    analysis_results: Dict[str, Dict],
+    dependency_graph: Dict[str, List[str]],
+    resolved_call_edges: Optional[List[Dict[str, str]]] = None,
+    skim: bool = False
+) -> Dict:
+    """
+    Combine per-file analysis and the dependency graph into the unified model.
+
+    resolved_call_edges may be passed pre-sorted to skip regenerating them.
+    skim marks results from skim analysis (no call edges) in metadata.analysis_mode.
+    """
+    from app.engine_ast.cycles import build_dependency_structure
+    from app.engine_ast.dependency import identify_entry_point
 
     unified = {
-        "entry_point": entry_point,
+        "entry_point": identify_entry_point(analysis_results),
         "metadata": {
+            "analysis_mode": "skim" if skim else "full",
             "parse_errors": [],
-            "resolved_call_edges": []
+            "resolved_call_edges": [],
+            "called_by": {},
+            "dependency_structure": {}
         },
         "files": {}
     }
 
     for file_path, file_data in analysis_results.items():
-        file_module = rel_file_to_module(file_path)
         unified["files"][file_path] = {
             "entry": file_data["entry"],
             "imports": file_data["imports"],
@@ -377,27 +903,206 @@ def build_unified_model(repo_path: str) -> Dict:
             "depends_on": dependency_graph.get(file_path, [])
         }
 
-        for function_name, function_data in file_data["functions"].items():
-            src = f"{file_module}.{function_name}"
-            for target in function_data.get("resolved_calls", []):
-                unified["metadata"]["resolved_call_edges"].append({
-                    "from": src,
-                    "to": target
-                })
+        if resolved_call_edges is None:
+            unified["metadata"]["resolved_call_edges"].extend(function_call_edges(file_path, file_data))
 
         if file_data.get("parse_error"):
-            unified["metadata"]["parse_errors"].append({
-                "file": file_path,
-                "error": file_data["parse_error"]
-            })
+            parse_error = {"file": file_path, "error": file_data["parse_error"]}
+            if file_data.get("failure_reason"):
+                parse_error["reason"] = file_data["failure_reason"]
+            unified["metadata"]["parse_errors"].append(parse_error)
 
-    unified["metadata"]["resolved_call_edges"] = sorted(
-        unified["metadata"]["resolved_call_edges"],
-        key=lambda e: (e["from"], e["to"])
+    if resolved_call_edges is None:
+        resolved_call_edges = sorted(
+            unified["metadata"]["resolved_call_edges"],
+            key=lambda e: (e["from"], e["to"])
+        )
+    unified["metadata"]["resolved_call_edges"] = resolved_call_edges
+    unified["metadata"]["called_by"] = build_called_by_index(
+        resolved_call_edges, repo_function_names(analysis_results)
     )
+    unified["metadata"]["dependency_structure"] = build_dependency_structure({
+        file_path: file_data["depends_on"] for file_path, file_data in unified["files"].items()
+    })
     return unified
 
 
+def repo_function_names(analysis_results: Dict[str, Dict]) -> Set[str]:
+    names: Set[str] = set()
+    for file_path, file_data in analysis_results.items():
+        module = rel_file_to_module(file_path)
+        names.update(f"{module}.{function_name}" for function_name in file_data.get("functions", {}))
+    return names
+
+
+def build_called_by_index(
+    resolved_call_edges: List[Dict[str, str]],
+    function_names: Set[str]
+) -> Dict[str, List[str]]:
+    """
+    Invert the call edges into callee -> callers for functions defined in the repo.
+
+    Edges are sorted by (from, to), so appending callers in edge order already
+    yields sorted caller lists with duplicates adjacent: one linear pass over
+    the edges, and only the callee keys are sorted for stable output.
+    """
+    called_by: Dict[str, List[str]] = {}
+    for edge in resolved_call_edges:
+        callee = edge["to"]
+        if callee not in function_names:
+            continue
+        callers = called_by.setdefault(callee, [])
+        if not callers or callers[-1] != edge["from"]:
+            callers.append(edge["from"])
+    return {callee: called_by[callee] for callee in sorted(called_by)}
+
+
+def get_callers(unified_model: Dict, function_name: str) -> List[str]:
+    """Repo functions that call function_name, from metadata.called_by."""
+    called_by = unified_model.get("metadata", {}).get("called_by")
+    if called_by is None:
+        # Models written before the index existed: derive it from the edges.
+        called_by = build_called_by_index(
+            unified_model.get("metadata", {}).get("resolved_call_edges", []),
+            repo_function_names(unified_model.get("files", {}))
+        )
+    return list(called_by.get(function_name, []))
+
+
+def analysis_results_from_model(unified_model: Dict) -> Dict[str, Dict]:
+    """Recover analyze_repo_files-shaped results from a unified model."""
+    parse_errors = {
+        item["file"]: item
+        for item in unified_model.get("metadata", {}).get("parse_errors", [])
+    }
+    results: Dict[str, Dict] = {}
+    for file_path, file_data in unified_model.get("files", {}).items():
+        parse_error = parse_errors.get(file_path, {})
+        results[file_path] = {
+            "entry": file_data.get("entry", False),
+            "imports": file_data.get("imports", []),
+            "classes": file_data.get("classes", {}),
+            "functions": file_data.get("functions", {}),
+            "parse_error": parse_error.get("error")
+        }
+        if parse_error.get("reason"):
+            results[file_path]["failure_reason"] = parse_error["reason"]
+    return results
+
+
+def normalize_changed_path(repo_path: str, file_path: str) -> str:
+    if os.path.isabs(file_path):
+        file_path = os.path.relpath(file_path, repo_path)
+    file_path = file_path.replace("\\", "/")
+    return file_path[2:] if file_path.startswith("./") else file_path
+
+
+def update_unified_model(
+    repo_path: str,
+    previous_model: Dict,
+    changed_files: List[str],
+    workers: Optional[int] = 1,
+    cache: Optional["AnalysisCache"] = None,
+    sources: Optional[SourceMap] = None,
+    skim: bool = False,
+    profiler: Optional["Profiler"] = None,
+    limits: Optional["FileLimits"] = None
+) -> Dict:
+    """
+    Incrementally rebuild a unified model after some files changed.
+
+    Only changed and newly added files are parsed again. Call resolution in
+    analyze_source is purely syntactic (it never looks at other files), so a
+    dependent file's resolved_calls cannot change when an imported module does;
+    what can change is its depends_on, when a module it imports appears or
+    disappears. Those files are found through the reverse dependency graph and
+    the import index and only have their imports re-resolved. If the module
+    alias map itself changed, every module name may have moved and the model is
+    rebuilt from scratch, as it is when skim differs from the previous model's mode.
+    """
+    from app.engine_ast.dependency import (
+        ModuleResolver,
+        aliases_for_file,
+        build_reverse_dependency_graph,
+        find_importers_of_modules,
+        resolve_file_dependencies,
+    )
+
+    files = list_repo_files(repo_path, sources)
+    resolver = ModuleResolver.from_files(files)
+    module_alias_map = resolver.alias_map
+    previous_files = previous_model.get("files", {})
+
+    previous_alias_map = build_module_alias_map(list(previous_files))
+    if (
+        module_alias_context(previous_alias_map) != module_alias_context(module_alias_map)
+        or model_is_skim(previous_model) != skim
+    ):
+        return build_unified_model(
+            repo_path, workers=workers, cache=cache, sources=sources, skim=skim, profiler=profiler,
+            limits=limits
+        )
+
+    current = set(files)
+    added = current - set(previous_files)
+    removed = set(previous_files) - current
+    changed = {normalize_changed_path(repo_path, path) for path in changed_files}
+    reanalyze = sorted((changed & current) | added)
+
+    with stage(profiler, "analyze"):
+        fresh = analyze_files(
+            repo_path, reanalyze, module_alias_map, workers=workers, cache=cache, sources=sources,
+            skim=skim, profiler=profiler, limits=limits
+        )
+    previous_results = analysis_results_from_model(previous_model)
+    analysis_results = {
+        file_path: fresh[file_path] if file_path in fresh else previous_results[file_path]
+        for file_path in files
+    }
+
+    # depends_on: changed files, dependents of removed files, importers of added modules.
+    previous_graph = {path: data.get("depends_on", []) for path, data in previous_files.items()}
+    reverse_graph = build_reverse_dependency_graph(previous_graph)
+    stale_dependents = set(reanalyze)
+    for file_path in removed:
+        stale_dependents.update(reverse_graph.get(file_path, []))
+    added_modules: Set[str] = set()
+    for file_path in added:
+        added_modules.update(aliases_for_file(file_path))
+    stale_dependents.update(find_importers_of_modules(analysis_results, added_modules))
+
+    dependency_graph: Dict[str, List[str]] = {}
+    for file_path in files:
+        if file_path in stale_dependents:
+            dependency_graph[file_path] = resolve_file_dependencies(
+                file_path, analysis_results[file_path]["imports"], resolver
+            )
+        else:
+            dependency_graph[file_path] = previous_graph[file_path]
+
+    # Regenerate every edge whose source name a touched file defines (or used to define).
+    touched_files = set(reanalyze) | removed
+    stale_sources: Set[str] = set()
+    for file_path in touched_files:
+        for file_data in (previous_files.get(file_path), analysis_results.get(file_path)):
+            if file_data:
+                module = rel_file_to_module(file_path)
+                stale_sources.update(f"{module}.{name}" for name in file_data.get("functions", {}))
+    kept_edges = [
+        edge for edge in previous_model.get("metadata", {}).get("resolved_call_edges", [])
+        if edge["from"] not in stale_sources
+    ]
+    new_edges: List[Dict[str, str]] = []
+    if stale_sources:
+        for file_path in files:
+            new_edges.extend(function_call_edges(file_path, analysis_results[file_path], stale_sources))
+    new_edges.sort(key=lambda e: (e["from"], e["to"]))
+    resolved_call_edges = list(heapq.merge(kept_edges, new_edges, key=lambda e: (e["from"], e["to"])))
+
+    with stage(profiler, "assemble"):
+        return assemble_unified_model(analysis_results, dependency_graph, resolved_call_edges, skim=skim)
+
+
 def build_resolved_call_adjacency(unified_model: Dict) -> Dict[str, List[str]]:
     adjacency: Dict[str, Set[str]] = {}
     edges = unified_model.get("metadata", {}).get("resolved_call_edges", [])
@@ -414,41 +1119,40 @@ def trace_call_chain(
     unified_model: Dict,
     start_function: str,
     target_function: str,
-    max_depth: int = 8
+    max_depth: int = 8,
+    call_graph: Optional["CallGraph"] = None
 ) -> Optional[List[str]]:
-    adjacency = build_resolved_call_adjacency(unified_model)
-    if start_function == target_function:
-        return [start_function]
+    """
+    Breadth-first call chain from start_function to target_function.
 
-    queue: List[Tuple[str, List[str], int]] = [(start_function, [start_function], 0)]
-    seen: Set[str] = {start_function}
+    Without call_graph, the model's graph comes from get_call_graph, which
+    builds the index on the first query and reuses it for later ones.
+    """
+    from app.engine_ast.callgraph import get_call_graph
 
-    while queue:
-        node, path, depth = queue.pop(0)
-        if depth >= max_depth:
-            continue
-        for nxt in adjacency.get(node, []):
-            if nxt == target_function:
-                return path + [nxt]
-            if nxt not in seen:
-                seen.add(nxt)
-                queue.append((nxt, path + [nxt], depth + 1))
-    return None
+    if call_graph is None:
+        call_graph = get_call_graph(unified_model)
+    return call_graph.trace(start_function, target_function, max_depth=max_depth)
 
 
 if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python analyzer.py <repo_path> [--unified]")
+        print("Usage: python analyzer.py <repo_path> [--unified] [--workers N]")
         sys.exit(1)
 
     repo_path = sys.argv[1]
     use_unified = "--unified" in sys.argv
+    workers: Optional[int] = 1
+    if "--workers" in sys.argv:
+        idx = sys.argv.index("--workers")
+        if idx + 1 < len(sys.argv):
+            workers = int(sys.argv[idx + 1]) or None
 
     if use_unified:
-        result = build_unified_model(repo_path)
+        result = build_unified_model(repo_path, workers=workers)
         print(json.dumps(result, indent=2))
     else:
-        result = analyze_repo_files(repo_path)
+        result = analyze_repo_files(repo_path, workers=workers)
         print(json.dumps(result, indent=2))
@@ -0,0 +1,147 @@
+"""
+cache.py - Persistent per-file analysis cache for CODE_Sherpa.
+
+Stores analyze_source() output in SQLite, keyed by a digest of the file content,
+its module alias context and the analyzer version (see analysis_cache_key).
+The store is bounded by payload bytes and evicts least-recently-used entries.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "code_sherpa" / "analysis.sqlite3"
+
+# Eviction trims down to this fraction of max_bytes so that puts do not evict on every call.
+EVICTION_LOW_WATERMARK = 0.9
+
+
+class AnalysisCache:
+    """Size-bounded LRU cache of per-file analysis results backed by SQLite."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file; parent directories are created as needed
+            max_bytes: Upper bound on the total stored payload size
+        """
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Dict[str, float] = {}
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self._conn.commit()
+        self._total_bytes = self._stored_bytes()
+
+    @classmethod
+    def from_env(cls) -> Optional["AnalysisCache"]:
+        """
+        Build the cache configured by SHERPA_ANALYSIS_CACHE / SHERPA_ANALYSIS_CACHE_MB.
+
+        Returns:
+            None when SHERPA_ANALYSIS_CACHE is set to "off"
+        """
+        path = os.getenv("SHERPA_ANALYSIS_CACHE", str(DEFAULT_CACHE_PATH))
+        if path.strip().lower() in {"", "off", "0", "false"}:
+            return None
+        max_mb = int(os.getenv("SHERPA_ANALYSIS_CACHE_MB", str(DEFAULT_MAX_BYTES // (1024 * 1024))))
+        return cls(path, max_bytes=max_mb * 1024 * 1024)
+
+    def _stored_bytes(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(row[0])
+
+    def get(self, key: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT payload FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Recency updates are batched into flush() instead of costing a write per hit.
+        self._touched[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict) -> None:
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+        previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (key, payload, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, payload, len(payload), time.time())
+        )
+        self._total_bytes += len(payload) - (previous[0] if previous else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        self._flush_touched()
+        self._total_bytes = self._stored_bytes()
+        target = int(self.max_bytes * EVICTION_LOW_WATERMARK)
+        victims: List[Tuple[str, int]] = []
+        excess = self._total_bytes - target
+        if excess <= 0:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_used ASC"):
+            victims.append((key, size))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+        self._total_bytes -= sum(size for _, size in victims)
+        self.evictions += len(victims)
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def flush(self) -> None:
+        """Persist pending recency updates and commit outstanding writes."""
+        self._flush_touched()
+        self._conn.commit()
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM entries")
+        self._conn.commit()
+        self._touched.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate_percent": round(100 * self.hits / lookups) if lookups else 0,
+            "entries": self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,235 @@
+"""
+callgraph.py - Indexed call graph for CODE_Sherpa.
+
+Built once from metadata.resolved_call_edges and then queried many times;
+get_call_graph keeps the graphs of recently queried models, so repeated
+one-off queries on the same model do not rebuild the index.
+Function names are mapped to integer IDs in sorted name order and both edge
+directions are stored CSR-style (an offsets array plus a flat targets array),
+so neighbour lists are contiguous slices that are already sorted by name.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Models whose CallGraph get_call_graph keeps around.
+CALL_GRAPH_CACHE_SIZE = 4
+
+
+class IndexedGraph:
+    """Immutable directed graph over string names with CSR forward and reverse adjacency."""
+
+    def __init__(self, names: List[str], pairs: Iterable[Tuple[int, int]]):
+        """
+        Args:
+            names: Node names; a node's ID is its index in this list
+            pairs: (source ID, target ID) edges; duplicates are dropped
+        """
+        self.names = names
+        self.ids: Dict[str, int] = {name: node for node, name in enumerate(names)}
+        count = len(names)
+        # Edges are encoded as single ints (src * count + dst) so dedup and sorting stay in C.
+        keys = sorted({src * count + dst for src, dst in pairs})
+        self.forward_offsets, self.forward_targets = self._build_csr(count, keys)
+        reverse_keys = sorted((key % count) * count + key // count for key in keys)
+        self.reverse_offsets, self.reverse_targets = self._build_csr(count, reverse_keys)
+
+    @staticmethod
+    def _build_csr(node_count: int, sorted_keys: List[int]) -> Tuple[array, array]:
+        offsets = array("l", (bisect_left(sorted_keys, node * node_count) for node in range(node_count + 1)))
+        targets = array("l", (key % node_count for key in sorted_keys))
+        return offsets, targets
+
+    @classmethod
+    def from_name_pairs(
+        cls,
+        name_pairs: Iterable[Tuple[str, str]],
+        nodes: Iterable[str] = ()
+    ) -> "IndexedGraph":
+        """Build from (source name, target name) edges; nodes adds names that may have no edges."""
+        edges = [(src, dst) for src, dst in name_pairs if src and dst]
+        names = sorted({src for src, _ in edges} | {dst for _, dst in edges} | set(nodes))
+        ids = {name: node for node, name in enumerate(names)}
+        return cls(names, [(ids[src], ids[dst]) for src, dst in edges])
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.forward_targets)
+
+    def node_id(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+    def successors(self, node: int) -> array:
+        return self.forward_targets[self.forward_offsets[node]:self.forward_offsets[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        return self.reverse_targets[self.reverse_offsets[node]:self.reverse_offsets[node + 1]]
+
+
+class CallGraph(IndexedGraph):
+    """Function-level call graph with path queries."""
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Dict[str, str]]) -> "CallGraph":
+        return cls.from_name_pairs((edge.get("from"), edge.get("to")) for edge in edges)
+
+    @classmethod
+    def from_model(cls, unified_model: Dict) -> "CallGraph":
+        return cls.from_edges(unified_model.get("metadata", {}).get("resolved_call_edges", []))
+
+    def callees(self, name: str) -> List[str]:
+        node = self.ids.get(name)
+        return [] if node is None else [self.names[dst] for dst in self.successors(node)]
+
+    def callers(self, name: str) -> List[str]:
+        node = self.ids.get(name)
+        return [] if node is None else [self.names[src] for src in self.predecessors(node)]
+
+    def adjacency(self) -> Dict[str, List[str]]:
+        """Same shape as build_resolved_call_adjacency: callers with sorted callees."""
+        return {
+            self.names[node]: self.callees(self.names[node])
+            for node in range(self.node_count)
+            if self.forward_offsets[node] != self.forward_offsets[node + 1]
+        }
+
+    def _path(self, parents: Dict[int, int], node: int) -> List[int]:
+        path = [node]
+        while parents[node] != node:
+            node = parents[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+    def trace(self, start: str, target: str, max_depth: int = 8) -> Optional[List[str]]:
+        """
+        Breadth-first call chain from start to target of at most max_depth calls.
+
+        Callees are explored in name order and each node keeps its first
+        discoverer as parent, so the chain is identical to the one the original
+        list-based BFS in trace_call_chain returned.
+        """
+        if start == target:
+            return [start]
+        source = self.ids.get(start)
+        goal = self.ids.get(target)
+        if source is None or goal is None:
+            return None
+
+        offsets, targets = self.forward_offsets, self.forward_targets
+        parents: Dict[int, int] = {source: source}
+        queue = deque([(source, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for index in range(offsets[node], offsets[node + 1]):
+                nxt = targets[index]
+                if nxt == goal:
+                    return [self.names[n] for n in self._path(parents, node)] + [target]
+                if nxt not in parents:
+                    parents[nxt] = node
+                    queue.append((nxt, depth + 1))
+        return None
+
+    def shortest_path(self, start: str, target: str, max_depth: int = 8) -> Optional[List[str]]:
+        """
+        Bidirectional BFS for a shortest call chain of at most max_depth calls.
+
+        Always expands the smaller frontier, so only the neighbourhoods of the
+        two endpoints are touched. The length matches trace(); when several
+        shortest chains exist the one returned may differ.
+        """
+        if start == target:
+            return [start]
+        source = self.ids.get(start)
+        goal = self.ids.get(target)
+        if source is None or goal is None:
+            return None
+
+        forward_parents: Dict[int, int] = {source: source}
+        backward_parents: Dict[int, int] = {goal: goal}
+        forward_dist: Dict[int, int] = {source: 0}
+        backward_dist: Dict[int, int] = {goal: 0}
+        forward_frontier = [source]
+        backward_frontier = [goal]
+        depth_sum = 0
+
+        while forward_frontier and backward_frontier and depth_sum < max_depth:
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                offsets, targets = self.forward_offsets, self.forward_targets
+                frontier, parents, dist = forward_frontier, forward_parents, forward_dist
+                other_dist = backward_dist
+            else:
+                offsets, targets = self.reverse_offsets, self.reverse_targets
+                frontier, parents, dist = backward_frontier, backward_parents, backward_dist
+                other_dist = forward_dist
+
+            next_frontier: List[int] = []
+            best: Optional[Tuple[int, int]] = None
+            for node in frontier:
+                level = dist[node] + 1
+                for index in range(offsets[node], offsets[node + 1]):
+                    nxt = targets[index]
+                    if nxt in parents:
+                        continue
+                    parents[nxt] = node
+                    dist[nxt] = level
+                    next_frontier.append(nxt)
+                    if nxt in other_dist:
+                        total = level + other_dist[nxt]
+                        if best is None or total < best[0]:
+                            best = (total, nxt)
+            depth_sum += 1
+
+            if best is not None:
+                total, meet = best
+                if total > max_depth:
+                    return None
+                head = self._path(forward_parents, meet)
+                tail = self._path(backward_parents, meet)
+                tail.reverse()
+                return [self.names[n] for n in head + tail[1:]]
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None
+
+
+_graphs: "OrderedDict[int, Tuple[List[Dict[str, str]], CallGraph]]" = OrderedDict()
+_graphs_lock = threading.Lock()
+
+
+def get_call_graph(unified_model: Dict) -> CallGraph:
+    """
+    CallGraph of unified_model, built on first use and reused afterwards.
+
+    Entries are keyed by the identity of the model's resolved_call_edges list,
+    so a rebuilt or upgraded model (which gets a new list) gets a new graph.
+    Models are treated as immutable once assembled.
+    """
+    edges = unified_model.get("metadata", {}).get("resolved_call_edges", [])
+    key = id(edges)
+    with _graphs_lock:
+        cached = _graphs.get(key)
+        if cached is not None and cached[0] is edges:
+            _graphs.move_to_end(key)
+            return cached[1]
+    graph = CallGraph.from_edges(edges)
+    with _graphs_lock:
+        # The edges list is held too, so its id cannot be reused while cached.
+        _graphs[key] = (edges, graph)
+        _graphs.move_to_end(key)
+        while len(_graphs) > CALL_GRAPH_CACHE_SIZE:
+            _graphs.popitem(last=False)
+    return graph
@@ -0,0 +1,272 @@
+"""
+compact.py - Compact in-memory form of the CODE_Sherpa unified model.
+
+Every string that repeats across the model (qualified names, raw call names,
+module and file paths) is interned once in a SymbolTable and referenced by
+integer ID. Function and file records use __slots__, name lists are int
+arrays, and resolved_call_edges become two parallel int arrays instead of a
+dict per edge. CompactModel.from_model / to_model round-trip the JSON shape
+losslessly, including key order and keys the analyzer does not know about.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 32-bit symbol IDs; an empty name list is stored as None rather than an empty array.
+SYMBOL_TYPECODE = "i"
+
+
+class SymbolTable:
+    """Bidirectional string <-> dense integer ID mapping."""
+
+    __slots__ = ("names", "_ids")
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self.names: List[str] = list(names or [])
+        self._ids: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def ids(self) -> Dict[str, int]:
+        if self._ids is None:
+            self._ids = {name: symbol for symbol, name in enumerate(self.names)}
+        return self._ids
+
+    def seal(self) -> None:
+        """Drop the reverse mapping (most of the table's memory); it is rebuilt on demand."""
+        self._ids = None
+
+    def intern(self, name: str) -> int:
+        ids = self.ids
+        symbol = ids.get(name)
+        if symbol is None:
+            symbol = len(self.names)
+            self.names.append(name)
+            ids[name] = symbol
+        return symbol
+
+    def intern_all(self, names: List[str]) -> Optional[array]:
+        """Symbol IDs of names as an int array; None for an empty list."""
+        if not names:
+            return None
+        return array(SYMBOL_TYPECODE, [self.intern(name) for name in names])
+
+    def lookup(self, symbol: int) -> str:
+        return self.names[symbol]
+
+    def lookup_all(self, symbols: Optional[array]) -> List[str]:
+        if symbols is None:
+            return []
+        names = self.names
+        return [names[symbol] for symbol in symbols]
+
+
+def is_name_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+class FunctionRecord:
+    """One entry of a file's "functions" table."""
+
+    __slots__ = ("name", "layout", "lineno", "end_lineno", "calls", "resolved_calls", "extra")
+
+    def __init__(self, name: int, layout: Optional[Tuple[str, ...]]):
+        """layout is the original key order, or None when the entry was not a dict (kept in extra)."""
+        self.name = name
+        self.layout = layout
+        self.lineno: Optional[int] = None
+        self.end_lineno: Optional[int] = None
+        self.calls: Optional[array] = None
+        self.resolved_calls: Optional[array] = None
+        self.extra: Optional[Dict[str, Any]] = None
+
+
+class FileRecord:
+    """One entry of the model's "files" table."""
+
+    __slots__ = ("path", "layout", "entry", "imports", "depends_on", "functions", "extra")
+
+    def __init__(self, path: int, layout: Optional[Tuple[str, ...]]):
+        self.path = path
+        self.layout = layout
+        self.entry: Optional[bool] = None
+        self.imports: Optional[array] = None
+        self.depends_on: Optional[array] = None
+        self.functions: Optional[List[FunctionRecord]] = None
+        self.extra: Optional[Dict[str, Any]] = None
+
+
+class CompactModel:
+    """Interned, array-backed unified model."""
+
+    __slots__ = (
+        "symbols", "layout", "files", "edges_compacted", "edge_sources", "edge_targets",
+        "called_by", "metadata", "extra"
+    )
+
+    def __init__(self):
+        self.symbols = SymbolTable()
+        self.layout: Tuple[str, ...] = ()
+        self.files: List[FileRecord] = []
+        self.edges_compacted = False
+        self.edge_sources: Optional[array] = None
+        self.edge_targets: Optional[array] = None
+        # metadata.called_by as callee ID -> caller IDs, when it had the expected shape.
+        self.called_by: Optional[List[Tuple[int, array]]] = None
+        # Metadata other than resolved_call_edges / called_by (when compacted), kept as-is.
+        self.metadata: Any = None
+        # Top-level keys other than files and metadata (entry_point, ...).
+        self.extra: Dict[str, Any] = {}
+
+    @classmethod
+    def from_model(cls, unified_model: Dict) -> "CompactModel":
+        compact = cls()
+        symbols = compact.symbols
+        # Records with the same key order share one layout tuple.
+        layouts: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+        def shared_layout(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+            return layouts.setdefault(keys, keys)
+
+        compact.layout = tuple(unified_model)
+        files = unified_model.get("files", {})
+        for key, value in unified_model.items():
+            if key not in ("files", "metadata") or (key == "files" and not isinstance(files, dict)):
+                compact.extra[key] = value
+
+        for file_path, file_data in (files.items() if isinstance(files, dict) else ()):
+            if not isinstance(file_data, dict):
+                record = FileRecord(symbols.intern(file_path), None)
+                record.extra = {"": file_data}
+                compact.files.append(record)
+                continue
+            record = FileRecord(symbols.intern(file_path), shared_layout(tuple(file_data)))
+            extra: Dict[str, Any] = {}
+            for key, value in file_data.items():
+                if key == "entry" and isinstance(value, bool):
+                    record.entry = value
+                elif key in ("imports", "depends_on") and is_name_list(value):
+                    setattr(record, key, symbols.intern_all(value))
+                elif key == "functions" and isinstance(value, dict):
+                    record.functions = [
+                        compact._function_record(name, data, shared_layout)
+                        for name, data in value.items()
+                    ]
+                else:
+                    extra[key] = value
+            record.extra = extra or None
+            compact.files.append(record)
+
+        metadata = unified_model.get("metadata")
+        if isinstance(metadata, dict):
+            edges = metadata.get("resolved_call_edges")
+            if isinstance(edges, list) and all(
+                isinstance(edge, dict) and list(edge) == ["from", "to"] for edge in edges
+            ):
+                compact.edges_compacted = True
+                compact.edge_sources = symbols.intern_all([edge["from"] for edge in edges])
+                compact.edge_targets = symbols.intern_all([edge["to"] for edge in edges])
+                metadata = {key: (None if key == "resolved_call_edges" else value)
+                            for key, value in metadata.items()}
+            called_by = metadata.get("called_by")
+            if isinstance(called_by, dict) and all(is_name_list(callers) for callers in called_by.values()):
+                compact.called_by = [
+                    (symbols.intern(callee), symbols.intern_all(callers))
+                    for callee, callers in called_by.items()
+                ]
+                metadata = {key: (None if key == "called_by" else value) for key, value in metadata.items()}
+        compact.metadata = metadata
+        symbols.seal()
+        return compact
+
+    def _function_record(self, name: str, data: Any, shared_layout) -> FunctionRecord:
+        if not isinstance(data, dict):
+            record = FunctionRecord(self.symbols.intern(name), None)
+            record.extra = {"": data}
+            return record
+        record = FunctionRecord(self.symbols.intern(name), shared_layout(tuple(data)))
+        extra: Dict[str, Any] = {}
+        for key, value in data.items():
+            if key in ("lineno", "end_lineno") and type(value) is int:
+                setattr(record, key, value)
+            elif key in ("calls", "resolved_calls") and is_name_list(value):
+                setattr(record, key, self.symbols.intern_all(value))
+            else:
+                extra[key] = value
+        record.extra = extra or None
+        return record
+
+    def to_model(self) -> Dict:
+        lookup_all = self.symbols.lookup_all
+        model: Dict[str, Any] = {}
+        for key in self.layout:
+            if key in self.extra:
+                model[key] = self.extra[key]
+            elif key == "files":
+                model[key] = {
+                    self.symbols.lookup(record.path): self._file_dict(record)
+                    for record in self.files
+                }
+            elif key == "metadata":
+                metadata = self.metadata
+                if self.edges_compacted or self.called_by is not None:
+                    metadata = dict(metadata)
+                if self.edges_compacted:
+                    metadata["resolved_call_edges"] = [
+                        {"from": src, "to": dst}
+                        for src, dst in zip(lookup_all(self.edge_sources), lookup_all(self.edge_targets))
+                    ]
+                if self.called_by is not None:
+                    metadata["called_by"] = {
+                        self.symbols.lookup(callee): lookup_all(callers)
+                        for callee, callers in self.called_by
+                    }
+                model[key] = metadata
+        return model
+
+    def _file_dict(self, record: FileRecord) -> Any:
+        if record.layout is None:
+            return record.extra[""]
+        lookup_all = self.symbols.lookup_all
+        data: Dict[str, Any] = {}
+        for key in record.layout:
+            if record.extra is not None and key in record.extra:
+                data[key] = record.extra[key]
+            elif key == "entry":
+                data[key] = record.entry
+            elif key in ("imports", "depends_on"):
+                data[key] = lookup_all(getattr(record, key))
+            elif key == "functions":
+                data[key] = {
+                    self.symbols.lookup(function.name): self._function_dict(function)
+                    for function in record.functions
+                }
+        return data
+
+    def _function_dict(self, record: FunctionRecord) -> Any:
+        if record.layout is None:
+            return record.extra[""]
+        lookup_all = self.symbols.lookup_all
+        data: Dict[str, Any] = {}
+        for key in record.layout:
+            if record.extra is not None and key in record.extra:
+                data[key] = record.extra[key]
+            elif key in ("calls", "resolved_calls"):
+                data[key] = lookup_all(getattr(record, key))
+            else:
+                data[key] = getattr(record, key)
+        return data
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_sources) if self.edge_sources is not None else 0
+
+    def iter_edges(self) -> Iterator[Tuple[str, str]]:
+        """Yield (from, to) name pairs of resolved_call_edges in stored order."""
+        if self.edge_sources is None:
+            return
+        names = self.symbols.names
+        for src, dst in zip(self.edge_sources, self.edge_targets):
+            yield names[src], names[dst]
@@ -0,0 +1,72 @@
+"""
+cycles.py - Import cycle report for the CODE_Sherpa file dependency graph.
+
+Runs the iterative Tarjan pass from reachability.py (no recursion limit) over
+depends_on and derives the import cycles, the condensation DAG and a
+topological layering, all in time linear in files plus dependency edges once
+the graph is indexed.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from app.engine_ast.callgraph import IndexedGraph
+from app.engine_ast.reachability import strongly_connected_components
+
+
+def build_dependency_structure(dependency_graph: Dict[str, List[str]]) -> Dict:
+    """
+    Condense the file dependency graph into strongly connected components.
+
+    Args:
+        dependency_graph: Output of build_file_dependency_graph (file -> files it imports)
+
+    Returns:
+        {
+            "cycles": files of every import cycle (components with more than one
+                file, or a file importing itself), each sorted,
+            "components": files of every component; component i only depends
+                on components with lower IDs,
+            "condensation_edges": sorted [importer component, imported component] pairs,
+            "layers": component IDs by layer; layer 0 imports nothing, layer k
+                depends on something in layer k - 1
+        }
+    """
+    graph = IndexedGraph.from_name_pairs(
+        ((file_path, dep) for file_path, deps in dependency_graph.items() for dep in deps),
+        nodes=dependency_graph
+    )
+    component, members = strongly_connected_components(graph)
+
+    components = [sorted(graph.names[node] for node in nodes) for nodes in members]
+    condensation: Set[Tuple[int, int]] = set()
+    self_loops: Set[int] = set()
+    for node in range(graph.node_count):
+        for dep in graph.successors(node):
+            if component[dep] != component[node]:
+                condensation.add((component[node], component[dep]))
+            elif dep == node:
+                self_loops.add(component[node])
+
+    # Tarjan emits dependencies first, so every dependency's layer is known already.
+    dependencies: List[List[int]] = [[] for _ in components]
+    for importer, imported in condensation:
+        dependencies[importer].append(imported)
+    layer_of: List[int] = []
+    layers: List[List[int]] = []
+    for comp, deps in enumerate(dependencies):
+        layer = 1 + max((layer_of[dep] for dep in deps), default=-1)
+        layer_of.append(layer)
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(comp)
+
+    cycles = sorted(
+        files for comp, files in enumerate(components)
+        if len(files) > 1 or comp in self_loops
+    )
+    return {
+        "cycles": cycles,
+        "components": components,
+        "condensation_edges": [list(edge) for edge in sorted(condensation)],
+        "layers": layers,
+    }
@@ -4,7 +4,7 @@ Builds local file relationships from normalized import modules.
 """
 
 from pathlib import Path
-from typing import Dict, List, Set, DefaultDict
+from typing import Any, Dict, List, Optional, Set, DefaultDict
 from collections import defaultdict
 
 
@@ -67,7 +67,68 @@ def import_to_file(import_name: str, module_index: Dict[str, List[str]]) -> str
     return None
 
 
-def build_file_dependency_graph(analysis_results: Dict[str, Dict]) -> Dict[str, List[str]]:
+# Trie slot holding the best-ranked file of the module that ends at that node.
+MODULE_FILE = None
+
+
+class ModuleResolver:
+    """
+    Resolves dotted module / import names against the files of one repository.
+    
+    Candidates are ranked once per module, modules live in a dotted-prefix trie
+    so "pkg.sub.module.symbol" finds its longest module prefix in one walk, and
+    every import string is resolved at most once. The same object carries the
+    module alias map the analyzer canonicalizes names with, so symbol
+    resolution and file resolution agree on one view of the repository.
+    """
+    
+    def __init__(self, module_index: Dict[str, List[str]], alias_map: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            module_index: Output from build_module_index()
+            alias_map: Output from analyzer.build_module_alias_map() for the same files
+        """
+        self.alias_map: Dict[str, str] = alias_map if alias_map is not None else {}
+        self._trie: Dict[Any, Any] = {}
+        for module, candidates in module_index.items():
+            node = self._trie
+            for part in module.split("."):
+                node = node.setdefault(part, {})
+            # max() keeps the first of equal ranks, like the stable sort import_to_file used
+            node[MODULE_FILE] = max(candidates, key=rank_candidate_file)
+        self._resolved: Dict[str, Optional[str]] = {}
+    
+    @classmethod
+    def from_files(cls, file_paths: List[str]) -> "ModuleResolver":
+        from app.engine_ast.analyzer import build_module_alias_map
+        
+        files = sorted(file_paths)
+        return cls(build_module_index(dict.fromkeys(files)), build_module_alias_map(files))
+    
+    def canonicalize(self, module_name: str) -> str:
+        return self.alias_map.get(module_name, module_name)
+    
+    def resolve(self, import_name: str) -> Optional[str]:
+        """Same result as import_to_file(import_name, module_index), memoized."""
+        try:
+            return self._resolved[import_name]
+        except KeyError:
+            pass
+        best = None
+        node = self._trie
+        for part in import_name.split("."):
+            node = node.get(part)
+            if node is None:
+                break
+            best = node.get(MODULE_FILE, best)
+        self._resolved[import_name] = best
+        return best
+
+
+def build_file_dependency_graph(
+    analysis_results: Dict[str, Dict],
+    resolver: Optional[ModuleResolver] = None
+) -> Dict[str, List[str]]:
     """
     Build a graph showing which files depend on which other files.
     
@@ -76,6 +137,7 @@ def build_file_dependency_graph(analysis_results: Dict[str, Dict]) -> Dict[str,
     
     Args:
         analysis_results: Output from analyze_repo_files()
+        resolver: ModuleResolver for the same files; built here when omitted
     
     Returns:
         Dictionary mapping file -> list of files it depends on
@@ -92,29 +154,77 @@ def build_file_dependency_graph(analysis_results: Dict[str, Dict]) -> Dict[str,
             'database.py': []
         }
     """
-    module_index = build_module_index(analysis_results)
+    if resolver is None:
+        resolver = ModuleResolver(build_module_index(analysis_results))
     
     # Build dependency graph
     dependency_graph = {}
     
     for file_path, file_data in analysis_results.items():
-        dependencies = []
-        
-        # Get imports for this file
-        imports = file_data.get('imports', [])
-        
-        for import_name in imports:
-            target_file = import_to_file(import_name, module_index)
-            
-            if target_file and target_file != file_path:  # Don't self-reference
-                dependencies.append(target_file)
-        
-        # Remove duplicates and sort for consistency
-        dependency_graph[file_path] = sorted(list(set(dependencies)))
+        dependency_graph[file_path] = resolve_file_dependencies(
+            file_path,
+            file_data.get('imports', []),
+            resolver
+        )
     
     return dependency_graph
 
 
+def resolve_file_dependencies(
+    file_path: str,
+    imports: List[str],
+    resolver: ModuleResolver
+) -> List[str]:
+    dependencies = []
+    for import_name in imports:
+        target_file = resolver.resolve(import_name)
+        
+        if target_file and target_file != file_path:  # Don't self-reference
+            dependencies.append(target_file)
+    
+    # Remove duplicates and sort for consistency
+    return sorted(list(set(dependencies)))
+
+
+def build_reverse_dependency_graph(dependency_graph: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Invert a dependency graph: map each file to the files that depend on it.
+    
+    Args:
+        dependency_graph: Output from build_file_dependency_graph()
+    
+    Returns:
+        Dictionary mapping file -> sorted list of files that import it
+    """
+    reverse_graph: Dict[str, List[str]] = {file_path: [] for file_path in dependency_graph}
+    for file_path in sorted(dependency_graph):
+        for dep_file in dependency_graph[file_path]:
+            reverse_graph.setdefault(dep_file, []).append(file_path)
+    return reverse_graph
+
+
+def find_importers_of_modules(
+    analysis_results: Dict[str, Dict],
+    modules: Set[str]
+) -> Set[str]:
+    """
+    Find files with an import equal to, or nested under, one of the given modules.
+    
+    These are the files whose import resolution can change when a module
+    appears in or disappears from the repository.
+    """
+    if not modules:
+        return set()
+    importers: Set[str] = set()
+    for file_path, file_data in analysis_results.items():
+        for import_name in file_data.get('imports', []):
+            parts = import_name.split(".")
+            if any(".".join(parts[:i]) in modules for i in range(1, len(parts) + 1)):
+                importers.add(file_path)
+                break
+    return importers
+
+
 def identify_entry_point(analysis_results: Dict[str, Dict]) -> str | None:
     """
     Identify the likely entry point of the codebase.
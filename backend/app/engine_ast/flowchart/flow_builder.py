@@ -3,15 +3,15 @@ flow_builder.py - Builds flowchart graph from analysis results
 Converts dependency graph to Mermaid flowchart format.
 """
 
-import json
 import sys
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
 # Add project root to Python path so imports work
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.engine_ast.flowchart.exporter import export_mermaid
+from app.engine_ast.serialization import read_model
 
 
 def node_group(file_path: str) -> str:
@@ -33,6 +33,30 @@ def node_id(file_path: str) -> str:
     )
 
 
+def build_function_name_index(files: Dict[str, Any]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Map each function name to the first two files (in files order) defining it.
+    
+    A call from file F targets the first defining file other than F, so two
+    entries are all a lookup ever needs.
+    """
+    index: Dict[str, Tuple[str, ...]] = {}
+    for file_path, file_data in files.items():
+        for func_name in file_data.get("functions", {}):
+            defined_in = index.get(func_name, ())
+            if len(defined_in) < 2:
+                index[func_name] = defined_in + (file_path,)
+    return index
+
+
+def first_other_definer(defined_in: Optional[Tuple[str, ...]], file_path: str) -> Optional[str]:
+    if not defined_in:
+        return None
+    if defined_in[0] != file_path:
+        return defined_in[0]
+    return defined_in[1] if len(defined_in) > 1 else None
+
+
 def build_graph_from_analysis(analysis_data: Dict[str, Any]) -> Dict[str, List]:
     """
     Build graph structure with edges from unified model.
@@ -55,6 +79,7 @@ def build_graph_from_analysis(analysis_data: Dict[str, Any]) -> Dict[str, List]:
     edges = []
     nodes = {}
     files = analysis_data.get("files", {})
+    defining_files = build_function_name_index(files)
     
     # Build edges from file dependencies
     for file_path, file_data in files.items():
@@ -79,17 +104,14 @@ def build_graph_from_analysis(analysis_data: Dict[str, Any]) -> Dict[str, List]:
             calls = func_data.get("calls", [])
             for called_func in calls:
                 # Check if called function is in another file
-                for other_file, other_data in files.items():
-                    if other_file != file_path:
-                        other_functions = other_data.get("functions", {})
-                        if called_func in other_functions:
-                            # Function call across files
-                            edges.append({
-                                "source": node_id(file_path),
-                                "target": node_id(other_file),
-                                "type": "calls"
-                            })
-                            break
+                other_file = first_other_definer(defining_files.get(called_func), file_path)
+                if other_file is not None:
+                    # Function call across files
+                    edges.append({
+                        "source": node_id(file_path),
+                        "target": node_id(other_file),
+                        "type": "calls"
+                    })
 
     return {
         "nodes": sorted(nodes.values(), key=lambda n: n["label"]),
@@ -136,7 +158,7 @@ def build_simple_file_graph(analysis_data: Dict[str, Any]) -> Dict[str, List]:
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python flow_builder.py <analysis.json> [--output <output_file>]", file=sys.stderr)
+        print("Usage: python flow_builder.py <analysis.json|analysis.bin> [--output <output_file>]", file=sys.stderr)
         sys.exit(1)
     
     analysis_file = sys.argv[1]
@@ -154,8 +176,7 @@ def main():
     
     try:
         # Load analysis data
-        with open(analysis_file, "r", encoding="utf-8") as f:
-            analysis_data = json.load(f)
+        analysis_data = read_model(analysis_file)
         
         # Build graph (using simple file-level graph)
         graph = build_simple_file_graph(analysis_data)
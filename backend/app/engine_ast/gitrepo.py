@@ -0,0 +1,233 @@
+"""
+gitrepo.py - Git-backed source access for CODE_Sherpa ingestion.
+
+Lets ingestion work from a bare (or --no-checkout) clone: paths come from
+`git ls-tree`, blob contents stream through a single `git cat-file --batch`
+process, and nothing is written to a working tree. Also provides a partial,
+sparse clone that only downloads the blobs analysis reads, and the same
+path -> source mapping for a checkout, so every ingest mode reads each file
+exactly once and shares the text between analysis and chunking.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from app.engine_ast.analyzer import SourceMap, UnreadableSource, read_python_source
+from app.engine_ast.parser import FileTraverser, filter_python_paths, get_python_files, parse_project_config
+
+logger = logging.getLogger(__name__)
+
+# ls-tree modes of regular files; symlinks (120000) and submodules (160000) are skipped.
+BLOB_MODES = {"100644", "100755"}
+
+# Non-cone sparse-checkout patterns: every Python file plus the root project config.
+SPARSE_PATTERNS = ["*.py", "/pyproject.toml"]
+
+
+def run_git(args: List[str], cwd: Optional[str] = None) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def directory_bytes(path: str, skip_dir: Optional[str] = None) -> int:
+    """Total size of the files below path, optionally skipping one top-level directory."""
+    total = 0
+    for current, dirs, files in os.walk(path):
+        if skip_dir and current == path:
+            dirs[:] = [d for d in dirs if d != skip_dir]
+        for file_name in files:
+            try:
+                total += os.lstat(os.path.join(current, file_name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def object_store_bytes(repo_dir: str) -> int:
+    """Bytes in the clone's object store (packs and loose objects)."""
+    objects_dir = run_git(["rev-parse", "--git-path", "objects"], cwd=repo_dir).strip()
+    return directory_bytes(os.path.join(repo_dir, objects_dir))
+
+
+def clone_bytes_report(repo_dir: str, bare: bool = False) -> Dict[str, int]:
+    """Bytes fetched and written by a plain (full-blob) clone."""
+    return {
+        "clone_object_bytes": object_store_bytes(repo_dir),
+        "worktree_bytes": 0 if bare else directory_bytes(repo_dir, skip_dir=".git"),
+    }
+
+
+def sparse_clone(
+    repo_url: str,
+    dest: str,
+    patterns: Optional[List[str]] = None,
+    depth: int = 1
+) -> Dict[str, int]:
+    """
+    Clone without blobs, then check out only the files matching patterns.
+
+    `--filter=blob:none --no-checkout` downloads commits and trees only; the
+    sparse checkout then fetches the matching blobs in one batch. The server
+    must support partial clone (GitHub does); otherwise git falls back to a
+    full fetch and the result is still correct, just not smaller.
+
+    Returns:
+        Bytes per stage: clone_object_bytes (commits and trees),
+        checkout_object_bytes (blobs fetched for the checkout) and
+        worktree_bytes (files written)
+    """
+    run_git(["clone", "--filter=blob:none", "--no-checkout", f"--depth={depth}", repo_url, dest])
+    clone_object_bytes = object_store_bytes(dest)
+    run_git(["sparse-checkout", "set", "--no-cone", *(patterns or SPARSE_PATTERNS)], cwd=dest)
+    run_git(["checkout"], cwd=dest)
+    return {
+        "clone_object_bytes": clone_object_bytes,
+        "checkout_object_bytes": object_store_bytes(dest) - clone_object_bytes,
+        "worktree_bytes": directory_bytes(dest, skip_dir=".git"),
+    }
+
+
+def list_tree_blobs(git_dir: str, rev: str = "HEAD") -> Dict[str, str]:
+    """
+    List every regular file in a commit's tree.
+
+    Args:
+        git_dir: Bare repository or any directory inside a clone
+        rev: Commit-ish to read
+
+    Returns:
+        Mapping of repo-relative path to blob object id
+    """
+    result = subprocess.run(
+        ["git", "-C", git_dir, "ls-tree", "-r", "-z", "--full-tree", rev],
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git ls-tree failed: {os.fsdecode(result.stderr).strip()}")
+
+    blobs: Dict[str, str] = {}
+    for record in result.stdout.split(b"\0"):
+        if not record:
+            continue
+        header, _, raw_path = record.partition(b"\t")
+        mode, object_type, oid = os.fsdecode(header).split()
+        if object_type == "blob" and mode in BLOB_MODES:
+            blobs[os.fsdecode(raw_path)] = oid
+    return blobs
+
+
+def iter_blob_contents(git_dir: str, oids: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream blob contents through one `git cat-file --batch` process.
+
+    Object ids are fed from a writer thread so git never blocks on a full
+    stdout pipe while we are still writing requests.
+
+    Yields:
+        (oid, raw bytes) in the order of oids
+    """
+    process = subprocess.Popen(
+        ["git", "-C", git_dir, "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+
+    def feed() -> None:
+        try:
+            for oid in oids:
+                process.stdin.write(f"{oid}\n".encode("ascii"))
+            process.stdin.close()
+        except (BrokenPipeError, ValueError):
+            # The reader stopped early and git has exited.
+            pass
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        for oid in oids:
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                raise RuntimeError(f"git cat-file could not read object {oid}")
+            size = int(header[2])
+            data = process.stdout.read(size)
+            process.stdout.read(1)  # trailing newline
+            yield oid, data
+    finally:
+        process.stdout.close()
+        writer.join()
+        process.wait()
+
+
+def decode_source(data: bytes) -> Union[str, UnreadableSource]:
+    """Decode a blob the way read_python_source reads a checked-out file."""
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        return UnreadableSource(str(exc), "decode_error")
+    # Universal newlines, as text-mode reads apply to working tree files.
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def load_git_sources(
+    git_dir: str,
+    rev: str = "HEAD",
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None
+) -> SourceMap:
+    """
+    Read the Python sources of a commit without checking it out.
+
+    The same files as get_python_files on a checkout of rev are selected: the
+    built-in excludes plus [tool.codesherpa] from the committed pyproject.toml.
+    Like git index discovery, committed files are never dropped by .gitignore.
+    Blobs that are not valid UTF-8 are kept as UnreadableSource("decode_error"),
+    so the model lists them in parse_errors instead of losing them.
+
+    Returns:
+        Mapping of repo-relative path to source text, in sorted path order
+    """
+    blobs = list_tree_blobs(git_dir, rev)
+
+    config: Dict[str, List[str]] = {}
+    if "pyproject.toml" in blobs:
+        for _, data in iter_blob_contents(git_dir, [blobs["pyproject.toml"]]):
+            config = parse_project_config(data, f"{rev}:pyproject.toml")
+
+    matcher, include_matcher = FileTraverser.build_path_rules(config, include, exclude)
+    paths = filter_python_paths(list(blobs), matcher, include_matcher)
+
+    sources: SourceMap = {}
+    oids = [blobs[path] for path in paths]
+    for (_, data), path in zip(iter_blob_contents(git_dir, oids), paths):
+        source = decode_source(data)
+        if isinstance(source, UnreadableSource):
+            logger.warning(f"Cannot analyze {path}: {source.error}")
+        sources[path] = source
+    return sources
+
+
+def load_checkout_sources(repo_path: str) -> SourceMap:
+    """
+    Read the Python sources of a working tree, selected like get_python_files.
+
+    Files are read with universal newlines, as analysis and chunking read
+    them from disk; unreadable or non-UTF-8 files are kept as UnreadableSource
+    ("read_error" / "decode_error"), as in load_git_sources.
+
+    Returns:
+        Mapping of repo-relative path to source text, in sorted path order
+    """
+    sources: SourceMap = {}
+    for path in sorted(get_python_files(repo_path)):
+        source = read_python_source(Path(repo_path) / path)
+        if isinstance(source, UnreadableSource):
+            logger.warning(f"Cannot analyze {path}: {source.error}")
+        sources[path] = source
+    return sources
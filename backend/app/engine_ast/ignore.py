@@ -0,0 +1,242 @@
+"""
+ignore.py - gitignore-style path matching for CODE_Sherpa traversal.
+
+Every rule (built-in excludes, .gitignore files, project config) is compiled
+into a single regular expression, so checking an entry costs one regex match
+no matter how many patterns are active.
+"""
+
+import logging
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (regex source, negated) for one translated pattern
+Rule = Tuple[str, bool]
+
+# POSIX bracket expressions ([[:alpha:]]) as regex class members.
+POSIX_CLASSES = {
+    "alnum": "a-zA-Z0-9",
+    "alpha": "a-zA-Z",
+    "blank": " \\t",
+    "cntrl": "\\x00-\\x1f\\x7f",
+    "digit": "0-9",
+    "graph": "!-~",
+    "lower": "a-z",
+    "print": " -~",
+    "punct": "!-/:-@\\[-`{-~",
+    "space": " \\t\\n\\r\\f\\v",
+    "upper": "A-Z",
+    "xdigit": "0-9A-Fa-f",
+}
+
+
+def _translate_bracket(glob: str, start: int) -> Optional[Tuple[str, int]]:
+    """
+    Translate the bracket expression opening at glob[start].
+
+    Returns:
+        (regex class, index of the closing ']'), or None when the bracket is
+        never closed and '[' is a literal
+
+    Raises:
+        re.error: for an unknown [:class:] name
+    """
+    i = start + 1
+    n = len(glob)
+    negated = glob[i:i + 1] in ("!", "^")
+    if negated:
+        i += 1
+    members: List[str] = []
+    first = True
+    while i < n:
+        char = glob[i]
+        if char == "]" and not first:
+            return "[" + ("^" if negated else "") + "".join(members) + "]", i
+        first = False
+        if glob.startswith("[:", i):
+            end = glob.find(":]", i + 2)
+            if end != -1:
+                name = glob[i + 2:end]
+                if name not in POSIX_CLASSES:
+                    raise re.error(f"unknown character class [:{name}:]")
+                members.append(POSIX_CLASSES[name])
+                i = end + 2
+                continue
+        if char == "\\" and i + 1 < n:
+            i += 1
+            char = glob[i]
+        # '-' stays a range operator; everything else is a literal member
+        members.append(char if char == "-" else re.escape(char))
+        i += 1
+    return None
+
+
+def _translate_glob(glob: str) -> str:
+    """Translate gitignore glob syntax ('*', '?', '**', '[...]') to regex source."""
+    out: List[str] = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        char = glob[i]
+        if char == "*":
+            if glob.startswith("**", i):
+                at_segment_start = i == 0 or glob[i - 1] == "/"
+                if at_segment_start and glob.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if at_segment_start and i + 2 == n:
+                    out.append(".*")
+                    i += 2
+                    continue
+                # Any other run of asterisks is an ordinary '*'
+                while i < n and glob[i] == "*":
+                    i += 1
+                out.append("[^/]*")
+                continue
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            bracket = _translate_bracket(glob, i)
+            if bracket is None:
+                out.append(re.escape(char))
+            else:
+                out.append(bracket[0])
+                i = bracket[1]
+        elif char == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def translate_pattern(line: str, base: str = "", include: bool = False) -> Optional[Rule]:
+    """
+    Translate one gitignore line into a rule.
+
+    Args:
+        line: Raw line from an ignore file or config
+        base: Directory (relative to the repo root, no trailing slash) the pattern is scoped to
+        include: Build an include rule, which also matches everything below a matched directory
+
+    Returns:
+        (regex source, negated), or None for blank lines and comments
+    """
+    pattern = line.rstrip("\n").rstrip("\r")
+    # Trailing spaces are ignored unless escaped
+    while pattern.endswith(" ") and not pattern.endswith("\\ "):
+        pattern = pattern[:-1]
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to its base directory
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = re.escape(base + "/") if base else ""
+    if not anchored:
+        regex += "(?:.*/)?"
+    regex += _translate_glob(pattern)
+
+    # Subjects are "path" for files and "path/" for directories
+    if include:
+        regex += "/.+" if dir_only else "(?:/.*)?"
+    else:
+        regex += "/" if dir_only else "/?"
+    return regex, negated
+
+
+def read_ignore_file(path: str) -> List[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.readlines()
+    except OSError:
+        return []
+
+
+class IgnoreMatcher:
+    """Compiled, last-match-wins set of gitignore rules."""
+
+    def __init__(self, rules: Optional[List[Rule]] = None, overrides: Optional[List[Rule]] = None):
+        """
+        Args:
+            rules: Rules in precedence order (later rules win)
+            overrides: Rules that always take precedence over rules, even ones added later
+        """
+        self.rules = list(rules or [])
+        self.overrides = list(overrides or [])
+        ordered = self.rules + self.overrides
+        self._negated = [negated for _, negated in ordered]
+        self._regex: Optional[Pattern[str]] = None
+        if ordered:
+            # Reversed alternation: the first alternative that matches is the last applicable rule
+            alternatives = [
+                f"(?P<r{index}>{source})"
+                for index, (source, _) in reversed(list(enumerate(ordered)))
+            ]
+            self._regex = re.compile("|".join(alternatives), re.DOTALL)
+
+    def with_rules(self, rules: List[Rule]) -> "IgnoreMatcher":
+        """Return a matcher for a subtree that adds rules below the existing ones."""
+        if not rules:
+            return self
+        return IgnoreMatcher(self.rules + rules, self.overrides)
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Check a path relative to the repo root.
+
+        Parent directories are not consulted; callers prune ignored directories
+        before descending, exactly like git does.
+        """
+        if self._regex is None:
+            return False
+        match = self._regex.fullmatch(rel_path + "/" if is_dir else rel_path)
+        if match is None:
+            return False
+        return not self._negated[int(match.lastgroup[1:])]
+
+
+def compile_rules(lines: Iterable[str], base: str = "", include: bool = False) -> List[Rule]:
+    """Translate lines into rules; like git, a pattern that cannot be compiled is skipped."""
+    rules: List[Rule] = []
+    for line in lines:
+        try:
+            rule = translate_pattern(line, base, include=include)
+            if rule is not None:
+                re.compile(rule[0])
+        except re.error as exc:
+            logger.debug(f"Skipping invalid ignore pattern {line.strip()!r}: {exc}")
+            continue
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+
+def compile_include_matcher(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    """
+    Compile include patterns into one regex matched against file paths.
+
+    A directory pattern such as "src/" includes every file below it.
+    Returns None when there are no include patterns (everything is included).
+    """
+    sources = [source for source, negated in compile_rules(patterns, include=True) if not negated]
+    if not sources:
+        return None
+    return re.compile("|".join(f"(?:{source})" for source in sources), re.DOTALL)
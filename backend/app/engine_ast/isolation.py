@@ -0,0 +1,277 @@
+"""
+isolation.py - Resource-limited analysis workers for CODE_Sherpa.
+
+One pathological file (giant generated tables, deeply nested expressions)
+must not stall or kill a whole ingest. analyze_isolated runs analyze_source in
+worker processes that each cap their address space (RLIMIT_AS) and, before
+every file, move their CPU-time soft limit (RLIMIT_CPU) to "used so far + the
+per-file budget", so the kernel stops a runaway ast.parse even while it is
+inside C code. The parent streams small chunks of files to the workers,
+notices a worker that died or stopped making progress, records the file it was
+on as failed with a reason (see FAILURE_REASONS), and restarts a worker for
+the rest of that chunk.
+
+Limits are enforced where the platform has the resource module (Linux,
+macOS); elsewhere only the parent's wall-clock watchdog applies.
+"""
+
+import math
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Deque, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from app.instrumentation import FileTiming
+
+DEFAULT_CPU_SECONDS = 30
+DEFAULT_MEMORY_MB = 2048
+
+# Files handed to a worker at a time; small enough that a crash only re-queues a few.
+CHUNK_FILES = 16
+
+# A worker that reports nothing for this multiple of the CPU budget (plus slack) is killed.
+WALL_LIMIT_FACTOR = 3
+WALL_LIMIT_SLACK_SECONDS = 5
+
+FAILURE_REASONS = {
+    "cpu_limit": "Analysis exceeded the per-file CPU time limit",
+    "memory_limit": "Analysis ran out of memory (memory limit or parser stack exhausted)",
+    "recursion_limit": "Analysis exceeded the recursion limit (too deeply nested code)",
+    "timeout": "Analysis made no progress before the wall-clock deadline",
+    "worker_crash": "Analysis worker process crashed",
+}
+
+
+class FileLimits:
+    """Per-file resource caps for isolated analysis; None disables a cap."""
+
+    def __init__(
+        self,
+        cpu_seconds: Optional[int] = DEFAULT_CPU_SECONDS,
+        memory_mb: Optional[int] = DEFAULT_MEMORY_MB
+    ):
+        """
+        Args:
+            cpu_seconds: CPU time one file may take (whole seconds, the RLIMIT_CPU granularity)
+            memory_mb: Address space a worker may grow by beyond its size at startup
+        """
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+
+    @classmethod
+    def from_env(cls) -> Optional["FileLimits"]:
+        """
+        Limits configured by SHERPA_FILE_CPU_SECONDS / SHERPA_FILE_MEMORY_MB.
+
+        Isolation forks worker processes for every run, so it is opt-in.
+
+        Returns:
+            None unless SHERPA_FILE_LIMITS is set to "on" (analysis then runs in-process)
+        """
+        if os.getenv("SHERPA_FILE_LIMITS", "off").strip().lower() not in {"on", "1", "true"}:
+            return None
+        return cls(
+            cpu_seconds=int(os.getenv("SHERPA_FILE_CPU_SECONDS", str(DEFAULT_CPU_SECONDS))) or None,
+            memory_mb=int(os.getenv("SHERPA_FILE_MEMORY_MB", str(DEFAULT_MEMORY_MB))) or None
+        )
+
+    @property
+    def wall_seconds(self) -> Optional[float]:
+        if self.cpu_seconds is None:
+            return None
+        return self.cpu_seconds * WALL_LIMIT_FACTOR + WALL_LIMIT_SLACK_SECONDS
+
+
+def address_space_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def set_soft_limit(limit: int, soft: int) -> None:
+    _, hard = resource.getrlimit(limit)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(limit, (soft, hard))
+
+
+def apply_worker_limits(limits: FileLimits) -> None:
+    """One-time setup inside a worker: no core dumps, capped address space."""
+    if resource is None:
+        return
+    set_soft_limit(resource.RLIMIT_CORE, 0)
+    baseline = address_space_bytes()
+    if limits.memory_mb is not None and baseline is not None:
+        set_soft_limit(resource.RLIMIT_AS, baseline + limits.memory_mb * 1024 * 1024)
+
+
+def arm_cpu_limit(cpu_seconds: Optional[int]) -> None:
+    """Let the next file use at most cpu_seconds more CPU before SIGXCPU ends the worker."""
+    if resource is None or cpu_seconds is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    set_soft_limit(resource.RLIMIT_CPU, math.ceil(usage.ru_utime + usage.ru_stime) + cpu_seconds)
+
+
+def isolated_worker(conn, module_alias_map: Dict[str, str], skim: bool, limits: FileLimits) -> None:
+    """Worker loop: analyze each received chunk, one message per file, None when the chunk is done."""
+    from app.engine_ast.analyzer import analyze_source_timed, failed_analysis
+
+    apply_worker_limits(limits)
+    while True:
+        chunk = conn.recv()
+        if chunk is None:
+            return
+        for file_rel_path, source in chunk:
+            arm_cpu_limit(limits.cpu_seconds)
+            start = time.perf_counter()
+            try:
+                result, parse_seconds = analyze_source_timed(source, file_rel_path, module_alias_map, skim=skim)
+            except RecursionError as exc:
+                result, parse_seconds = failed_analysis(f"RecursionError: {exc}", "recursion_limit"), 0.0
+            except MemoryError:
+                result, parse_seconds = failed_analysis(FAILURE_REASONS["memory_limit"], "memory_limit"), 0.0
+            conn.send((file_rel_path, result, time.perf_counter() - start, parse_seconds))
+        conn.send(None)
+
+
+def exit_reason(exitcode: Optional[int]) -> str:
+    if resource is not None and exitcode == -signal.SIGXCPU:
+        return "cpu_limit"
+    return "worker_crash"
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "chunk", "done", "deadline", "started")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.chunk: List[Tuple[str, str]] = []
+        self.done = 0
+        self.deadline: Optional[float] = None
+        self.started = 0.0
+
+
+def analyze_isolated(
+    items: List[Tuple[str, str]],
+    module_alias_map: Dict[str, str],
+    limits: FileLimits,
+    worker_count: int = 1,
+    skim: bool = False
+) -> Tuple[Dict[str, Dict], List[FileTiming]]:
+    """
+    Analyze (relative path, source) pairs in resource-limited worker processes.
+
+    Returns:
+        (results keyed by path, per-file timings). A file that hit a limit or
+        crashed its worker gets failed_analysis output whose failure_reason is
+        a FAILURE_REASONS key; every other file is analyzed normally.
+    """
+    from app.engine_ast.analyzer import failed_analysis
+
+    results: Dict[str, Dict] = {}
+    timings: List[FileTiming] = []
+    queue: Deque[List[Tuple[str, str]]] = deque(
+        items[index:index + CHUNK_FILES] for index in range(0, len(items), CHUNK_FILES)
+    )
+    context = multiprocessing.get_context()
+    workers: List[_Worker] = []
+    wall_seconds = limits.wall_seconds
+
+    def assign(worker: _Worker, chunk: List[Tuple[str, str]]) -> None:
+        worker.chunk = chunk
+        worker.done = 0
+        worker.started = time.perf_counter()
+        worker.deadline = None if wall_seconds is None else time.monotonic() + wall_seconds
+        try:
+            worker.conn.send(chunk)
+        except (BrokenPipeError, OSError):
+            # The worker already died; wait() reports its EOF and retire handles it.
+            pass
+
+    def start_worker() -> None:
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=isolated_worker,
+            args=(child_conn, module_alias_map, skim, limits),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        workers.append(worker)
+        assign(worker, queue.popleft())
+
+    def stop(worker: _Worker) -> None:
+        worker.process.join()
+        worker.conn.close()
+        workers.remove(worker)
+
+    def retire(worker: _Worker, reason: Optional[str] = None) -> None:
+        """Record the file a dead (or killed) worker was on and re-queue the rest of its chunk."""
+        stop(worker)
+        if worker.done >= len(worker.chunk):
+            # Died after its last result but before asking for more work.
+            return
+        file_rel_path = worker.chunk[worker.done][0]
+        reason = reason or exit_reason(worker.process.exitcode)
+        results[file_rel_path] = failed_analysis(FAILURE_REASONS[reason], reason)
+        timings.append((file_rel_path, time.perf_counter() - worker.started, 0.0))
+        rest = worker.chunk[worker.done + 1:]
+        if rest:
+            queue.appendleft(rest)
+
+    try:
+        while queue and len(workers) < max(1, worker_count):
+            start_worker()
+        while workers:
+            timeout = None
+            deadlines = [worker.deadline for worker in workers if worker.deadline is not None]
+            if deadlines:
+                timeout = max(0.0, min(deadlines) - time.monotonic())
+            ready = wait([worker.conn for worker in workers], timeout)
+            for worker in list(workers):
+                if worker.conn in ready:
+                    try:
+                        message = worker.conn.recv()
+                    except (EOFError, OSError):
+                        retire(worker)
+                        continue
+                    if message is not None:
+                        file_rel_path, result, seconds, parse_seconds = message
+                        results[file_rel_path] = result
+                        timings.append((file_rel_path, seconds, parse_seconds))
+                        worker.done += 1
+                        worker.started = time.perf_counter()
+                        if wall_seconds is not None:
+                            worker.deadline = time.monotonic() + wall_seconds
+                    elif queue:
+                        assign(worker, queue.popleft())
+                    else:
+                        try:
+                            worker.conn.send(None)
+                        except (BrokenPipeError, OSError):
+                            pass
+                        stop(worker)
+                elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                    worker.process.kill()
+                    retire(worker, "timeout")
+            while queue and len(workers) < max(1, worker_count):
+                start_worker()
+    finally:
+        for worker in workers:
+            worker.process.kill()
+            worker.process.join()
+            worker.conn.close()
+    return results, timings
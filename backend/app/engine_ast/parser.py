@@ -1,11 +1,57 @@
 """
 parser.py - File Traversal Logic for CODE_Sherpa
-Recursively discovers Python source files while excluding common non-source directories.
+Recursively discovers Python source files while excluding common non-source directories,
+paths ignored by .gitignore and project-configured excludes. Inside git repositories the
+tracked files are listed straight from the index instead of walking the working tree.
 """
 
+import logging
 import os
+import subprocess
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, Iterator, List, Optional, Pattern, Set, Tuple
+
+from app.engine_ast.ignore import (
+    IgnoreMatcher,
+    compile_include_matcher,
+    compile_rules,
+    read_ignore_file,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_project_config(root_path: Path) -> Dict[str, List[str]]:
+    """
+    Read the [tool.codesherpa] table from pyproject.toml, if present.
+    
+    Supported keys: include, exclude (lists of gitignore-style patterns) and
+    gitignore (bool). Requires tomllib (Python 3.11+); older interpreters skip it.
+    """
+    pyproject = root_path / "pyproject.toml"
+    if not pyproject.is_file():
+        return {}
+    try:
+        return parse_project_config(pyproject.read_bytes(), str(pyproject))
+    except OSError as exc:
+        logger.warning(f"Could not read {pyproject}: {exc}")
+        return {}
+
+
+def parse_project_config(data: bytes, source: str = "pyproject.toml") -> Dict[str, List[str]]:
+    """Extract [tool.codesherpa] from raw pyproject.toml bytes (see load_project_config)."""
+    try:
+        import tomllib
+    except ImportError:
+        logger.debug("tomllib unavailable; ignoring [tool.codesherpa] config")
+        return {}
+    try:
+        data = tomllib.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as exc:
+        logger.warning(f"Could not parse {source}: {exc}")
+        return {}
+    config = data.get("tool", {}).get("codesherpa", {})
+    return config if isinstance(config, dict) else {}
 
 
 class FileTraverser:
@@ -37,12 +83,27 @@ class FileTraverser:
     # File extensions to include
     INCLUDED_EXTENSIONS: Set[str] = {'.py'}
     
-    def __init__(self, root_path: str):
+    # Hidden files and directories are skipped unless re-included by config
+    HIDDEN_PATTERN = '.*'
+    
+    def __init__(
+        self,
+        root_path: str,
+        use_gitignore: Optional[bool] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ):
         """
         Initialize the file traverser.
         
         Args:
             root_path: Root directory to start traversal from
+            use_gitignore: Honor .gitignore files and .git/info/exclude
+                (default: the project config, else True)
+            include: Extra gitignore-style patterns; when any include pattern
+                exists, only matching files are kept
+            exclude: Extra gitignore-style patterns to skip; these win over
+                .gitignore and may re-include with '!'
         """
         self.root_path = Path(root_path).resolve()
         
@@ -51,100 +112,263 @@ class FileTraverser:
         
         if not self.root_path.is_dir():
             raise ValueError(f"Path is not a directory: {root_path}")
+        
+        config = load_project_config(self.root_path)
+        if use_gitignore is None:
+            use_gitignore = bool(config.get("gitignore", True))
+        self.use_gitignore = use_gitignore
+        
+        self.matcher, self.include_matcher = self.build_path_rules(config, include, exclude)
     
-    def _should_exclude_dir(self, dir_name: str) -> bool:
+    @classmethod
+    def build_path_rules(
+        cls,
+        config: Dict[str, List[str]],
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> Tuple[IgnoreMatcher, Optional[Pattern[str]]]:
         """
-        Check if a directory should be excluded from traversal.
+        Compile the built-in excludes, project config and explicit patterns.
+        
+        Returns:
+            (exclude matcher without any .gitignore rules, include regex or None)
+        """
+        default_patterns = [f"{name.rstrip('/')}/" for name in sorted(cls.EXCLUDED_DIRS)]
+        default_patterns.append(cls.HIDDEN_PATTERN)
+        override_patterns = list(config.get("exclude", [])) + list(exclude or [])
+        matcher = IgnoreMatcher(compile_rules(default_patterns), compile_rules(override_patterns))
+        include_matcher = compile_include_matcher(list(config.get("include", [])) + list(include or []))
+        return matcher, include_matcher
+    
+    def _directory_matcher(
+        self,
+        matcher: IgnoreMatcher,
+        dir_path: str,
+        rel_dir: str,
+        has_gitignore: bool
+    ) -> IgnoreMatcher:
+        """Add the rules of a directory's own .gitignore (and, at the root, .git/info/exclude)."""
+        if not self.use_gitignore:
+            return matcher
+        lines: List[str] = []
+        if not rel_dir:
+            lines.extend(read_ignore_file(os.path.join(dir_path, '.git', 'info', 'exclude')))
+        if has_gitignore:
+            lines.extend(read_ignore_file(os.path.join(dir_path, '.gitignore')))
+        return matcher.with_rules(compile_rules(lines, rel_dir.rstrip('/')))
+    
+    def _is_valid_python_file(self, file_name: str) -> bool:
+        """
+        Check if a file name denotes a Python source file.
         
         Args:
-            dir_name: Name of the directory to check
+            file_name: Base name of the file
             
         Returns:
-            True if directory should be excluded, False otherwise
+            True if file should be included, False otherwise
+        """
+        # Hidden files are handled by the ignore rules
+        return os.path.splitext(file_name)[1] in self.INCLUDED_EXTENSIONS
+    
+    def _scan(
+        self,
+        dir_path: str,
+        rel_dir: str,
+        matcher: IgnoreMatcher,
+        sort: bool
+    ) -> Tuple[Iterator[Tuple[os.DirEntry, bool]], IgnoreMatcher]:
         """
-        # Check exact matches
-        if dir_name in self.EXCLUDED_DIRS:
-            return True
+        List a directory once, pairing each entry with its (cached) is_dir flag.
         
-        # Check if it starts with a dot (hidden directories)
-        if dir_name.startswith('.'):
-            return True
-
-        if dir_name.endswith('.egg-info'):
-            return True
+        When sorting, directories sort as "name/" so that a depth-first walk
+        yields paths in exactly the order of a global string sort.
         
-        return False
+        Returns:
+            (entry iterator, matcher with the directory's own ignore rules applied)
+        """
+        entries = []
+        has_gitignore = False
+        try:
+            with os.scandir(dir_path) as scanner:
+                for entry in scanner:
+                    try:
+                        entries.append((entry, entry.is_dir()))
+                    except OSError:
+                        continue
+                    if entry.name == '.gitignore':
+                        has_gitignore = True
+        except OSError:
+            return iter(()), matcher
+        if sort:
+            entries.sort(key=lambda pair: pair[0].name + '/' if pair[1] else pair[0].name)
+        return iter(entries), self._directory_matcher(matcher, dir_path, rel_dir, has_gitignore)
     
-    def _is_valid_python_file(self, file_path: Path) -> bool:
+    def iter_files(self, sort: bool = False) -> Iterator[str]:
         """
-        Check if a file is a valid Python source file.
+        Lazily walk the tree with os.scandir, yielding Python files as they are found.
+        
+        Directory entry types come from the scandir data, so no per-file stat,
+        access check or Path object is needed. Unreadable files are yielded and
+        surface later as read errors. Ignored directories are pruned before
+        they are listed, so their subtrees cost no I/O at all.
         
         Args:
-            file_path: Path to the file
+            sort: Yield paths in sorted order (still streaming, one directory at a time)
             
-        Returns:
-            True if file should be included, False otherwise
+        Yields:
+            Relative paths (forward slashes) to Python files from root_path
+        """
+        root_entries, root_matcher = self._scan(str(self.root_path), '', self.matcher, sort)
+        stack = [('', root_entries, root_matcher)]
+        include = self.include_matcher
+        while stack:
+            rel_dir, entries, matcher = stack[-1]
+            item = next(entries, None)
+            if item is None:
+                stack.pop()
+                continue
+            entry, is_dir = item
+            rel_path = rel_dir + entry.name
+            if is_dir:
+                # Like os.walk, never follow directory symlinks
+                if entry.is_symlink() or matcher.is_ignored(rel_path, True):
+                    continue
+                child_dir = rel_path + '/'
+                child_entries, child_matcher = self._scan(entry.path, child_dir, matcher, sort)
+                stack.append((child_dir, child_entries, child_matcher))
+            elif (
+                self._is_valid_python_file(entry.name)
+                and not matcher.is_ignored(rel_path, False)
+                and (include is None or include.fullmatch(rel_path))
+                and entry.is_file()
+            ):
+                yield rel_path
+    
+    def is_git_repository(self) -> bool:
+        """True when root_path is the top of a git working tree (has a .git dir or file)."""
+        return (self.root_path / '.git').exists()
+    
+    def list_tracked_files(self, include_untracked: bool = False) -> Optional[List[str]]:
         """
-        # Check extension
-        if file_path.suffix not in self.INCLUDED_EXTENSIONS:
-            return False
+        List tracked Python files from the git index with `git ls-files -z`.
         
-        # Exclude files starting with dot
-        if file_path.name.startswith('.'):
-            return False
+        Nothing outside the index is touched, so untracked files and large data
+        directories cost nothing. Tracked files deleted from the working tree
+        are skipped. Tracked files are never gitignored (same as git), but the
+        built-in excludes and project config still apply.
         
-        # Check if file is readable
-        if not os.access(file_path, os.R_OK):
-            return False
+        Args:
+            include_untracked: Also list untracked files git does not ignore;
+                git then walks every non-ignored untracked directory
         
-        return True
+        Returns:
+            Sorted relative paths, or None when root_path is not inside a git
+            repository or git is unavailable
+        """
+        command = ['git', 'ls-files', '-z', '--cached']
+        if include_untracked:
+            command += ['--others', '--exclude-standard']
+        try:
+            result = subprocess.run(
+                command + ['--', '*.py'],
+                cwd=self.root_path,
+                capture_output=True
+            )
+        except OSError as exc:
+            logger.debug(f"git unavailable for {self.root_path}: {exc}")
+            return None
+        if result.returncode != 0:
+            return None
+        
+        paths = [os.fsdecode(raw) for raw in result.stdout.split(b'\0') if raw]
+        return [path for path in self.filter_paths(paths) if (self.root_path / path).is_file()]
+    
+    def filter_paths(self, paths: List[str]) -> List[str]:
+        """Apply the traversal rules (minus .gitignore) to already-enumerated paths."""
+        return filter_python_paths(paths, self.matcher, self.include_matcher)
     
-    def traverse(self) -> List[str]:
+    def traverse(self, discovery: str = 'auto', include_untracked: bool = False) -> List[str]:
         """
         Recursively traverse directory and collect Python files.
         
+        Args:
+            discovery: 'auto' reads the git index when root_path is a git
+                working tree, 'git' tries the index for any path inside a
+                repository, 'walk' always walks the filesystem. Both git modes
+                fall back to walking when the index cannot be read.
+            include_untracked: With git discovery, also list untracked files
+                that git does not ignore (see list_tracked_files)
+        
         Returns:
-            List of relative paths to Python files from root_path
+            Sorted list of relative paths to Python files from root_path
         """
-        python_files = []
-        
-        for root, dirs, files in os.walk(self.root_path):
-            # Convert to Path for easier manipulation
-            root_path = Path(root)
-            
-            # Filter out excluded directories IN-PLACE
-            # This prevents os.walk from descending into them
-            dirs[:] = [
-                d for d in dirs 
-                if not self._should_exclude_dir(d)
-            ]
-            
-            # Process files in current directory
-            for file_name in files:
-                file_path = root_path / file_name
-                
-                if self._is_valid_python_file(file_path):
-                    # Get relative path from root
-                    try:
-                        relative_path = file_path.relative_to(self.root_path)
-                        # Convert to string with forward slashes for consistency
-                        python_files.append(str(relative_path).replace('\\', '/'))
-                    except ValueError:
-                        # Skip if file is not relative to root_path
-                        continue
-        
-        # Sort for consistent ordering
-        python_files.sort()
+        if discovery not in {'auto', 'git', 'walk'}:
+            raise ValueError(f"Unknown discovery mode: {discovery}")
+        if discovery == 'git' or (discovery == 'auto' and self.is_git_repository()):
+            tracked = self.list_tracked_files(include_untracked=include_untracked)
+            if tracked is not None:
+                return tracked
+            logger.info(f"git index unavailable for {self.root_path}; walking the tree instead")
+        return list(self.iter_files(sort=True))
+
+
+def filter_python_paths(
+    paths: List[str],
+    matcher: IgnoreMatcher,
+    include_matcher: Optional[Pattern[str]] = None
+) -> List[str]:
+    """
+    Keep the Python files among repo-relative paths that pass the given rules.
+    
+    Every ancestor directory is checked, memoized across paths, so a pattern
+    that excludes a directory also excludes everything below it.
+    
+    Args:
+        paths: Forward-slash paths relative to the repository root
+        matcher, include_matcher: Output of FileTraverser.build_path_rules
         
-        return python_files
+    Returns:
+        Sorted list of kept paths
+    """
+    ignored_dirs: Dict[str, bool] = {'': False}
+    
+    def dir_ignored(rel_dir: str) -> bool:
+        cached = ignored_dirs.get(rel_dir)
+        if cached is None:
+            parent = rel_dir.rpartition('/')[0]
+            cached = dir_ignored(parent) or matcher.is_ignored(rel_dir, True)
+            ignored_dirs[rel_dir] = cached
+        return cached
+    
+    kept = []
+    for rel_path in paths:
+        rel_dir, _, file_name = rel_path.rpartition('/')
+        if os.path.splitext(file_name)[1] not in FileTraverser.INCLUDED_EXTENSIONS:
+            continue
+        if dir_ignored(rel_dir) or matcher.is_ignored(rel_path, False):
+            continue
+        if include_matcher is not None and not include_matcher.fullmatch(rel_path):
+            continue
+        kept.append(rel_path)
+    kept.sort()
+    return kept
 
 
-def get_python_files(repo_path: str) -> List[str]:
+def get_python_files(
+    repo_path: str,
+    use_gitignore: Optional[bool] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    discovery: str = 'auto',
+    include_untracked: bool = False
+) -> List[str]:
     """
     Convenience function to get all Python files in a repository.
     
     Args:
         repo_path: Path to the repository root
+        use_gitignore, include, exclude: See FileTraverser
+        discovery, include_untracked: See FileTraverser.traverse
         
     Returns:
         List of relative paths to Python files
@@ -154,8 +378,30 @@ def get_python_files(repo_path: str) -> List[str]:
         >>> print(files)
         ['app.py', 'service.py', 'utils/helper.py']
     """
-    traverser = FileTraverser(repo_path)
-    return traverser.traverse()
+    traverser = FileTraverser(repo_path, use_gitignore=use_gitignore, include=include, exclude=exclude)
+    return traverser.traverse(discovery=discovery, include_untracked=include_untracked)
+
+
+def iter_python_files(
+    repo_path: str,
+    sort: bool = False,
+    use_gitignore: Optional[bool] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None
+) -> Iterator[str]:
+    """
+    Stream Python files in a repository as the traversal discovers them.
+    
+    Args:
+        repo_path: Path to the repository root
+        sort: Yield in sorted order for deterministic results
+        use_gitignore, include, exclude: See FileTraverser
+        
+    Yields:
+        Relative paths to Python files
+    """
+    traverser = FileTraverser(repo_path, use_gitignore=use_gitignore, include=include, exclude=exclude)
+    return traverser.iter_files(sort=sort)
 
 
 # CLI interface for testing
@@ -0,0 +1,215 @@
+"""
+reachability.py - Transitive reachability and impact analysis for CODE_Sherpa.
+
+Strongly connected components are condensed into a DAG and every component
+gets two bitsets (Python ints): the components it can reach and the
+components that can reach it. "Does A reach B" is then a single bit test and
+impact sets are read straight off a bitset, without walking the graph per query.
+Bitsets take O(components^2) bits in the worst case, which is fine for
+repository-sized graphs.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.engine_ast.analyzer import rel_file_to_module, repo_function_names
+from app.engine_ast.callgraph import IndexedGraph
+
+
+def strongly_connected_components(graph: IndexedGraph) -> Tuple[List[int], List[List[int]]]:
+    """
+    Iterative Tarjan over the CSR adjacency.
+
+    Returns:
+        (component ID of every node, member nodes of every component).
+        Components come out in reverse topological order: every edge between
+        two components goes from a higher ID to a lower one.
+    """
+    node_count = graph.node_count
+    offsets, targets = graph.forward_offsets, graph.forward_targets
+    order = [-1] * node_count
+    low = [0] * node_count
+    on_stack = [False] * node_count
+    component = [-1] * node_count
+    components: List[List[int]] = []
+    stack: List[int] = []
+    counter = 0
+
+    for root in range(node_count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, offsets[root])]
+        while work:
+            node, edge = work[-1]
+            if edge < offsets[node + 1]:
+                work[-1] = (node, edge + 1)
+                nxt = targets[edge]
+                if order[nxt] == -1:
+                    order[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack[nxt] = True
+                    work.append((nxt, offsets[nxt]))
+                elif on_stack[nxt] and order[nxt] < low[node]:
+                    low[node] = order[nxt]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == order[node]:
+                members: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = len(components)
+                    members.append(member)
+                    if member == node:
+                        break
+                components.append(members)
+    return component, components
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Indexes of the set bits, lowest first."""
+    text = bin(bits)[:1:-1]
+    index = text.find("1")
+    while index != -1:
+        yield index
+        index = text.find("1", index + 1)
+
+
+class ReachabilityIndex:
+    """Precomputed transitive reachability over an IndexedGraph."""
+
+    def __init__(self, graph: IndexedGraph):
+        self.graph = graph
+        self.component, self.components = strongly_connected_components(graph)
+        component_count = len(self.components)
+
+        # Successor components always have lower IDs, so one ascending pass suffices.
+        self.descendants: List[int] = [0] * component_count
+        for comp in range(component_count):
+            bits = 1 << comp
+            for node in self.components[comp]:
+                for nxt in graph.successors(node):
+                    other = self.component[nxt]
+                    if other != comp:
+                        bits |= self.descendants[other]
+            self.descendants[comp] = bits
+
+        self.ancestors: List[int] = [0] * component_count
+        for comp in range(component_count - 1, -1, -1):
+            bits = 1 << comp
+            for node in self.components[comp]:
+                for prev in graph.predecessors(node):
+                    other = self.component[prev]
+                    if other != comp:
+                        bits |= self.ancestors[other]
+            self.ancestors[comp] = bits
+
+    @classmethod
+    def for_call_graph(cls, unified_model: Dict) -> "ReachabilityIndex":
+        """Function-level index; every repo function is a node, even without edges."""
+        edges = unified_model.get("metadata", {}).get("resolved_call_edges", [])
+        graph = IndexedGraph.from_name_pairs(
+            ((edge.get("from"), edge.get("to")) for edge in edges),
+            nodes=repo_function_names(unified_model.get("files", {}))
+        )
+        return cls(graph)
+
+    @classmethod
+    def for_file_graph(cls, unified_model: Dict) -> "ReachabilityIndex":
+        """File-level index over depends_on (importer -> imported file)."""
+        files = unified_model.get("files", {})
+        graph = IndexedGraph.from_name_pairs(
+            ((file_path, dep) for file_path, file_data in files.items()
+             for dep in file_data.get("depends_on", [])),
+            nodes=files
+        )
+        return cls(graph)
+
+    def component_of(self, name: str) -> Optional[int]:
+        node = self.graph.node_id(name)
+        return None if node is None else self.component[node]
+
+    def _names(self, component_bits: int, exclude: str) -> List[str]:
+        names = [
+            self.graph.names[node]
+            for comp in iter_bits(component_bits)
+            for node in self.components[comp]
+        ]
+        return sorted(name for name in names if name != exclude)
+
+    def reaches(self, source: str, target: str) -> bool:
+        """True if target is reachable from source (every node reaches itself)."""
+        if source == target:
+            return True
+        source_comp = self.component_of(source)
+        target_comp = self.component_of(target)
+        if source_comp is None or target_comp is None:
+            return False
+        return bool(self.descendants[source_comp] >> target_comp & 1)
+
+    def reachable_from(self, name: str) -> List[str]:
+        """Everything name transitively calls (or imports), excluding name itself."""
+        comp = self.component_of(name)
+        return [] if comp is None else self._names(self.descendants[comp], name)
+
+    def impact_set(self, name: str) -> List[str]:
+        """Everything that transitively calls (or imports) name, i.e. what a change to it can affect."""
+        comp = self.component_of(name)
+        return [] if comp is None else self._names(self.ancestors[comp], name)
+
+    def reachable_bits(self, names: List[str]) -> int:
+        """Union of the descendant bitsets of names, over component IDs."""
+        bits = 0
+        for name in names:
+            comp = self.component_of(name)
+            if comp is not None:
+                bits |= self.descendants[comp]
+        return bits
+
+
+def find_dead_code_candidates(
+    unified_model: Dict,
+    index: Optional[ReachabilityIndex] = None
+) -> List[str]:
+    """
+    Repo functions that are unreachable from the entry point.
+
+    Module-level code is not part of the call graph, so every function defined
+    in the entry point file (identify_entry_point) counts as a root. Calls the
+    analyzer cannot resolve (dynamic dispatch, callbacks, framework hooks) are
+    invisible here, hence "candidates".
+
+    Args:
+        index: Prebuilt ReachabilityIndex.for_call_graph of the same model
+
+    Returns:
+        Sorted qualified function names; empty when there is no entry point
+    """
+    entry_point = unified_model.get("entry_point")
+    if not entry_point or entry_point not in unified_model.get("files", {}):
+        return []
+    if index is None:
+        index = ReachabilityIndex.for_call_graph(unified_model)
+
+    entry_module = rel_file_to_module(entry_point)
+    roots = [
+        f"{entry_module}.{function_name}"
+        for function_name in unified_model["files"][entry_point].get("functions", {})
+    ]
+    reachable = index.reachable_bits(roots)
+    functions = repo_function_names(unified_model.get("files", {}))
+    dead: List[str] = []
+    for name in sorted(functions):
+        comp = index.component_of(name)
+        if comp is None or not reachable >> comp & 1:
+            dead.append(name)
+    return dead
@@ -0,0 +1,237 @@
+"""
+serialization.py - On-disk formats for the CODE_Sherpa unified model.
+
+Two formats are supported:
+    - "json": the pretty-printed analysis.json, kept as the export format
+    - "binary": a stream of length-prefixed frames after an 8-byte magic header
+
+Binary frame layout: 1-byte kind, 4-byte little-endian payload length, payload.
+The header frame holds the top-level keys and the metadata; every file is its
+own frame, so writing and reading only ever hold one file's payload in memory
+on top of the model itself. resolved_call_edges and called_by are stored
+columnar: one symbol table frame plus little-endian int32 arrays of symbol IDs,
+instead of a JSON object per edge. read_model detects the format from the
+first bytes, so every reader accepts both.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from app.engine_ast.compact import SYMBOL_TYPECODE, SymbolTable, is_name_list
+
+MAGIC = b"SHERPA\x00\x01"
+FORMATS = ("json", "binary")
+
+FRAME_END = 0
+FRAME_HEADER = 1
+FRAME_FILE = 2
+FRAME_SYMBOLS = 3
+FRAME_EDGES = 4
+FRAME_CALLED_BY = 5
+
+_FRAME = struct.Struct("<BI")
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(payload: bytes) -> Any:
+    return json.loads(payload.decode("utf-8"))
+
+
+def _pack_ids(*columns: List[int]) -> bytes:
+    """Concatenate int columns as little-endian int32."""
+    ids = array(SYMBOL_TYPECODE)
+    for column in columns:
+        ids.extend(column)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def _unpack_ids(payload: bytes) -> array:
+    ids = array(SYMBOL_TYPECODE)
+    ids.frombytes(payload)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
+
+def _write_frame(stream: BinaryIO, kind: int, payload: bytes) -> None:
+    stream.write(_FRAME.pack(kind, len(payload)))
+    stream.write(payload)
+
+
+def _is_edge_list(edges: Any) -> bool:
+    return isinstance(edges, list) and all(
+        isinstance(edge, dict) and list(edge) == ["from", "to"]
+        and isinstance(edge["from"], str) and isinstance(edge["to"], str)
+        for edge in edges
+    )
+
+
+def _is_called_by(called_by: Any) -> bool:
+    return isinstance(called_by, dict) and all(is_name_list(callers) for callers in called_by.values())
+
+
+def write_binary(unified_model: Dict, stream: BinaryIO) -> None:
+    """Write the model to a binary stream (see the module docstring for the layout)."""
+    metadata = unified_model.get("metadata")
+    columnar: Dict[str, Any] = {}
+    if isinstance(metadata, dict):
+        if _is_edge_list(metadata.get("resolved_call_edges")):
+            columnar["resolved_call_edges"] = metadata["resolved_call_edges"]
+        if _is_called_by(metadata.get("called_by")):
+            columnar["called_by"] = metadata["called_by"]
+        # Columnar keys keep their position in the header with a null placeholder.
+        metadata = {key: (None if key in columnar else value) for key, value in metadata.items()}
+    files = unified_model.get("files")
+    stream_files = isinstance(files, dict)
+
+    header = {
+        "layout": list(unified_model),
+        "values": {
+            key: (metadata if key == "metadata" else value)
+            for key, value in unified_model.items()
+            if not (key == "files" and stream_files)
+        },
+        "columnar": list(columnar),
+    }
+    stream.write(MAGIC)
+    _write_frame(stream, FRAME_HEADER, _dumps(header))
+
+    if columnar:
+        symbols = SymbolTable()
+        edges = columnar.get("resolved_call_edges")
+        edge_ids = None
+        if edges is not None:
+            edge_ids = (
+                [symbols.intern(edge["from"]) for edge in edges],
+                [symbols.intern(edge["to"]) for edge in edges],
+            )
+        called_by = columnar.get("called_by")
+        called_by_ids = None
+        if called_by is not None:
+            callees = [symbols.intern(callee) for callee in called_by]
+            counts = [len(callers) for callers in called_by.values()]
+            callers = [symbols.intern(caller) for group in called_by.values() for caller in group]
+            called_by_ids = (callees, counts, callers)
+        _write_frame(stream, FRAME_SYMBOLS, _dumps(symbols.names))
+        if edge_ids is not None:
+            _write_frame(stream, FRAME_EDGES, _pack_ids(*edge_ids))
+        if called_by_ids is not None:
+            _write_frame(stream, FRAME_CALLED_BY, _pack_ids([len(called_by_ids[0])], *called_by_ids))
+
+    if stream_files:
+        for file_path, file_data in files.items():
+            _write_frame(stream, FRAME_FILE, _dumps([file_path, file_data]))
+    _write_frame(stream, FRAME_END, b"")
+
+
+def iter_frames(stream: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """Yield (kind, payload) for every frame after the magic header, up to the end frame."""
+    while True:
+        head = stream.read(_FRAME.size)
+        if len(head) < _FRAME.size:
+            raise ValueError("Truncated analysis file: missing end frame")
+        kind, length = _FRAME.unpack(head)
+        if kind == FRAME_END:
+            return
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated analysis file: short frame")
+        yield kind, payload
+
+
+def read_binary(stream: BinaryIO) -> Dict:
+    """Read a model written by write_binary; the stream must be positioned after MAGIC."""
+    header: Optional[Dict] = None
+    names: List[str] = []
+    columnar: Dict[str, Any] = {}
+    files: Dict[str, Any] = {}
+    for kind, payload in iter_frames(stream):
+        if kind == FRAME_HEADER:
+            header = _loads(payload)
+        elif kind == FRAME_SYMBOLS:
+            names = _loads(payload)
+        elif kind == FRAME_EDGES:
+            ids = _unpack_ids(payload)
+            half = len(ids) // 2
+            columnar["resolved_call_edges"] = [
+                {"from": names[src], "to": names[dst]}
+                for src, dst in zip(ids[:half], ids[half:])
+            ]
+        elif kind == FRAME_CALLED_BY:
+            ids = _unpack_ids(payload)
+            count = ids[0]
+            callees = ids[1:1 + count]
+            counts = ids[1 + count:1 + 2 * count]
+            position = 1 + 2 * count
+            called_by: Dict[str, List[str]] = {}
+            for callee, size in zip(callees, counts):
+                called_by[names[callee]] = [names[caller] for caller in ids[position:position + size]]
+                position += size
+            columnar["called_by"] = called_by
+        elif kind == FRAME_FILE:
+            file_path, file_data = _loads(payload)
+            files[file_path] = file_data
+        else:
+            raise ValueError(f"Unknown frame kind {kind} in analysis file")
+    if header is None:
+        raise ValueError("Analysis file has no header frame")
+
+    values = header["values"]
+    model: Dict[str, Any] = {}
+    for key in header["layout"]:
+        if key == "files" and key not in values:
+            model[key] = files
+        elif key == "metadata" and header["columnar"]:
+            model[key] = {
+                meta_key: columnar.get(meta_key, value) if meta_key in header["columnar"] else value
+                for meta_key, value in values[key].items()
+            }
+        else:
+            model[key] = values[key]
+    return model
+
+
+def detect_format(path: str) -> str:
+    with open(path, "rb") as f:
+        return "binary" if f.read(len(MAGIC)) == MAGIC else "json"
+
+
+def write_model(unified_model: Dict, path: str, format: str = "binary") -> None:
+    """
+    Write the unified model to path.
+
+    Args:
+        unified_model: Output of build_unified_model
+        path: Destination file
+        format: "binary" (compact, streamed) or "json" (pretty-printed export)
+    """
+    if format == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(unified_model, f, indent=2)
+    elif format == "binary":
+        with open(path, "wb") as f:
+            write_binary(unified_model, f)
+    else:
+        raise ValueError(f"Unknown analysis format: {format} (expected one of {FORMATS})")
+
+
+def read_model(path: str) -> Dict:
+    """
+    Read a unified model written in either format.
+
+    Returns:
+        The model dict, identical to the one passed to write_model
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return read_binary(f)
+        f.seek(0)
+        return json.load(f)
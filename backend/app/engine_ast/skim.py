@@ -0,0 +1,172 @@
+"""
+skim.py - Function body hollowing for skim analysis.
+
+Skim analysis only needs what ast.parse reports about module and class level
+statements, yet parsing is where nearly all of its time goes, and most of
+every file is function bodies. hollow_function_bodies blanks those bodies out
+before the source is parsed: each body becomes a single "..." followed by
+empty lines, so every line number stays valid, and the true end line of each
+hollowed function is returned alongside.
+
+Bodies are found with regexes rather than a tokenizer: string literals and
+comments are first masked out in one re.sub (keeping the line structure), then
+for every def the body ends at the next line indented no deeper than the def
+that is outside any bracket and not a backslash continuation. Python-level
+work is per def, not per token.
+
+The scan is conservative: if the hollowed text does not parse, parse_outline
+falls back to the original. A syntax error inside a function body goes
+unnoticed in skim mode.
+"""
+
+import ast
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Comments and string literals. Prefixes are left alone: they never change where a
+# literal ends (a backslash-quote does not close even a raw string), and starting
+# every alternative with [#"'] lets the regex engine skip ahead quickly. The
+# alternatives cannot fail once started, so the nested repeats never backtrack.
+_LITERAL = re.compile(r"""
+    \#[^\n]*
+  | \"\"\"(?:[^"\\]+|\\.|"(?!""))*(?:\"\"\"|$)
+  | '''(?:[^'\\]+|\\.|'(?!''))*(?:'''|$)
+  | "(?:[^"\\\n]+|\\.)*"?
+  | '(?:[^'\\\n]+|\\.)*'?
+""", re.VERBOSE | re.DOTALL)
+
+_DEF_LINE = re.compile(r"^([ \t]*)(?:async[ \t]+)?def[ \t]", re.MULTILINE)
+
+
+def mask_literal(match: "re.Match") -> str:
+    """Comments vanish; a string becomes "0", its inner line breaks backslash continuations."""
+    text = match.group()
+    if text[0] == "#":
+        return ""
+    newlines = text.count("\n")
+    return "0\\\n" * newlines + "0"
+
+
+def mask_literals(source: str) -> str:
+    """Source with the same lines, where brackets, quotes and '#' only appear as code."""
+    return _LITERAL.sub(mask_literal, source)
+
+
+def bracket_depth(code: str, start: int, end: int) -> int:
+    return (
+        code.count("(", start, end) + code.count("[", start, end) + code.count("{", start, end)
+        - code.count(")", start, end) - code.count("]", start, end) - code.count("}", start, end)
+    )
+
+
+def ends_with_continuation(code: str, newline: int) -> bool:
+    before = newline - 1
+    if before >= 0 and code[before] == "\r":
+        before -= 1
+    return before >= 0 and code[before] == "\\"
+
+
+def logical_line_end(code: str, start: int) -> int:
+    """Offset of the newline ending the logical line that begins at start (len(code) at EOF)."""
+    newline = code.find("\n", start)
+    while newline != -1:
+        if bracket_depth(code, start, newline) <= 0 and not ends_with_continuation(code, newline):
+            return newline
+        newline = code.find("\n", newline + 1)
+    return len(code)
+
+
+def hollow_function_bodies(source: str) -> Optional[Tuple[str, Dict[int, int]]]:
+    """
+    Replace every function body that spans its own lines with "...".
+
+    Returns:
+        (hollowed source, {def line: last line of the original body}), or None
+        when the source cannot be scanned
+    """
+    code = mask_literals(source)
+    if code.count("\n") != source.count("\n"):
+        return None
+    lines = source.split("\n")
+    end_lines: Dict[int, int] = {}
+    # Line numbers are counted incrementally; offsets only ever move forward.
+    counted_offset, counted_line = 0, 1
+
+    def line_at(offset: int) -> int:
+        nonlocal counted_offset, counted_line
+        counted_line += code.count("\n", counted_offset, offset)
+        counted_offset = offset
+        return counted_line
+
+    pos = 0
+    while True:
+        definition = _DEF_LINE.search(code, pos)
+        if definition is None:
+            break
+        start = definition.start()
+        header_end = logical_line_end(code, start)
+        # The body ends at the first later line, indented at most like the def, that starts a logical line.
+        dedent = re.compile(r"\n(?=[ \t]{0,%d}[^ \t\r\n])" % len(definition.group(1)))
+        body_end = len(code)
+        candidate = dedent.search(code, header_end)
+        while candidate is not None:
+            newline = candidate.start()
+            if bracket_depth(code, start, newline) <= 0 and not ends_with_continuation(code, newline):
+                body_end = newline
+                break
+            candidate = dedent.search(code, newline + 1)
+        body = code[header_end:body_end]
+        stripped = body.lstrip()
+        if not stripped:
+            # One-line def (body after the colon): nothing to hollow.
+            pos = header_end
+            continue
+
+        def_line = line_at(start)
+        first = line_at(body_end - len(stripped))
+        last = line_at(header_end + len(body.rstrip()))
+        end_lines[def_line] = last
+        body_text = lines[first - 1]
+        lines[first - 1] = body_text[:len(body_text) - len(body_text.lstrip(" \t"))] + "..."
+        for blank in range(first, last):
+            lines[blank] = ""
+        pos = body_end
+    return "\n".join(lines), end_lines
+
+
+def restore_end_lines(statements: List[ast.stmt], end_lines: Dict[int, int]) -> int:
+    """Put back the end lines hollowing shortened (functions and everything enclosing one)."""
+    latest = 0
+    for node in statements:
+        end = node.end_lineno or node.lineno
+        if type(node) is ast.FunctionDef or type(node) is ast.AsyncFunctionDef:
+            end = max(end, end_lines.get(node.lineno, 0))
+        for field in ("body", "orelse", "finalbody", "handlers"):
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                end = max(end, restore_end_lines(children, end_lines))
+        for case in getattr(node, "cases", ()):
+            end = max(end, restore_end_lines(case.body, end_lines))
+        node.end_lineno = end
+        latest = max(latest, end)
+    return latest
+
+
+def parse_outline(source: str, filename: str) -> ast.Module:
+    """
+    ast.parse with function bodies reduced to "...".
+
+    Everything outside function bodies, and every node's line span, matches
+    ast.parse(source); falls back to it when the source cannot be hollowed.
+    """
+    hollowed = hollow_function_bodies(source)
+    if hollowed is not None:
+        text, end_lines = hollowed
+        try:
+            tree = ast.parse(text, filename=filename)
+        except (SyntaxError, ValueError):
+            pass
+        else:
+            restore_end_lines(tree.body, end_lines)
+            return tree
+    return ast.parse(source, filename=filename)
@@ -1,41 +1,64 @@
+import io
 import json
 import os
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+
+from app.engine_ast.serialization import read_model
+from app.engine_rag.delta import CONTENT_HASH_KEY, content_hash
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SmartChunker:
-    def __init__(self, analysis_file_path: str, repo_base_path: str):
+    def __init__(
+        self,
+        analysis_file_path: Optional[str] = None,
+        repo_base_path: Optional[str] = None,
+        sources: Optional[Dict[str, str]] = None,
+        model: Optional[Dict[str, Any]] = None
+    ):
+        """
+        model is the unified model itself; when given, analysis_file_path is
+        not read. sources maps relative file paths to their text (the store
+        the analyzer already read, or blobs from git objects); when given,
+        nothing is read from repo_base_path.
+        """
         self.analysis_file_path = analysis_file_path
         self.repo_base_path = repo_base_path
-        
+        self.sources = sources
+
+        if model is not None:
+            self.ast_data = model
+            return
         try:
-            with open(self.analysis_file_path, "r", encoding="utf-8") as f:
-                self.ast_data = json.load(f)
+            self.ast_data = read_model(self.analysis_file_path)
         except FileNotFoundError:
             logger.error(f"Analysis file not found at {self.analysis_file_path}")
             self.ast_data = {"files": {}}
 
     def extract_chunks(self) -> List[Dict[str, Any]]:
+        """All chunks of iter_chunks as one list."""
+        chunks = list(self.iter_chunks())
+        logger.info(f"Successfully extracted {len(chunks)} structural chunks.")
+        return chunks
+
+    def iter_chunks(self) -> Iterator[Dict[str, Any]]:
         """
         Slices files into intact function chunks based on AST coordinates
         and injects deterministic dependency metadata.
         For files without functions/classes (like main.py), saves the complete file content.
+
+        Chunks are yielded file by file, so only one file's lines are held at
+        a time and a consumer (e.g. the uploader) can start on the first ones.
         """
-        chunks = []
         files_data = self.ast_data.get("files", {})
+        called_by_index = self.ast_data.get("metadata", {}).get("called_by", {})
 
         for file_path, file_info in files_data.items():
-            full_path = os.path.join(self.repo_base_path, file_path)
-            
-            if not os.path.exists(full_path):
-                logger.warning(f"Source file missing: {full_path}. Skipping.")
+            lines = self._read_lines(file_path)
+            if lines is None:
                 continue
-                
-            with open(full_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
 
             module_path = file_path.replace("\\", "/").replace(".py", "").replace("/", ".")
 
@@ -69,10 +92,10 @@ class SmartChunker:
                 )
 
             file_node_id = f"{module_path}__file__"
-            chunks.append({
-                "id": file_node_id,
-                "text": file_summary,
-                "metadata": {
+            yield self._chunk(
+                file_node_id,
+                file_summary,
+                {
                     "file_path": file_path,
                     "node_id": module_path,
                     "function_name": "", 
@@ -80,9 +103,10 @@ class SmartChunker:
                     "type": "file",
                     "start_line": 1,
                     "end_line": len(lines),
-                    "resolved_calls": "[]"
+                    "resolved_calls": "[]",
+                    "called_by": "[]"
                 }
-            })
+            )
 
             # Process Functions
             for func_name, func_details in file_info.get("functions", {}).items():
@@ -113,14 +137,31 @@ class SmartChunker:
                     "type": "function",
                     "start_line": start_line + 1,
                     "end_line": end_line,
-                    "resolved_calls": json.dumps(resolved_calls) # Stringify list for DB
+                    "resolved_calls": json.dumps(resolved_calls), # Stringify list for DB
+                    "called_by": json.dumps(called_by_index.get(node_id, []))
                 }
 
-                chunks.append({
-                    "id": node_id,
-                    "text": enriched_text,
-                    "metadata": metadata
-                })
+                yield self._chunk(node_id, enriched_text, metadata)
 
-        logger.info(f"Successfully extracted {len(chunks)} structural chunks.")
-        return chunks
\ No newline at end of file
+    @staticmethod
+    def _chunk(chunk_id: str, text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        # Stable across ingests while the text is unchanged (see engine_rag.delta).
+        metadata[CONTENT_HASH_KEY] = content_hash(text)
+        return {"id": chunk_id, "text": text, "metadata": metadata}
+
+    def _read_lines(self, file_path: str) -> Optional[List[str]]:
+        if self.sources is not None:
+            source = self.sources.get(file_path)
+            if not isinstance(source, str):
+                # Missing, or an UnreadableSource the analyzer already reported.
+                logger.warning(f"Source missing for {file_path}. Skipping.")
+                return None
+            # StringIO splits on "\n" only, exactly like readlines() on the checked-out file.
+            return io.StringIO(source).readlines()
+
+        full_path = os.path.join(self.repo_base_path, file_path)
+        if not os.path.exists(full_path):
+            logger.warning(f"Source file missing: {full_path}. Skipping.")
+            return None
+        with open(full_path, "r", encoding="utf-8") as f:
+            return f.readlines()
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+delta.py - Incremental vector store sync by chunk content hash.
+
+Chunk IDs (module.function) are stable across ingests of the same
+repository, and SmartChunker stamps every chunk with metadata["content_hash"],
+a digest of the embedded text. ChunkDelta compares a chunk stream with the
+id -> metadata already stored in the collection:
+
+- new ids and changed text pass through to the uploader (and get embedded)
+- same text with different metadata (lines shifted by an edit above, a new
+  caller) only needs a metadata update, which costs no embedding
+- identical chunks are skipped
+- stored ids that never show up belong to deleted code
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+CONTENT_HASH_KEY = "content_hash"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ChunkDelta:
+    """Splits a chunk stream by what differs from the stored collection."""
+
+    def __init__(self, existing: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            existing: Stored chunk id -> metadata (records written without a
+                content_hash always count as changed)
+        """
+        self.existing = existing
+        self.seen: Set[str] = set()
+        self.metadata_updates: List[Dict[str, Any]] = []
+        self.changed = 0
+        self.unchanged = 0
+
+    def filter(self, chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield chunks whose text must be (re-)embedded; consumes chunks lazily.
+
+        Chunks with unchanged text but new metadata are collected in
+        metadata_updates instead.
+        """
+        for chunk in chunks:
+            chunk_id = chunk["id"]
+            self.seen.add(chunk_id)
+            stored = self.existing.get(chunk_id)
+            metadata = chunk["metadata"]
+            if stored is None or stored.get(CONTENT_HASH_KEY) != metadata.get(CONTENT_HASH_KEY):
+                self.changed += 1
+                yield chunk
+            elif stored != metadata:
+                self.metadata_updates.append({"id": chunk_id, "metadata": metadata})
+            else:
+                self.unchanged += 1
+
+    def stale_ids(self) -> List[str]:
+        """Stored ids absent from the stream; valid once filter has been fully consumed."""
+        return sorted(chunk_id for chunk_id in self.existing if chunk_id not in self.seen)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "changed": self.changed,
+            "metadata_only": len(self.metadata_updates),
+            "unchanged": self.unchanged,
+            "stale": len(self.stale_ids()),
+        }
@@ -7,6 +7,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 MAX_FILE_FUNCTIONS = 10  # Max function chunks to fetch for a file query
+MAX_UPSTREAM_NODES = 10  # Max caller chunks to fetch as upstream context
 
 
 class GraphRetriever:
@@ -93,7 +94,8 @@ class GraphRetriever:
                 nodes.append({
                     "node_id": results["ids"][i],
                     "code": results["documents"][i],
-                    "calls": json.loads(results["metadatas"][i].get("resolved_calls", "[]"))
+                    "calls": json.loads(results["metadatas"][i].get("resolved_calls", "[]")),
+                    "called_by": json.loads(results["metadatas"][i].get("called_by", "[]"))
                 })
             logger.info(f"Fetched {len(nodes)} function chunks for file '{file_path}'")
             return nodes
@@ -149,6 +151,7 @@ class GraphRetriever:
         1. File query  -> file chunk + all its function chunks
         2. Symbol query -> exact function/class chunk + downstream deps
         3. Semantic fallback -> top-n chunks + downstream deps
+        Callers of every primary node are returned as upstream context.
         """
         logger.info(f"Hybrid Graph-RAG query: '{query}'")
 
@@ -174,7 +177,8 @@ class GraphRetriever:
                     primary_nodes.append({
                         "node_id": file_results["ids"][i],
                         "code": file_results["documents"][i],
-                        "calls": resolved_calls
+                        "calls": resolved_calls,
+                        "called_by": json.loads(metadata.get("called_by", "[]"))
                     })
                     for call_id in resolved_calls:
                         downstream_ids_to_fetch.add(call_id)
@@ -203,7 +207,10 @@ class GraphRetriever:
                         primary_nodes.append({
                             "node_id": exact_results["ids"][i],
                             "code": exact_results["documents"][i],
-                            "calls": resolved_calls
+                            "calls": resolved_calls,
+                            "called_by": json.loads(
+                                exact_results["metadatas"][i].get("called_by", "[]")
+                            )
                         })
                         for call_id in resolved_calls:
                             downstream_ids_to_fetch.add(call_id)
@@ -217,7 +224,7 @@ class GraphRetriever:
             )
 
             if not search_results or not search_results["ids"][0]:
-                return {"primary_nodes": [], "downstream_context": []}
+                return {"primary_nodes": [], "downstream_context": [], "upstream_context": []}
 
             for i in range(len(search_results["ids"][0])):
                 resolved_calls = json.loads(
@@ -226,7 +233,10 @@ class GraphRetriever:
                 primary_nodes.append({
                     "node_id": search_results["ids"][0][i],
                     "code": search_results["documents"][0][i],
-                    "calls": resolved_calls
+                    "calls": resolved_calls,
+                    "called_by": json.loads(
+                        search_results["metadatas"][0][i].get("called_by", "[]")
+                    )
                 })
                 for call_id in resolved_calls:
                     downstream_ids_to_fetch.add(call_id)
@@ -245,7 +255,37 @@ class GraphRetriever:
             except Exception as e:
                 logger.warning(f"Downstream fetch failed: {e}")
 
+        # --- Step 5: Reverse call index for upstream callers ---
+        upstream_context = self._fetch_upstream_context(primary_nodes)
+
         return {
             "primary_nodes": primary_nodes,
-            "downstream_context": downstream_context
-        }
\ No newline at end of file
+            "downstream_context": downstream_context,
+            "upstream_context": upstream_context
+        }
+
+    def _fetch_upstream_context(self, primary_nodes: List[Dict]) -> List[Dict]:
+        """Fetches chunks of the functions that call the primary nodes (from called_by metadata)."""
+        primary_ids = {node["node_id"] for node in primary_nodes}
+        upstream_ids: List[str] = []
+        for node in primary_nodes:
+            for caller_id in node.get("called_by", []):
+                if caller_id not in primary_ids and caller_id not in upstream_ids:
+                    upstream_ids.append(caller_id)
+        upstream_ids = upstream_ids[:MAX_UPSTREAM_NODES]
+        if not upstream_ids:
+            return []
+
+        logger.info(f"Fetching {len(upstream_ids)} upstream callers")
+        upstream_context = []
+        try:
+            caller_results = self.collection.get(ids=upstream_ids)
+            for i in range(len(caller_results["ids"])):
+                upstream_context.append({
+                    "node_id": caller_results["ids"][i],
+                    "code": caller_results["documents"][i],
+                    "calls": json.loads(caller_results["metadatas"][i].get("resolved_calls", "[]"))
+                })
+        except Exception as e:
+            logger.warning(f"Upstream fetch failed: {e}")
+        return upstream_context
\ No newline at end of file
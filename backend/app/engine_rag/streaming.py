@@ -0,0 +1,72 @@
+"""
+streaming.py - Bounded producer/consumer helpers for the ingest pipeline.
+
+Chunking is CPU work and uploading is network I/O, so they overlap well on
+two threads. prefetch runs a producer iterator (e.g. SmartChunker.iter_chunks)
+on a background thread and hands its items over through a bounded queue:
+the producer blocks once max_pending items are waiting, so memory stays flat
+no matter how large the repository is.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Items may wait between chunker and uploader: two upload batches' worth.
+DEFAULT_MAX_PENDING = 600
+
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(items: Iterable[T], max_pending: int = DEFAULT_MAX_PENDING) -> Iterator[T]:
+    """
+    Iterate items produced on a background thread, at most max_pending ahead.
+
+    Exceptions raised by the producer are re-raised in the consumer. Closing
+    the returned generator early (or an error in the consumer) stops the
+    producer at its next item.
+    """
+    pending: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as exc:
+            put(_Failure(exc))
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name="prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
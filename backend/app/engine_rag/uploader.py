@@ -0,0 +1,192 @@
+"""
+uploader.py - Concurrent, retrying batch upload of chunks to a vector store.
+
+BatchUploader takes a chunk stream and an upsert callable (one batch of
+chunks per call) and keeps up to max_in_flight batches in flight on a thread
+pool, so round trips overlap instead of queueing behind each other.
+
+- Batches close at max_records or when their payload (text, id and metadata
+  bytes) would pass the byte budget. The budget halves after a failed
+  attempt and grows back after successes, so oversized requests back off;
+  the failed batch itself is split to the new budget before it is retried.
+- Upserts are keyed by chunk id and therefore idempotent: a failed batch is
+  simply sent again, after exponential backoff with jitter. Only a batch that
+  fails max_attempts times aborts the upload (UploadError).
+- upload returns throughput metrics (chunks, batches, bytes, retries,
+  seconds, chunks/s, MB/s).
+
+Nothing here depends on chromadb; tests drive it with an in-process fake.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Set, Tuple
+
+Chunk = Dict[str, Any]
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_RECORDS = 300
+DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024
+# The adaptive budget never drops below this; a single larger chunk still goes alone.
+MIN_BATCH_BYTES = 64 * 1024
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class UploadError(RuntimeError):
+    """A batch still failed after every retry."""
+
+
+def chunk_payload_bytes(chunk: Chunk) -> int:
+    """Approximate request bytes of one chunk: text (if any), id and JSON metadata."""
+    return (
+        len(chunk.get("text", "").encode("utf-8"))
+        + len(chunk["id"].encode("utf-8"))
+        + len(json.dumps(chunk["metadata"]))
+    )
+
+
+class BatchUploader:
+    """Uploads chunk batches concurrently, retrying failed batches with backoff."""
+
+    def __init__(
+        self,
+        upsert: Callable[[List[Chunk]], None],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            upsert: Sends one batch; must be idempotent (keyed by chunk id) and thread-safe
+            max_in_flight: Batches uploading at the same time
+            max_records: Records per batch (the store's per-request limit)
+            max_batch_bytes: Upper bound of the adaptive per-batch payload budget
+            max_attempts: Tries per batch before the upload fails
+            backoff_seconds: Delay before the first retry; doubles per attempt
+            sleep: Injected for tests
+        """
+        self.upsert = upsert
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_records = max(1, max_records)
+        self.max_batch_bytes = max(MIN_BATCH_BYTES, max_batch_bytes)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.sleep = sleep
+        self.batch_bytes = self.max_batch_bytes
+        self._lock = threading.Lock()
+        self._chunks = 0
+        self._batches = 0
+        self._bytes = 0
+        self._retries = 0
+
+    @classmethod
+    def from_env(cls, upsert: Callable[[List[Chunk]], None], **kwargs: Any) -> "BatchUploader":
+        """Uploader with SHERPA_UPLOAD_CONCURRENCY / SHERPA_UPLOAD_ATTEMPTS applied."""
+        kwargs.setdefault(
+            "max_in_flight", int(os.getenv("SHERPA_UPLOAD_CONCURRENCY", str(DEFAULT_MAX_IN_FLIGHT)))
+        )
+        kwargs.setdefault("max_attempts", int(os.getenv("SHERPA_UPLOAD_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS))))
+        return cls(upsert, **kwargs)
+
+    def iter_batches(self, chunks: Iterable[Chunk]) -> Iterator[List[Chunk]]:
+        """Group chunks by max_records and the current byte budget."""
+        batch: List[Chunk] = []
+        batch_size = 0
+        for chunk in chunks:
+            size = chunk_payload_bytes(chunk)
+            if batch and (len(batch) >= self.max_records or batch_size + size > self.batch_bytes):
+                yield batch
+                batch, batch_size = [], 0
+            batch.append(chunk)
+            batch_size += size
+        if batch:
+            yield batch
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt (1-based): exponential, capped, with jitter."""
+        delay = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def send(self, batch: List[Chunk]) -> None:
+        """
+        Upsert one batch, retrying until it succeeds or max_attempts is reached.
+
+        A failed batch is re-split to the shrunken byte budget, so a request the
+        store rejects as too large is retried as smaller ones. Pieces inherit
+        the attempt count of the batch they came from.
+        """
+        pending: Deque[Tuple[List[Chunk], int]] = deque([(batch, 1)])
+        while pending:
+            batch, attempt = pending.popleft()
+            try:
+                self.upsert(batch)
+            except Exception as exc:
+                if attempt == self.max_attempts:
+                    raise UploadError(
+                        f"Batch of {len(batch)} chunks failed after {attempt} attempts: {exc}"
+                    ) from exc
+                with self._lock:
+                    self._retries += 1
+                    self.batch_bytes = max(MIN_BATCH_BYTES, self.batch_bytes // 2)
+                self.sleep(self.backoff(attempt))
+                pending.extendleft((piece, attempt + 1) for piece in reversed(list(self.iter_batches(batch))))
+            else:
+                with self._lock:
+                    self._chunks += len(batch)
+                    self._batches += 1
+                    self._bytes += sum(chunk_payload_bytes(chunk) for chunk in batch)
+                    self.batch_bytes = min(self.max_batch_bytes, self.batch_bytes + self.batch_bytes // 4)
+
+    def upload(self, chunks: Iterable[Chunk]) -> Dict[str, Any]:
+        """
+        Upload every chunk, at most max_in_flight batches at a time.
+
+        chunks is consumed lazily, so a streamed source keeps memory bounded.
+
+        Returns:
+            Throughput metrics of this call
+
+        Raises:
+            UploadError: a batch failed max_attempts times (remaining batches are not sent)
+        """
+        with self._lock:
+            self._chunks = self._batches = self._bytes = self._retries = 0
+        start = time.perf_counter()
+        in_flight: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="upload") as pool:
+            try:
+                for batch in self.iter_batches(chunks):
+                    if len(in_flight) >= self.max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    in_flight.add(pool.submit(self.send, batch))
+                for future in wait(in_flight).done:
+                    future.result()
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return self.metrics(time.perf_counter() - start)
+
+    def metrics(self, seconds: float) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "chunks": self._chunks,
+                "batches": self._batches,
+                "bytes": self._bytes,
+                "retries": self._retries,
+                "seconds": round(seconds, 4),
+                "chunks_per_second": round(self._chunks / seconds, 1) if seconds > 0 else None,
+                "mb_per_second": round(self._bytes / (1024 * 1024) / seconds, 3) if seconds > 0 else None,
+            }
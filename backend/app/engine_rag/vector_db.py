@@ -1,71 +1,144 @@
+"""
+vector_db.py - Vector store backends for CODE_Sherpa chunks.
+
+VectorStore holds the backend-independent part: a Chroma collection plus
+batched, delta-synced ingestion. Backends only decide how to connect:
+    - "cloud": ChromaCloudDB, Chroma Cloud (CHROMA_API_KEY / CHROMA_TENANT / CHROMA_DATABASE)
+    - "local": LocalChromaDB, an embedded chromadb.PersistentClient on local disk,
+      for air-gapped hosts and retrieval without a WAN round trip
+
+get_vector_store picks the backend from SHERPA_VECTOR_BACKEND (default "cloud").
+"""
+
 import os
 import logging
-from typing import List, Dict, Any
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Optional
 import chromadb
 
+from app.engine_rag.delta import ChunkDelta
+from app.engine_rag.uploader import BatchUploader
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ChromaCloudDB:
+# Chroma Cloud has a limit of 300 records per API call (used for every backend)
+CHROMA_BATCH_LIMIT = 300
+
+
+# Where LocalChromaDB keeps its data unless SHERPA_CHROMA_PATH says otherwise.
+DEFAULT_LOCAL_PATH = "./chroma_data"
+
+
+class VectorStore(ABC):
+    """A Chroma collection with batched ingestion; subclasses provide connect()."""
+
+    # Concurrent upload batches; None reads SHERPA_UPLOAD_CONCURRENCY.
+    max_in_flight: Optional[int] = None
+
     def __init__(self, collection_name: str = "codesherpa_ast"):
         self.collection_name = collection_name
-        
-        # Pull credentials from environment variables (.env)
-        chroma_api_key = os.getenv("CHROMA_API_KEY")
-        chroma_tenant = os.getenv("CHROMA_TENANT")
-        chroma_database = os.getenv("CHROMA_DATABASE")
+        self.client = self.connect()
 
-        if not chroma_api_key or not chroma_tenant or not chroma_database:
-            raise ValueError("Missing Chroma credentials: CHROMA_API_KEY, CHROMA_TENANT, and CHROMA_DATABASE must all be set as environment variables.")
-        else:
-            # Connect to Chroma Cloud using the official CloudClient
-            logger.info(f"Connecting to Chroma Cloud Database: {chroma_database}...")
-            self.client = chromadb.CloudClient(
-                api_key=chroma_api_key,
-                tenant=chroma_tenant,
-                database=chroma_database
-            )
-            
         # Get or create the collection
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
             metadata={"hnsw:space": "cosine"} # Cosine similarity is best for code search
         )
 
-    def ingest_chunks(self, chunks: List[Dict[str, Any]]):
-        """Ingests AST chunks into Chroma Cloud using native String IDs."""
-        if not chunks:
-            logger.warning("No chunks provided for ingestion.")
-            return
-
-        documents = []
-        metadatas = []
-        ids = []
-
-        for chunk in chunks:
-            documents.append(chunk["text"])
-            metadatas.append(chunk["metadata"])
-            ids.append(chunk["id"]) # Natively supports your AST string IDs
-
-        logger.info(f"Uploading {len(chunks)} nodes to Chroma Cloud in batches...")
-        
-        # Chroma Cloud has a limit of 300 records per API call
-        batch_size = 300
-        total_batches = (len(documents) + batch_size - 1) // batch_size
-        
-        for i in range(0, len(documents), batch_size):
-            batch_docs = documents[i:i + batch_size]
-            batch_metas = metadatas[i:i + batch_size]
-            batch_ids = ids[i:i + batch_size]
-            
-            self.collection.upsert(
-                documents=batch_docs,
-                metadatas=batch_metas,
-                ids=batch_ids
+    @abstractmethod
+    def connect(self):
+        """Return the chromadb client this store talks to."""
+
+    def upsert_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Upsert one batch of chunks; idempotent, since records are keyed by chunk id."""
+        self.collection.upsert(
+            documents=[chunk["text"] for chunk in batch],
+            metadatas=[chunk["metadata"] for chunk in batch],
+            ids=[chunk["id"] for chunk in batch]  # Natively supports your AST string IDs
+        )
+
+    def update_metadata_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Replace the metadata of existing records; documents (and embeddings) are untouched."""
+        self.collection.update(
+            ids=[item["id"] for item in batch],
+            metadatas=[item["metadata"] for item in batch]
+        )
+
+    def stored_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Every record's id -> metadata, read in pages without documents or embeddings."""
+        stored: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=CHROMA_BATCH_LIMIT, offset=offset)
+            ids = page.get("ids") or []
+            for record_id, metadata in zip(ids, page.get("metadatas") or []):
+                stored[record_id] = metadata or {}
+            if len(ids) < CHROMA_BATCH_LIMIT:
+                return stored
+            offset += len(ids)
+
+    def delete_ids(self, ids: List[str]) -> int:
+        for start in range(0, len(ids), CHROMA_BATCH_LIMIT):
+            self.collection.delete(ids=ids[start:start + CHROMA_BATCH_LIMIT])
+        return len(ids)
+
+    def uploader(self, upsert) -> BatchUploader:
+        options: Dict[str, Any] = {"max_records": CHROMA_BATCH_LIMIT}
+        if self.max_in_flight is not None:
+            options["max_in_flight"] = self.max_in_flight
+        return BatchUploader.from_env(upsert, **options)
+
+    def ingest_chunks(
+        self,
+        chunks: Iterable[Dict[str, Any]],
+        uploader: Optional[BatchUploader] = None,
+        sync: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Ingests AST chunks into the collection using native String IDs.
+
+        chunks may be any iterable, e.g. a SmartChunker.iter_chunks stream
+        behind streaming.prefetch; it is consumed batch by batch. Batches are
+        uploaded concurrently (up to max_in_flight) and retried on failure by
+        a BatchUploader (SHERPA_UPLOAD_CONCURRENCY / SHERPA_UPLOAD_ATTEMPTS by default).
+
+        With sync (the default), the collection is diffed by content_hash
+        first (see engine_rag.delta): unchanged chunks are skipped, chunks
+        whose text is unchanged only get their metadata updated, and records
+        whose id no longer appears are deleted once everything else is stored.
+
+        Returns:
+            Upload metrics (chunks, batches, bytes, retries, throughput) plus,
+            with sync, the delta counts
+        """
+        if uploader is None:
+            uploader = self.uploader(self.upsert_batch)
+        delta = ChunkDelta(self.stored_metadata()) if sync else None
+        if delta is not None:
+            logger.info(f"Diffing against {len(delta.existing)} stored nodes...")
+            chunks = delta.filter(chunks)
+
+        logger.info(f"Uploading nodes to {type(self).__name__} in batches...")
+        stats = uploader.upload(chunks)
+
+        if delta is not None:
+            if delta.metadata_updates:
+                self.uploader(self.update_metadata_batch).upload(delta.metadata_updates)
+            stats.update(delta.stats())
+            stats["deleted"] = self.delete_ids(delta.stale_ids())
+            logger.info(
+                f"Delta sync: {stats['changed']} embedded, {stats['metadata_only']} metadata-only, "
+                f"{stats['unchanged']} unchanged, {stats['deleted']} deleted."
             )
-            logger.info(f"Uploaded batch {i//batch_size + 1} of {total_batches}")
-            
-        logger.info("Chroma Cloud ingestion completed successfully.")
+        elif not stats["chunks"]:
+            logger.warning("No chunks provided for ingestion.")
+            return stats
+        logger.info(
+            f"Ingestion of {stats['chunks']} nodes in {stats['batches']} batches completed "
+            f"({stats['retries']} retries, {stats['chunks_per_second']} nodes/s)."
+        )
+        return stats
 
     def clear_collection(self):
         try:
@@ -78,4 +151,61 @@ class ChromaCloudDB:
             name=self.collection_name,
             metadata={"hnsw:space": "cosine"}
         )
-        logger.info(f"Recreated collection '{self.collection_name}'")
\ No newline at end of file
+        logger.info(f"Recreated collection '{self.collection_name}'")
+
+
+class ChromaCloudDB(VectorStore):
+    def connect(self):
+        # Pull credentials from environment variables (.env)
+        chroma_api_key = os.getenv("CHROMA_API_KEY")
+        chroma_tenant = os.getenv("CHROMA_TENANT")
+        chroma_database = os.getenv("CHROMA_DATABASE")
+
+        if not chroma_api_key or not chroma_tenant or not chroma_database:
+            raise ValueError("Missing Chroma credentials: CHROMA_API_KEY, CHROMA_TENANT, and CHROMA_DATABASE must all be set as environment variables.")
+        else:
+            # Connect to Chroma Cloud using the official CloudClient
+            logger.info(f"Connecting to Chroma Cloud Database: {chroma_database}...")
+            return chromadb.CloudClient(
+                api_key=chroma_api_key,
+                tenant=chroma_tenant,
+                database=chroma_database
+            )
+
+
+class LocalChromaDB(VectorStore):
+    # An embedded store has no round trips to overlap, and writes go to one local database.
+    max_in_flight = 1
+
+    def __init__(self, collection_name: str = "codesherpa_ast", path: Optional[str] = None):
+        """
+        Args:
+            collection_name: Collection to read and write
+            path: Data directory (default: SHERPA_CHROMA_PATH, else ./chroma_data)
+        """
+        self.path = path or os.getenv("SHERPA_CHROMA_PATH") or DEFAULT_LOCAL_PATH
+        super().__init__(collection_name)
+
+    def connect(self):
+        logger.info(f"Opening local Chroma database at {self.path}...")
+        return chromadb.PersistentClient(path=self.path)
+
+
+VECTOR_BACKENDS = {
+    "cloud": ChromaCloudDB,
+    "local": LocalChromaDB,
+}
+
+
+def get_vector_store(collection_name: str = "codesherpa_ast", backend: Optional[str] = None) -> VectorStore:
+    """
+    Open collection_name on the configured backend.
+
+    Args:
+        collection_name: Collection to read and write
+        backend: "cloud" or "local"; defaults to SHERPA_VECTOR_BACKEND, else "cloud"
+    """
+    backend = (backend or os.getenv("SHERPA_VECTOR_BACKEND") or "cloud").strip().lower()
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(f"Unknown vector backend: {backend} (expected one of {sorted(VECTOR_BACKENDS)})")
+    return VECTOR_BACKENDS[backend](collection_name)
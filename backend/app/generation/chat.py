@@ -32,10 +32,18 @@ def format_graph_chunks(retrieval_data: Dict[str, Any]) -> str:
         block = (
             f"PRIMARY NODE [{node.get('node_id')}]\n"
             f"Explicitly calls: {node.get('calls')}\n"
+            f"Called by: {node.get('called_by', [])}\n"
             f"Code:\n{node.get('code')}\n"
         )
         context_block.append(block)
 
+    for caller in retrieval_data.get("upstream_context", []):
+        block = (
+            f"UPSTREAM CALLER [{caller.get('node_id')}]\n"
+            f"Code:\n{caller.get('code')}\n"
+        )
+        context_block.append(block)
+
     for dep in retrieval_data.get("downstream_context", []):
         block = (
             f"DEPENDENCY CONTEXT [{dep.get('node_id')}]\n"
@@ -59,8 +67,9 @@ def get_node_group(nid: str) -> str:
 def generate_mermaid_graph(retrieval_data: Dict[str, Any]) -> str:
     primary_nodes = retrieval_data.get("primary_nodes", [])
     downstream_context = retrieval_data.get("downstream_context", [])
+    upstream_context = retrieval_data.get("upstream_context", [])
     
-    if not primary_nodes and not downstream_context:
+    if not primary_nodes and not downstream_context and not upstream_context:
         return ""
         
     lines = ["graph TD"]
@@ -84,7 +93,7 @@ def generate_mermaid_graph(retrieval_data: Dict[str, Any]) -> str:
             seen_nodes.add(nid)
             all_retrieved.append((nid, True))
             
-    for dep in downstream_context:
+    for dep in downstream_context + upstream_context:
         nid = dep.get("node_id")
         if nid and nid not in seen_nodes:
             seen_nodes.add(nid)
@@ -109,7 +118,7 @@ def generate_mermaid_graph(retrieval_data: Dict[str, Any]) -> str:
     # Build edges between retrieved nodes
     retrieved_safe_ids = {node_id(nid) for nid, _ in all_retrieved}
     
-    for node in primary_nodes:
+    for node in primary_nodes + upstream_context:
         src = node.get("node_id")
         calls = node.get("calls", [])
         if not src or not calls:
@@ -126,7 +135,11 @@ def generate_mermaid_graph(retrieval_data: Dict[str, Any]) -> str:
 
 def extract_graph_sources(answer: str, retrieval_data: Dict[str, Any]) -> List[Dict[str, str]]:
     sources = []
-    all_nodes = retrieval_data.get("primary_nodes", []) + retrieval_data.get("downstream_context", [])
+    all_nodes = (
+        retrieval_data.get("primary_nodes", [])
+        + retrieval_data.get("downstream_context", [])
+        + retrieval_data.get("upstream_context", [])
+    )
 
     for node in all_nodes:
         node_id = node.get("node_id")
@@ -0,0 +1,140 @@
+"""
+instrumentation.py - Lightweight pipeline profiling for CODE_Sherpa.
+
+A Profiler records, per named stage, wall time, CPU time (this process plus
+any worker processes that finished during the stage) and the process peak
+RSS. It also keeps the N slowest files reported by the analyzer. Stages may
+nest; each record carries its depth. Everything is plain time/resource calls,
+cheap enough to leave on for every ingest.
+"""
+
+import heapq
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# (relative path, total seconds, seconds spent in ast.parse)
+FileTiming = Tuple[str, float, float]
+
+
+def _rss_mb(who: int) -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water mark of this process's resident memory, in MB (None where unsupported)."""
+    return _rss_mb(resource.RUSAGE_SELF) if resource else None
+
+
+def worker_peak_rss_mb() -> Optional[float]:
+    """Largest peak RSS among finished child processes (e.g. analysis workers), in MB."""
+    return _rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+
+
+def cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class Profiler:
+    """Collects stage timings and the slowest analyzed files for one pipeline run."""
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.stages: List[Dict[str, Any]] = []
+        self._depth = 0
+        # Min-heap of (seconds, parse seconds, path) holding the top_n slowest files.
+        self._slowest: List[Tuple[float, float, str]] = []
+        self.file_count = 0
+        self.file_seconds = 0.0
+        self.parse_seconds = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; the yielded record can take extra keys (counts etc.)."""
+        record: Dict[str, Any] = {"stage": name, "depth": self._depth}
+        self.stages.append(record)
+        peak_before = peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = cpu_seconds()
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record["wall_s"] = round(time.perf_counter() - wall_start, 4)
+            record["cpu_s"] = round(cpu_seconds() - cpu_start, 4)
+            peak_after = peak_rss_mb()
+            record["peak_rss_mb"] = peak_after
+            if peak_before is not None:
+                record["peak_rss_growth_mb"] = round(peak_after - peak_before, 1)
+
+    def record_files(self, timings: Iterable[FileTiming]) -> None:
+        for file_path, seconds, parse_seconds in timings:
+            self.file_count += 1
+            self.file_seconds += seconds
+            self.parse_seconds += parse_seconds
+            entry = (seconds, parse_seconds, file_path)
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest_files(self) -> List[Dict[str, Any]]:
+        return [
+            {"file": file_path, "seconds": round(seconds, 4), "parse_seconds": round(parse_seconds, 4)}
+            for seconds, parse_seconds, file_path in sorted(self._slowest, reverse=True)
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        """JSON-serializable summary of everything recorded so far."""
+        return {
+            "stages": [dict(record) for record in self.stages],
+            "files": {
+                "analyzed": self.file_count,
+                "seconds": round(self.file_seconds, 4),
+                "parse_seconds": round(self.parse_seconds, 4),
+            },
+            "slowest_files": self.slowest_files(),
+            "peak_rss_mb": peak_rss_mb(),
+            "worker_peak_rss_mb": worker_peak_rss_mb(),
+        }
+
+    def format_report(self) -> str:
+        """Human-readable table of the report for the CLI."""
+        lines = [f"{'stage':<28}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}"]
+        for record in self.stages:
+            name = "  " * record["depth"] + record["stage"]
+            peak = record.get("peak_rss_mb")
+            lines.append(
+                f"{name:<28}{record.get('wall_s', 0):>10.3f}{record.get('cpu_s', 0):>10.3f}"
+                f"{peak if peak is not None else '-':>10}"
+            )
+        lines.append(
+            f"{self.file_count} files analyzed in {self.file_seconds:.3f}s "
+            f"({self.parse_seconds:.3f}s in ast.parse)"
+        )
+        slowest = self.slowest_files()
+        if slowest:
+            lines.append(f"Slowest {len(slowest)} files:")
+            lines.extend(
+                f"  {item['seconds']:>8.4f}s  (parse {item['parse_seconds']:.4f}s)  {item['file']}"
+                for item in slowest
+            )
+        return "\n".join(lines)
+
+
+def stage(profiler: Optional[Profiler], name: str) -> ContextManager:
+    """profiler.stage(name), or a no-op context when profiling is off."""
+    return profiler.stage(name) if profiler is not None else nullcontext({})
@@ -2,7 +2,7 @@
 CLI orchestrator for CODE_Sherpa pipeline.
 
 Pipeline definition (execution order):
-    1. analyze   → Static analysis (always runs)
+    1. analyze   → Static analysis (always runs), analysis.json or analysis.bin
     2. flowchart → Flowchart generation
 
 Control flow:
@@ -11,39 +11,98 @@ Control flow:
 """
 import sys
 import os
-import json
 import argparse
+import json
+from typing import List, Optional
 
 # Add project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from app.engine_ast.analyzer import build_unified_model
+from app.engine_ast.analyzer import build_unified_model, model_is_skim, upgrade_unified_model
+from app.engine_ast.cache import AnalysisCache
 from app.engine_ast.flowchart.flow_builder import build_simple_file_graph
 from app.engine_ast.flowchart.exporter import export_mermaid
+from app.engine_ast.isolation import DEFAULT_CPU_SECONDS, DEFAULT_MEMORY_MB, FileLimits
+from app.engine_ast.serialization import FORMATS, read_model, write_model
+from app.instrumentation import Profiler, stage
 
 
 # ============================================================
 # Pipeline Step Implementations
 # ============================================================
 
-def run_analyze(repo_path: str, output_file: str) -> None:
-    """Pipeline step 1: Static analysis."""
+def run_analyze(
+    repo_path: str,
+    output_file: str,
+    workers: Optional[int] = 1,
+    cache_path: Optional[str] = None,
+    previous_file: Optional[str] = None,
+    changed_files: Optional[List[str]] = None,
+    output_format: str = "json",
+    skim: bool = False,
+    profiler: Optional[Profiler] = None,
+    limits: Optional[FileLimits] = None
+) -> None:
+    """
+    Pipeline step 1: Static analysis (incremental when a previous model is given).
+
+    skim=True skips call resolution; a previous skim model given without
+    changed files is upgraded to the full model. limits analyzes each file in
+    an isolated worker under those CPU / memory caps.
+    """
     print("Running static analysis...")
-    analysis_result = build_unified_model(repo_path)
+    previous_model = None
+    upgrade = False
+    if previous_file and changed_files is not None:
+        previous_model = read_model(previous_file)
+        print(f"Incremental update for {len(changed_files)} changed file(s)")
+    elif previous_file and not skim:
+        previous_model = read_model(previous_file)
+        upgrade = model_is_skim(previous_model)
+        if upgrade:
+            print("Upgrading skim analysis to full call analysis")
+    cache = AnalysisCache(cache_path) if cache_path else None
+    try:
+        if upgrade:
+            analysis_result = upgrade_unified_model(
+                repo_path, previous_model, workers=workers, cache=cache, profiler=profiler, limits=limits
+            )
+        else:
+            analysis_result = build_unified_model(
+                repo_path,
+                workers=workers,
+                cache=cache,
+                previous_model=previous_model,
+                changed_files=changed_files,
+                skim=skim,
+                profiler=profiler,
+                limits=limits
+            )
+    finally:
+        if cache:
+            stats = cache.stats()
+            cache.close()
+            print(f"Analysis cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evicted")
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(analysis_result, f, indent=2)
+    limited = [item for item in analysis_result["metadata"]["parse_errors"] if item.get("reason")]
+    if limited:
+        print(f"Skipped {len(limited)} file(s) over the per-file limits:")
+        for item in limited:
+            print(f"  {item['file']}: {item['reason']}")
+
+    with stage(profiler, "serialize"):
+        write_model(analysis_result, output_file, format=output_format)
     
     print("Analysis completed")
 
 
-def run_flowchart(input_file: str, output_file: str) -> None:
+def run_flowchart(input_file: str, output_file: str, profiler: Optional[Profiler] = None) -> None:
     """Pipeline step 2: Flowchart generation."""
     print("Generating flowchart...")
-    with open(input_file, "r", encoding="utf-8") as f:
-        analyzer_data = json.load(f)
-    graph = build_simple_file_graph(analyzer_data)
-    export_mermaid(graph, output_file)
+    with stage(profiler, "flowchart"):
+        analyzer_data = read_model(input_file)
+        graph = build_simple_file_graph(analyzer_data)
+        export_mermaid(graph, output_file)
     print("Flowchart exported")
 
 
@@ -51,23 +110,53 @@ def run_flowchart(input_file: str, output_file: str) -> None:
 # Pipeline Orchestration
 # ============================================================
 
-def run_pipeline(repo_path: str, output_dir: str) -> None:
+def run_pipeline(
+    repo_path: str,
+    output_dir: str,
+    workers: Optional[int] = 1,
+    cache_path: Optional[str] = None,
+    previous_file: Optional[str] = None,
+    changed_files: Optional[List[str]] = None,
+    output_format: str = "json",
+    skim: bool = False,
+    profile: bool = False,
+    limits: Optional[FileLimits] = None
+) -> None:
     """
     Execute the CODE_Sherpa pipeline.
     
     Flow:
-        1. Analyze -> analysis.json
-        2. Flowchart -> flowchart.md (uses analysis.json)
+        1. Analyze -> analysis.json (or analysis.bin with output_format="binary")
+        2. Flowchart -> flowchart.md (uses the analysis file)
+        3. With profile=True: profile.json (stage timings, slowest files)
     """
+    profiler = Profiler() if profile else None
     # Define output files
-    analysis_file = os.path.join(output_dir, "analysis.json")
+    analysis_name = "analysis.bin" if output_format == "binary" else "analysis.json"
+    analysis_file = os.path.join(output_dir, analysis_name)
     flowchart_file = os.path.join(output_dir, "flowchart.md")
     
     # Step 1: Analyze
-    run_analyze(repo_path, analysis_file)
+    run_analyze(
+        repo_path,
+        analysis_file,
+        workers=workers,
+        cache_path=cache_path,
+        previous_file=previous_file,
+        changed_files=changed_files,
+        output_format=output_format,
+        skim=skim,
+        profiler=profiler,
+        limits=limits
+    )
     
     # Step 2: Flowchart
-    run_flowchart(analysis_file, flowchart_file)
+    run_flowchart(analysis_file, flowchart_file, profiler=profiler)
+
+    if profiler is not None:
+        with open(os.path.join(output_dir, "profile.json"), "w", encoding="utf-8") as f:
+            json.dump(profiler.report(), f, indent=2)
+        print("\n" + profiler.format_report())
     
     print("\nPipeline completed successfully")
 
@@ -87,6 +176,59 @@ def main():
         default="demo",
         help="Output directory for generated artifacts (default: demo)"
     )
+    analyze_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Analysis worker processes; 0 uses every CPU (default: 1)"
+    )
+    analyze_parser.add_argument(
+        "--cache",
+        default=None,
+        help="SQLite file for the per-file analysis cache (default: no cache)"
+    )
+    analyze_parser.add_argument(
+        "--previous",
+        default=None,
+        help="Previous analysis file (JSON or binary) to update incrementally with --changed, "
+             "or a skim analysis to upgrade to full call analysis"
+    )
+    analyze_parser.add_argument(
+        "--changed",
+        nargs="*",
+        default=None,
+        help="Repository-relative paths of files changed since --previous"
+    )
+    analyze_parser.add_argument(
+        "--skim",
+        action="store_true",
+        help="Imports and definitions only, no call resolution (fast first look at huge repos)"
+    )
+    analyze_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage wall/CPU/memory and the slowest files; also writes profile.json"
+    )
+    analyze_parser.add_argument(
+        "--file-cpu-seconds",
+        type=int,
+        default=None,
+        help="Analyze each file in an isolated worker with this CPU time limit; 0 disables the cap "
+             f"(default: no isolation, or {DEFAULT_CPU_SECONDS} when --file-memory-mb is given)"
+    )
+    analyze_parser.add_argument(
+        "--file-memory-mb",
+        type=int,
+        default=None,
+        help="Analyze each file in an isolated worker with this memory limit; 0 disables the cap "
+             f"(default: no isolation, or {DEFAULT_MEMORY_MB} when --file-cpu-seconds is given)"
+    )
+    analyze_parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="json",
+        help="Analysis output format: pretty-printed JSON export or compact binary (default: json)"
+    )
 
     args = parser.parse_args()
     if args.command != "analyze":
@@ -100,10 +242,27 @@ def main():
 
     output_dir = args.output_dir
     os.makedirs(output_dir, exist_ok=True)
+
+    limits = None
+    if args.file_cpu_seconds is not None or args.file_memory_mb is not None:
+        cpu_seconds = DEFAULT_CPU_SECONDS if args.file_cpu_seconds is None else args.file_cpu_seconds
+        memory_mb = DEFAULT_MEMORY_MB if args.file_memory_mb is None else args.file_memory_mb
+        limits = FileLimits(cpu_seconds=cpu_seconds or None, memory_mb=memory_mb or None)
     
     # Execute pipeline
     try:
-        run_pipeline(repo_path, output_dir)
+        run_pipeline(
+            repo_path,
+            output_dir,
+            workers=args.workers or None,
+            cache_path=args.cache,
+            previous_file=args.previous,
+            changed_files=args.changed,
+            output_format=args.format,
+            skim=args.skim,
+            profile=args.profile,
+            limits=limits
+        )
     except Exception as e:
         print(f"\nPipeline failed: {e}")
         import traceback
@@ -11,7 +11,7 @@ load_dotenv()
 # Import your separated routers
 from app.api.sherpachat import router as chat_router
 from app.api.gitclone import router as clone_router
-from app.engine_rag.vector_db import ChromaCloudDB
+from app.engine_rag.vector_db import get_vector_store
 from app.engine_rag.retriever import GraphRetriever
 
 retriever: GraphRetriever = None
@@ -40,14 +40,14 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     global retriever
     try:
-        db = ChromaCloudDB(collection_name="codesherpa_real_repo")
+        db = get_vector_store(collection_name="codesherpa_real_repo")
         
         # Clear any stale data from previous session (crash recovery)
         db.clear_collection()
         logger.info("Cleared stale collection on startup.")
         
         retriever = GraphRetriever(db)
-        logger.info("Connected to Chroma Cloud successfully.")
+        logger.info(f"Connected to vector store ({type(db).__name__}) successfully.")
     except Exception as e:
         logger.error(f"Failed to initialize on startup: {e}")
         retriever = None
@@ -57,7 +57,7 @@ async def lifespan(app: FastAPI):
     # Clean shutdown
     logger.info("Server shutting down. Clearing collections...")
     try:
-        db = ChromaCloudDB(collection_name="codesherpa_real_repo")
+        db = get_vector_store(collection_name="codesherpa_real_repo")
         db.clear_collection()
     except Exception as e:
         logger.error(f"Error clearing collection on shutdown: {e}")
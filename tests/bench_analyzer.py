@@ -0,0 +1,367 @@
+"""
+bench_analyzer.py - Per-file benchmark for the fused single-pass analyzer.
+
+Compares analyze_tree against the previous two-pass implementation (kept
+below verbatim as legacy_analyze_tree) on synthetic large modules and,
+optionally, on real files passed on the command line. Both run on the same
+parsed tree, so the numbers exclude ast.parse.
+
+Usage:
+    python tests/bench_analyzer.py [--classes N] [--methods N] [file.py ...]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import argparse
+import ast
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from app.engine_ast.analyzer import (
+    analyze_tree,
+    canonicalize_module,
+    rel_file_to_module,
+    resolve_relative_import,
+)
+
+
+# ---------------------------------------------------------------------------
+# Previous two-pass implementation (reference for timing and equivalence)
+# ---------------------------------------------------------------------------
+
+def legacy_get_attr_chain(node: ast.AST) -> Optional[List[str]]:
+    if isinstance(node, ast.Name):
+        return [node.id]
+    if isinstance(node, ast.Attribute):
+        parent = legacy_get_attr_chain(node.value)
+        if parent is None:
+            return None
+        return parent + [node.attr]
+    return None
+
+
+class LegacyFunctionBodyResolver(ast.NodeVisitor):
+    def __init__(
+        self,
+        current_module: str,
+        current_class: Optional[str],
+        top_level_functions: Set[str],
+        local_classes: Set[str],
+        import_modules: Dict[str, str],
+        import_symbols: Dict[str, str]
+    ) -> None:
+        self.current_module = current_module
+        self.current_class = current_class
+        self.top_level_functions = top_level_functions
+        self.local_classes = local_classes
+        self.import_modules = import_modules
+        self.import_symbols = import_symbols
+        self.local_var_types: Dict[str, str] = {}
+        self.raw_calls: Set[str] = set()
+        self.resolved_calls: Set[str] = set()
+
+    def qualify_local(self, name: str) -> str:
+        if self.current_class:
+            return f"{self.current_module}.{self.current_class}.{name}"
+        return f"{self.current_module}.{name}"
+
+    def resolve_name(self, name: str) -> Optional[str]:
+        if name in self.import_symbols:
+            return self.import_symbols[name]
+        if name in self.import_modules:
+            return self.import_modules[name]
+        if self.current_class and name in {"self", "cls"}:
+            return f"{self.current_module}.{self.current_class}"
+        if name in self.local_classes:
+            return f"{self.current_module}.{name}"
+        if name in self.top_level_functions:
+            return f"{self.current_module}.{name}"
+        return None
+
+    def resolve_attribute_chain(self, chain: List[str]) -> Optional[str]:
+        if not chain:
+            return None
+        base = chain[0]
+        tail = chain[1:]
+        if not tail:
+            return self.resolve_name(base)
+
+        if base in self.local_var_types:
+            var_type = self.local_var_types[base]
+            # Heuristic: adapter objects returned from get_adapter map to known Adapter classes.
+            if var_type.endswith(".get_adapter"):
+                adapter_symbols = sorted(
+                    value for value in self.import_symbols.values()
+                    if value.split(".")[-1].endswith("Adapter")
+                )
+                if adapter_symbols:
+                    return f"{adapter_symbols[0]}.{'.'.join(tail)}"
+            return f"{var_type}.{'.'.join(tail)}"
+        if base in self.import_modules:
+            return f"{self.import_modules[base]}.{'.'.join(tail)}"
+        if base in self.import_symbols:
+            return f"{self.import_symbols[base]}.{'.'.join(tail)}"
+        if self.current_class and base in {"self", "cls"}:
+            return f"{self.current_module}.{self.current_class}.{'.'.join(tail)}"
+        return None
+
+    def maybe_capture_instance_type(self, target: ast.AST, value: ast.AST) -> None:
+        if not isinstance(target, ast.Name):
+            return
+        if not isinstance(value, ast.Call):
+            return
+        class_target = self.resolve_call_target(value.func)
+        if class_target:
+            self.local_var_types[target.id] = class_target
+
+    def resolve_call_target(self, call_func: ast.AST) -> Optional[str]:
+        chain = legacy_get_attr_chain(call_func)
+        if chain is None:
+            return None
+        if len(chain) == 1:
+            return self.resolve_name(chain[0])
+        return self.resolve_attribute_chain(chain)
+
+    def visit_Assign(self, node: ast.Assign) -> Any:
+        for target in node.targets:
+            self.maybe_capture_instance_type(target, node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> Any:
+        if node.value is not None:
+            self.maybe_capture_instance_type(node.target, node.value)
+        self.generic_visit(node)
+
+    def visit_With(self, node: ast.With) -> Any:
+        for item in node.items:
+            if item.optional_vars is not None:
+                self.maybe_capture_instance_type(item.optional_vars, item.context_expr)
+        self.generic_visit(node)
+
+    def visit_AsyncWith(self, node: ast.AsyncWith) -> Any:
+        for item in node.items:
+            if item.optional_vars is not None:
+                self.maybe_capture_instance_type(item.optional_vars, item.context_expr)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> Any:
+        chain = legacy_get_attr_chain(node.func)
+        if chain:
+            self.raw_calls.add(chain[-1])
+        resolved = self.resolve_call_target(node.func)
+        if resolved:
+            self.resolved_calls.add(resolved)
+        self.generic_visit(node)
+
+
+def legacy_analyze_tree(tree: ast.AST, rel_path: str, module_alias_map: Dict[str, str]) -> Dict:
+    current_module = canonicalize_module(rel_file_to_module(rel_path), module_alias_map)
+    is_package_module = rel_path.endswith("__init__.py")
+
+    has_main_guard = False
+    imports: Set[str] = set()
+    import_modules: Dict[str, str] = {}
+    import_symbols: Dict[str, str] = {}
+
+    top_level_functions: Set[str] = set()
+    class_methods: Dict[str, Set[str]] = {}
+    local_classes: Set[str] = set()
+
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+                local_name = alias.asname or alias.name.split(".")[0]
+                import_modules[local_name] = canonicalize_module(alias.name, module_alias_map)
+        elif isinstance(node, ast.ImportFrom):
+            imported_names = [a.name for a in node.names]
+            resolved_modules = resolve_relative_import(
+                current_module=current_module,
+                is_package_module=is_package_module,
+                level=node.level,
+                module=node.module,
+                imported_names=imported_names
+            )
+            if node.module:
+                base_module = canonicalize_module(resolved_modules[0], module_alias_map) if resolved_modules else ""
+                if base_module:
+                    imports.add(base_module)
+                for alias in node.names:
+                    if alias.name == "*":
+                        continue
+                    local = alias.asname or alias.name
+                    import_symbols[local] = f"{base_module}.{alias.name}" if base_module else alias.name
+            else:
+                for alias, resolved_module in zip(node.names, resolved_modules):
+                    if alias.name == "*":
+                        continue
+                    local = alias.asname or alias.name
+                    canonical_module = canonicalize_module(resolved_module, module_alias_map)
+                    imports.add(canonical_module)
+                    import_symbols[local] = canonical_module
+        elif isinstance(node, ast.FunctionDef):
+            top_level_functions.add(node.name)
+        elif isinstance(node, ast.AsyncFunctionDef):
+            top_level_functions.add(node.name)
+        elif isinstance(node, ast.ClassDef):
+            local_classes.add(node.name)
+            methods: Set[str] = set()
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    methods.add(child.name)
+            class_methods[node.name] = methods
+        elif isinstance(node, ast.If):
+            test = node.test
+            if isinstance(test, ast.Compare):
+                if (
+                    len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)
+                    and len(test.comparators) == 1
+                ):
+                    left = test.left
+                    right = test.comparators[0]
+                    if (
+                        (isinstance(left, ast.Name) and left.id == "__name__" and isinstance(right, ast.Constant) and right.value == "__main__")
+                        or (isinstance(right, ast.Name) and right.id == "__name__" and isinstance(left, ast.Constant) and left.value == "__main__")
+                    ):
+                        has_main_guard = True
+
+    functions_out: Dict[str, Dict[str, Any]] = {}
+    classes_out: Dict[str, Dict[str, Any]] = {}
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            resolver = LegacyFunctionBodyResolver(
+                current_module=current_module,
+                current_class=None,
+                top_level_functions=top_level_functions,
+                local_classes=local_classes,
+                import_modules=import_modules,
+                import_symbols=import_symbols
+            )
+            for body_node in node.body:
+                resolver.visit(body_node)
+            functions_out[node.name] = {
+                "lineno": getattr(node, "lineno", -1),
+                "end_lineno": getattr(node, "end_lineno", -1),
+                "calls": sorted(resolver.raw_calls),
+                "resolved_calls": sorted(resolver.resolved_calls)
+            }
+        elif isinstance(node, ast.ClassDef):
+            classes_out[node.name] = {
+                "lineno": getattr(node, "lineno", -1),
+                "end_lineno": getattr(node, "end_lineno", -1)
+            }
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    resolver = LegacyFunctionBodyResolver(
+                        current_module=current_module,
+                        current_class=node.name,
+                        top_level_functions=top_level_functions,
+                        local_classes=local_classes,
+                        import_modules=import_modules,
+                        import_symbols=import_symbols
+                    )
+                    for body_node in child.body:
+                        resolver.visit(body_node)
+                    key = f"{node.name}.{child.name}"
+                    functions_out[key] = {
+                        "lineno": getattr(child, "lineno", -1),
+                        "end_lineno": getattr(child, "end_lineno", -1),
+                        "calls": sorted(resolver.raw_calls),
+                        "resolved_calls": sorted(resolver.resolved_calls)
+                    }
+
+    return {
+        "entry": has_main_guard,
+        "imports": sorted(imports),
+        "classes": classes_out,
+        "functions": functions_out,
+        "parse_error": None
+    }
+
+
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def synthetic_module(classes: int, methods: int) -> str:
+    lines = [
+        "import os",
+        "import json as js",
+        "from pkg.service import Service, get_adapter",
+        "from .helpers import format_name",
+        "",
+    ]
+    for c in range(classes):
+        lines.append(f"class Worker{c}:")
+        for m in range(methods):
+            lines.extend([
+                f"    def step{m}(self, payload):",
+                "        svc = Service()",
+                "        adapter = get_adapter(payload)",
+                "        with open(payload) as handle:",
+                "            data = js.loads(handle.read())",
+                f"        result = self.step{(m + 1) % methods}(format_name(data['k']))",
+                "        for item in data.get('items', []):",
+                "            svc.client.session.post(os.path.join('a', item), json=item)",
+                "            adapter.send(item, timeout=[x.strip() for x in item.split(',')])",
+                f"        return Worker{(c + 1) % classes}().step0(result) or helper_{c}(result)",
+            ])
+        lines.append("")
+        lines.append(f"def helper_{c}(value):")
+        lines.append(f"    return Worker{c}().step0(js.dumps(value))")
+        lines.append("")
+    lines.append('if __name__ == "__main__":')
+    lines.append("    helper_0(None)")
+    return "\n".join(lines) + "\n"
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(label: str, source: str, rel_path: str, repeat: int) -> None:
+    tree = ast.parse(source)
+    alias_map: Dict[str, str] = {}
+    legacy = legacy_analyze_tree(tree, rel_path, alias_map)
+    fused = analyze_tree(tree, rel_path, alias_map)
+    assert legacy == fused, f"fused analyzer diverged from legacy on {label}"
+
+    legacy_s = best_of(lambda: legacy_analyze_tree(tree, rel_path, alias_map), repeat)
+    fused_s = best_of(lambda: analyze_tree(tree, rel_path, alias_map), repeat)
+    print(
+        f"{label:<40} {source.count(chr(10)):>7} lines  "
+        f"legacy {legacy_s * 1000:8.2f} ms  fused {fused_s * 1000:8.2f} ms  "
+        f"speedup {legacy_s / fused_s:5.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the fused AST analyzer")
+    parser.add_argument("files", nargs="*", help="Extra Python files to benchmark")
+    parser.add_argument("--classes", type=int, default=40)
+    parser.add_argument("--methods", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for scale in (0.25, 0.5, 1.0):
+        classes = max(1, int(args.classes * scale))
+        source = synthetic_module(classes, args.methods)
+        bench(f"synthetic {classes}x{args.methods}", source, "pkg/generated.py", args.repeat)
+
+    for file_path in args.files:
+        with open(file_path, "r", encoding="utf-8") as f:
+            source = f.read()
+        bench(os.path.basename(file_path), source, file_path.replace(os.sep, "/"), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
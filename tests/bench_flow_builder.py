@@ -0,0 +1,118 @@
+"""
+bench_flow_builder.py - Benchmark for build_graph_from_analysis.
+
+Compares the name-indexed build_graph_from_analysis against the previous
+implementation (kept below verbatim as legacy_build_graph_from_analysis),
+which scanned every file for every raw call, on a synthetic unified model.
+
+Usage:
+    python tests/bench_flow_builder.py [--files N] [--functions N] [--calls N]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from app.engine_ast.flowchart.flow_builder import build_graph_from_analysis, node_group, node_id
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (reference for timing and equivalence)
+# ---------------------------------------------------------------------------
+
+def legacy_build_graph_from_analysis(analysis_data: Dict[str, Any]) -> Dict[str, List]:
+    edges = []
+    nodes = {}
+    files = analysis_data.get("files", {})
+
+    for file_path, file_data in files.items():
+        nodes[file_path] = {
+            "id": node_id(file_path),
+            "label": file_path,
+            "group": node_group(file_path)
+        }
+        depends_on = file_data.get("depends_on", [])
+        for dep_file in depends_on:
+            if dep_file not in files:
+                continue
+            edges.append({
+                "source": node_id(file_path),
+                "target": node_id(dep_file),
+                "type": "imports"
+            })
+
+        functions = file_data.get("functions", {})
+        for func_name, func_data in functions.items():
+            calls = func_data.get("calls", [])
+            for called_func in calls:
+                for other_file, other_data in files.items():
+                    if other_file != file_path:
+                        other_functions = other_data.get("functions", {})
+                        if called_func in other_functions:
+                            edges.append({
+                                "source": node_id(file_path),
+                                "target": node_id(other_file),
+                                "type": "calls"
+                            })
+                            break
+
+    return {
+        "nodes": sorted(nodes.values(), key=lambda n: n["label"]),
+        "edges": edges
+    }
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def synthetic_model(file_count: int, functions: int, calls: int, seed: int = 0) -> Dict[str, Any]:
+    """Files with random imports and calls; some names are defined in several files."""
+    rng = random.Random(seed)
+    paths = [f"pkg{i % 40}/mod{i}.py" for i in range(file_count)]
+    names = [f"func{i}" for i in range(file_count * functions // 2)]
+    files: Dict[str, Any] = {}
+    for path in paths:
+        files[path] = {
+            "depends_on": sorted(rng.sample(paths, 3)),
+            "functions": {
+                rng.choice(names): {
+                    "calls": [rng.choice(names + ["print", "len"]) for _ in range(calls)]
+                }
+                for _ in range(functions)
+            },
+        }
+    return {"entry_point": paths[0], "files": files}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark build_graph_from_analysis")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--functions", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=3)
+    args = parser.parse_args()
+
+    model = synthetic_model(args.files, args.functions, args.calls)
+
+    started = time.perf_counter()
+    indexed = build_graph_from_analysis(model)
+    indexed_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    legacy = legacy_build_graph_from_analysis(model)
+    legacy_s = time.perf_counter() - started
+
+    assert indexed == legacy, "indexed flow builder diverged from legacy"
+    print(
+        f"{args.files} files, {len(indexed['edges'])} edges  "
+        f"legacy {legacy_s:8.2f} s  indexed {indexed_s * 1000:8.2f} ms  "
+        f"speedup {legacy_s / indexed_s:7.0f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import ast
+import glob
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from app.engine_ast.analyzer import (
+    analyze_repo_files,
+    analyze_tree,
+    build_size_balanced_batches,
+    build_unified_model,
+    get_callers,
+    upgrade_unified_model,
+)
+from app.engine_ast.cache import AnalysisCache
+
+
+SAMPLE_REPO = {
+    "main.py": """
+        from service import Service
+        from utils.helpers import format_name
+
+
+        def run():
+            svc = Service()
+            svc.handle(format_name("x"))
+
+
+        if __name__ == "__main__":
+            run()
+    """,
+    "service.py": """
+        import json
+        from utils import helpers
+
+
+        class Service:
+            def handle(self, payload):
+                self.log(payload)
+                return json.dumps(helpers.format_name(payload))
+
+            def log(self, message):
+                print(message)
+    """,
+    "utils/__init__.py": "",
+    "utils/helpers.py": """
+        def format_name(name):
+            return name.strip().title()
+    """,
+    "broken.py": "def oops(:\n",
+}
+
+
+def write_repo(root: str, files=None) -> None:
+    for rel_path, source in (files or SAMPLE_REPO).items():
+        path = Path(root) / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source), encoding="utf-8")
+
+
+class ParallelAnalysisTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = self.temp_dir.name
+        write_repo(self.repo)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parallel_matches_serial(self):
+        serial = analyze_repo_files(self.repo, workers=1)
+        parallel = analyze_repo_files(self.repo, workers=2, min_parallel_files=0)
+        self.assertEqual(list(serial), list(parallel))
+        self.assertEqual(serial, parallel)
+
+    def test_size_balanced_batches_cover_every_file(self):
+        files = sorted(SAMPLE_REPO)
+        batches = build_size_balanced_batches(self.repo, files, 3)
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(sorted(f for batch in batches for f in batch), files)
+
+
+class FusedAnalyzerTests(unittest.TestCase):
+    def test_matches_two_pass_reference_on_backend_sources(self):
+        from bench_analyzer import legacy_analyze_tree
+
+        backend = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+        for file_path in sorted(glob.glob(os.path.join(backend, "app", "**", "*.py"), recursive=True)):
+            rel_path = os.path.relpath(file_path, backend).replace(os.sep, "/")
+            with open(file_path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+            with self.subTest(file=rel_path):
+                self.assertEqual(analyze_tree(tree, rel_path, {}), legacy_analyze_tree(tree, rel_path, {}))
+
+    def test_binding_only_applies_to_later_calls(self):
+        tree = ast.parse(textwrap.dedent("""
+            def run():
+                client.send()
+                client = Client()
+                client.send()
+
+            from net import Client
+        """))
+        result = analyze_tree(tree, "app.py", {})
+        self.assertEqual(result["functions"]["run"]["resolved_calls"], ["net.Client", "net.Client.send"])
+        self.assertEqual(result["functions"]["run"]["calls"], ["Client", "send"])
+
+
+class AnalysisCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.temp_dir.name, "repo")
+        write_repo(self.repo)
+        self.cache_path = os.path.join(self.temp_dir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_second_run_hits_cache_and_matches(self):
+        cache = AnalysisCache(self.cache_path)
+        first = analyze_repo_files(self.repo, cache=cache)
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(cache.stats()["misses"], len(SAMPLE_REPO))
+        cache.close()
+
+        Path(self.repo, "utils/helpers.py").write_text("def format_name(name):\n    return name\n", encoding="utf-8")
+        cache = AnalysisCache(self.cache_path)
+        second = analyze_repo_files(self.repo, cache=cache)
+        self.assertEqual(cache.stats()["hits"], len(SAMPLE_REPO) - 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        cache.close()
+
+        self.assertEqual(second, analyze_repo_files(self.repo))
+        self.assertEqual(first["service.py"], second["service.py"])
+
+    def test_lru_eviction_respects_max_bytes(self):
+        cache = AnalysisCache(self.cache_path, max_bytes=400)
+        for i in range(10):
+            cache.put(f"key{i}", {"payload": "x" * 50, "i": i})
+        cache.flush()
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 400)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertIsNone(cache.get("key1"))
+        self.assertIsNotNone(cache.get("key9"))
+        cache.close()
+
+
+class IncrementalModelTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = self.temp_dir.name
+        write_repo(self.repo)
+        self.previous = build_unified_model(self.repo)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_edit_matches_full_rebuild(self):
+        Path(self.repo, "service.py").write_text(
+            "from utils.helpers import format_name\n\n\ndef handle(x):\n    return format_name(x)\n",
+            encoding="utf-8"
+        )
+        updated = build_unified_model(self.repo, previous_model=self.previous, changed_files=["service.py"])
+        self.assertEqual(updated, build_unified_model(self.repo))
+
+    def test_added_and_removed_modules_refresh_dependents(self):
+        write_repo(self.repo, {
+            "utils/helpers/__init__.py": "def format_name(name):\n    return name\n",
+            "extra.py": "import service\n\n\ndef go():\n    service.Service().handle(1)\n",
+        })
+        os.remove(os.path.join(self.repo, "utils/helpers.py"))
+        os.remove(os.path.join(self.repo, "broken.py"))
+        updated = build_unified_model(self.repo, previous_model=self.previous, changed_files=[])
+        full = build_unified_model(self.repo)
+        self.assertEqual(updated, full)
+        self.assertIn("utils/helpers/__init__.py", full["files"]["main.py"]["depends_on"])
+
+
+class CallerIndexTests(unittest.TestCase):
+    def test_called_by_inverts_repo_edges(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            model = build_unified_model(repo)
+        self.assertEqual(model["metadata"]["called_by"], {
+            "service.Service.handle": ["main.run"],
+            "service.Service.log": ["service.Service.handle"],
+            "utils.helpers.format_name": ["main.run", "service.Service.handle"],
+        })
+        self.assertEqual(get_callers(model, "utils.helpers.format_name"), ["main.run", "service.Service.handle"])
+        self.assertEqual(get_callers(model, "json.dumps"), [])
+
+        del model["metadata"]["called_by"]
+        self.assertEqual(get_callers(model, "service.Service.log"), ["service.Service.handle"])
+
+
+class SkimModelTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = self.temp_dir.name
+        write_repo(self.repo)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_skim_keeps_structure_without_calls(self):
+        skim = build_unified_model(self.repo, skim=True)
+        full = build_unified_model(self.repo)
+        self.assertEqual(skim["metadata"]["analysis_mode"], "skim")
+        self.assertEqual(skim["metadata"]["resolved_call_edges"], [])
+        self.assertEqual(skim["entry_point"], full["entry_point"])
+        self.assertEqual(skim["metadata"]["dependency_structure"], full["metadata"]["dependency_structure"])
+        for file_path, file_data in full["files"].items():
+            skim_data = skim["files"][file_path]
+            for key in ("entry", "imports", "classes", "depends_on"):
+                self.assertEqual(skim_data[key], file_data[key])
+            self.assertEqual(skim_data["functions"], {
+                name: {"lineno": data["lineno"], "end_lineno": data["end_lineno"]}
+                for name, data in file_data["functions"].items()
+            })
+
+    def test_upgrade_matches_full_build(self):
+        skim = build_unified_model(self.repo, skim=True)
+        self.assertEqual(upgrade_unified_model(self.repo, skim), build_unified_model(self.repo))
+
+        # A full incremental update of a skim model is a full rebuild, never a mix.
+        Path(self.repo, "extra.py").write_text("def go():\n    return 1\n", encoding="utf-8")
+        updated = build_unified_model(self.repo, previous_model=skim, changed_files=["extra.py"])
+        self.assertEqual(updated, build_unified_model(self.repo))
+        self.assertEqual(upgrade_unified_model(self.repo, skim), updated)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import random
+import unittest
+from unittest import mock
+from app.engine_ast.analyzer import build_resolved_call_adjacency, trace_call_chain
+from app.engine_ast.callgraph import CallGraph, get_call_graph
+
+
+def legacy_trace_call_chain(unified_model, start_function, target_function, max_depth=8):
+    """The list-based BFS trace_call_chain used before CallGraph existed."""
+    adjacency = build_resolved_call_adjacency(unified_model)
+    if start_function == target_function:
+        return [start_function]
+    queue = [(start_function, [start_function], 0)]
+    seen = {start_function}
+    while queue:
+        node, path, depth = queue.pop(0)
+        if depth >= max_depth:
+            continue
+        for nxt in adjacency.get(node, []):
+            if nxt == target_function:
+                return path + [nxt]
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append((nxt, path + [nxt], depth + 1))
+    return None
+
+
+def random_model(seed: int, node_count: int = 60, edge_count: int = 150):
+    rng = random.Random(seed)
+    names = [f"m{rng.randrange(5)}.f{i}" for i in range(node_count)]
+    edges = [
+        {"from": rng.choice(names), "to": rng.choice(names)}
+        for _ in range(edge_count)
+    ]
+    edges.sort(key=lambda e: (e["from"], e["to"]))
+    return {"metadata": {"resolved_call_edges": edges}}, names
+
+
+class CallGraphTests(unittest.TestCase):
+    def test_adjacency_matches_legacy_builder(self):
+        model, _ = random_model(0)
+        self.assertEqual(CallGraph.from_model(model).adjacency(), build_resolved_call_adjacency(model))
+
+    def test_trace_matches_legacy_bfs(self):
+        for seed in range(5):
+            model, names = random_model(seed)
+            graph = CallGraph.from_model(model)
+            rng = random.Random(seed)
+            for _ in range(80):
+                start, target = rng.choice(names), rng.choice(names + ["missing.fn"])
+                max_depth = rng.randrange(1, 6)
+                with self.subTest(seed=seed, start=start, target=target, max_depth=max_depth):
+                    expected = legacy_trace_call_chain(model, start, target, max_depth)
+                    self.assertEqual(trace_call_chain(model, start, target, max_depth, call_graph=graph), expected)
+                    bidirectional = graph.shortest_path(start, target, max_depth)
+                    if expected is None:
+                        self.assertIsNone(bidirectional)
+                        continue
+                    self.assertEqual(len(bidirectional), len(expected))
+                    self.assertEqual((bidirectional[0], bidirectional[-1]), (start, target))
+                    for src, dst in zip(bidirectional, bidirectional[1:]):
+                        self.assertIn(dst, graph.callees(src))
+
+    def test_graph_is_built_once_per_model(self):
+        model, names = random_model(1)
+        with mock.patch.object(CallGraph, "from_edges", wraps=CallGraph.from_edges) as from_edges:
+            for target in names[:10]:
+                trace_call_chain(model, names[0], target)
+            self.assertEqual(from_edges.call_count, 1)
+            rebuilt = dict(model, metadata=dict(model["metadata"], resolved_call_edges=[]))
+            self.assertIsNot(get_call_graph(rebuilt), get_call_graph(model))
+            self.assertEqual(from_edges.call_count, 2)
+
+    def test_callers_and_unknown_names(self):
+        graph = CallGraph.from_edges([
+            {"from": "a.run", "to": "b.go"},
+            {"from": "c.main", "to": "b.go"},
+            {"from": "a.run", "to": "b.go"},
+        ])
+        self.assertEqual(graph.callers("b.go"), ["a.run", "c.main"])
+        self.assertEqual(graph.edge_count, 2)
+        self.assertEqual(graph.callees("nope"), [])
+        self.assertEqual(graph.trace("nope", "nope"), ["nope"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import json
+import tempfile
+import unittest
+from app.engine_ast.analyzer import build_unified_model
+from app.engine_ast.compact import CompactModel
+from test_analyzer import write_repo
+
+
+class CompactModelTests(unittest.TestCase):
+    def test_round_trip_is_lossless(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            model = build_unified_model(repo)
+        model["files"]["main.py"]["source"] = "print('hi')\n"
+        compact = CompactModel.from_model(model)
+        self.assertEqual(json.dumps(compact.to_model()), json.dumps(model))
+        self.assertEqual(
+            list(compact.iter_edges()),
+            [(edge["from"], edge["to"]) for edge in model["metadata"]["resolved_call_edges"]]
+        )
+        # Each qualified name is stored once no matter how often it is referenced.
+        self.assertEqual(len(compact.symbols.names), len(set(compact.symbols.names)))
+
+    def test_unexpected_shapes_survive(self):
+        model = {
+            "files": {
+                "a.py": {"functions": {"f": None, "g": {"calls": "oops", "lineno": True}}, "imports": [1]},
+                "b.py": [],
+            },
+            "metadata": {"resolved_call_edges": [{"to": "x", "from": "y"}], "called_by": None},
+            "extra": {"k": 1},
+        }
+        self.assertEqual(json.dumps(CompactModel.from_model(model).to_model()), json.dumps(model))
+        self.assertEqual(CompactModel.from_model({}).to_model(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
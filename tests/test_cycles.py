@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import unittest
+from app.engine_ast.cycles import build_dependency_structure
+
+
+class DependencyStructureTests(unittest.TestCase):
+    def test_cycles_condensation_and_layers(self):
+        structure = build_dependency_structure({
+            "app.py": ["a.py", "util.py"],
+            "a.py": ["b.py"],
+            "b.py": ["a.py", "util.py"],
+            "util.py": [],
+            "self.py": ["self.py"],
+        })
+        self.assertEqual(structure["cycles"], [["a.py", "b.py"], ["self.py"]])
+        components = structure["components"]
+        by_file = {f: comp for comp, files in enumerate(components) for f in files}
+        for importer, imported in structure["condensation_edges"]:
+            self.assertGreater(importer, imported)
+        self.assertEqual(
+            [sorted(f for comp in layer for f in components[comp]) for layer in structure["layers"]],
+            [["self.py", "util.py"], ["a.py", "b.py"], ["app.py"]]
+        )
+        self.assertIn([by_file["app.py"], by_file["a.py"]], structure["condensation_edges"])
+
+    def test_deep_chain_has_no_recursion_limit(self):
+        graph = {f"m{i}.py": [f"m{i + 1}.py"] for i in range(5000)}
+        graph["m5000.py"] = ["m0.py"]
+        structure = build_dependency_structure(graph)
+        self.assertEqual(len(structure["cycles"]), 1)
+        self.assertEqual(len(structure["cycles"][0]), 5001)
+        self.assertEqual(structure["layers"], [[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
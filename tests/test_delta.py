@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import tempfile
+import unittest
+from app.engine_ast.analyzer import build_unified_model
+from app.engine_rag.chunker import SmartChunker
+from app.engine_rag.delta import CONTENT_HASH_KEY, ChunkDelta
+from test_analyzer import write_repo
+
+
+def chunk_repo(repo):
+    return SmartChunker(model=build_unified_model(repo), repo_base_path=repo).extract_chunks()
+
+
+def stored(chunks):
+    return {chunk["id"]: dict(chunk["metadata"]) for chunk in chunks}
+
+
+class ChunkDeltaTests(unittest.TestCase):
+    def test_unchanged_repo_uploads_nothing(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            chunks = chunk_repo(repo)
+            self.assertEqual(chunks, chunk_repo(repo))
+        self.assertTrue(all(CONTENT_HASH_KEY in chunk["metadata"] for chunk in chunks))
+
+        delta = ChunkDelta(stored(chunks))
+        self.assertEqual(list(delta.filter(chunks)), [])
+        self.assertEqual(delta.stats(), {"changed": 0, "metadata_only": 0, "unchanged": len(chunks), "stale": 0})
+
+    def test_edits_shifts_and_deletions(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            write_repo(repo, {
+                "mod.py": "def first():\n    return 1\n\n\ndef second():\n    return 2\n\n\ndef gone():\n    pass\n",
+            })
+            before = chunk_repo(repo)
+            # first() grows by a line, which shifts second(); gone() is removed.
+            write_repo(repo, {
+                "mod.py": "def first():\n    x = 1\n    return x\n\n\ndef second():\n    return 2\n",
+            })
+            after = chunk_repo(repo)
+
+        delta = ChunkDelta(stored(before))
+        changed = [chunk["id"] for chunk in delta.filter(after)]
+        self.assertIn("mod.first", changed)
+        self.assertNotIn("mod.second", changed)
+        self.assertIn("mod.second", [item["id"] for item in delta.metadata_updates])
+        self.assertEqual(delta.stale_ids(), ["mod.gone"])
+        self.assertGreater(delta.unchanged, 0)
+
+    def test_records_without_hash_are_reuploaded(self):
+        chunk = {"id": "a.f", "text": "def f(): pass", "metadata": {CONTENT_HASH_KEY: "x", "type": "function"}}
+        delta = ChunkDelta({"a.f": {"type": "function"}, "b.g": {}})
+        self.assertEqual(list(delta.filter([chunk])), [chunk])
+        self.assertEqual(delta.stale_ids(), ["b.g"])
+
+
+if __name__ == "__main__":
+    unittest.main()
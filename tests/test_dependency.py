@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import itertools
+import unittest
+from app.engine_ast.analyzer import build_module_alias_map
+from app.engine_ast.dependency import ModuleResolver, build_module_index, import_to_file
+
+
+FILES = [
+    "app/__init__.py", "app/core.py", "app/core/__init__.py", "src/app/core.py",
+    "src/pkg/mod.py", "pkg/mod.py", "tests/pkg/mod.py", "docs/conf.py", "conf.py",
+    "a/b/c.py", "a/b.py",
+]
+
+
+class ModuleResolverTests(unittest.TestCase):
+    def test_matches_import_to_file(self):
+        module_index = build_module_index(dict.fromkeys(FILES))
+        resolver = ModuleResolver.from_files(FILES)
+        parts = ["app", "core", "pkg", "mod", "a", "b", "c", "conf", "tests", "docs", "src", "x", ""]
+        names = [
+            ".".join(combo)
+            for length in (1, 2, 3, 4)
+            for combo in itertools.product(parts, repeat=length)
+        ]
+        expected = {name: import_to_file(name, module_index) for name in names}
+        self.assertEqual({name: resolver.resolve(name) for name in names}, expected)
+        # Second pass is served from the memo
+        self.assertEqual({name: resolver.resolve(name) for name in names}, expected)
+
+    def test_shares_the_analyzer_alias_map(self):
+        resolver = ModuleResolver.from_files(FILES)
+        self.assertEqual(resolver.alias_map, build_module_alias_map(sorted(FILES)))
+        self.assertEqual(resolver.canonicalize("pkg.mod"), "src.pkg.mod")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import unittest
+from app.engine_ast.flowchart.flow_builder import build_graph_from_analysis
+
+
+class FlowBuilderTests(unittest.TestCase):
+    def test_matches_per_call_file_scan(self):
+        from bench_flow_builder import legacy_build_graph_from_analysis, synthetic_model
+
+        for seed in range(3):
+            model = synthetic_model(60, 3, 3, seed=seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(build_graph_from_analysis(model), legacy_build_graph_from_analysis(model))
+
+    def test_call_to_own_function_targets_next_definer(self):
+        model = {"files": {
+            "a.py": {"functions": {"run": {"calls": ["run", "helper"]}}},
+            "b.py": {"functions": {"helper": {"calls": []}}},
+            "c.py": {"functions": {"run": {"calls": []}}},
+        }}
+        calls = [e for e in build_graph_from_analysis(model)["edges"] if e["type"] == "calls"]
+        self.assertEqual([(e["source"], e["target"]) for e in calls], [("a_py", "c_py"), ("a_py", "b_py")])
+
+
+if __name__ == "__main__":
+    unittest.main()
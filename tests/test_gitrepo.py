@@ -0,0 +1,134 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from app.engine_ast.analyzer import UnreadableSource, build_unified_model
+from app.engine_ast.gitrepo import (
+    clone_bytes_report, list_tree_blobs, load_checkout_sources, load_git_sources, sparse_clone
+)
+from app.engine_rag.chunker import SmartChunker
+from test_analyzer import write_repo
+
+
+def git(cwd: str, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", "-c", "core.autocrlf=false", *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class GitObjectSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work = os.path.join(self.temp_dir.name, "work")
+        write_repo(self.work)
+        write_repo(self.work, {
+            "pyproject.toml": "[tool.codesherpa]\nexclude = [\"scripts/\"]\n",
+            "scripts/tool.py": "def tool():\n    pass\n",
+            "tests/test_x.py": "def test_x():\n    pass\n",
+        })
+        Path(self.work, "crlf.py").write_bytes(b"def a():\r\n    return b()\r\n\r\ndef b():\r\n    pass\r\n")
+        os.symlink("main.py", os.path.join(self.work, "alias.py"))
+        git(self.work, "init", "-q")
+        git(self.work, "add", "-A")
+        git(self.work, "commit", "-q", "-m", "init")
+        self.bare = os.path.join(self.temp_dir.name, "repo.git")
+        git(self.temp_dir.name, "clone", "-q", "--bare", self.work, self.bare)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_sources_match_checkout_discovery(self):
+        sources = load_git_sources(self.bare)
+        self.assertEqual(list(sources), [
+            "broken.py", "crlf.py", "main.py", "service.py", "utils/__init__.py", "utils/helpers.py"
+        ])
+        self.assertEqual(sources["crlf.py"], Path(self.work, "crlf.py").read_text(encoding="utf-8"))
+        self.assertNotIn("alias.py", list_tree_blobs(self.bare))
+
+    def test_model_and_chunks_match_checkout(self):
+        sources = load_git_sources(self.bare)
+        from_objects = build_unified_model(self.bare, sources=sources)
+        os.remove(os.path.join(self.work, "alias.py"))
+        git(self.work, "rm", "-q", "--cached", "alias.py")
+        self.assertEqual(from_objects, build_unified_model(self.work))
+
+        analysis_file = os.path.join(self.temp_dir.name, "analysis.json")
+        Path(analysis_file).write_text(json.dumps(from_objects), encoding="utf-8")
+        self.assertEqual(
+            SmartChunker(analysis_file, None, sources=sources).extract_chunks(),
+            SmartChunker(analysis_file, self.work).extract_chunks()
+        )
+
+    def test_checkout_sources_feed_analysis_and_chunker_in_memory(self):
+        sources = load_checkout_sources(self.work)
+        self.assertEqual(sources["crlf.py"], Path(self.work, "crlf.py").read_text(encoding="utf-8"))
+        model = build_unified_model(self.work, sources=sources)
+        self.assertEqual(model, build_unified_model(self.work))
+
+        analysis_file = os.path.join(self.temp_dir.name, "analysis.json")
+        Path(analysis_file).write_text(json.dumps(model), encoding="utf-8")
+        self.assertEqual(
+            SmartChunker(model=model, sources=sources).extract_chunks(),
+            SmartChunker(analysis_file, self.work).extract_chunks()
+        )
+
+    def test_undecodable_file_is_reported_as_decode_error(self):
+        Path(self.work, "latin.py").write_bytes(b"name = '\xe9'\n")
+        git(self.work, "add", "latin.py")
+        git(self.work, "commit", "-q", "-m", "latin")
+        with self.assertLogs("app.engine_ast.gitrepo", "WARNING"):
+            sources = load_git_sources(self.work)
+        with self.assertLogs("app.engine_ast.gitrepo", "WARNING"):
+            checkout_sources = load_checkout_sources(self.work)
+        self.assertIsInstance(sources["latin.py"], UnreadableSource)
+        self.assertEqual(sources["latin.py"], checkout_sources["latin.py"])
+        self.assertIn("main.py", sources)
+
+        model = build_unified_model(self.work, sources=sources)
+        parse_errors = {item["file"]: item.get("reason") for item in model["metadata"]["parse_errors"]}
+        self.assertEqual(parse_errors["latin.py"], "decode_error")
+        self.assertIn("latin.py", model["files"])
+        from_disk = build_unified_model(self.work)["metadata"]["parse_errors"]
+        self.assertIn([e for e in model["metadata"]["parse_errors"] if e["file"] == "latin.py"][0], from_disk)
+        SmartChunker(model=model, sources=sources).extract_chunks()
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class SparseCloneTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.origin = os.path.join(self.temp_dir.name, "origin")
+        write_repo(self.origin)
+        Path(self.origin, "assets").mkdir()
+        Path(self.origin, "assets/blob.bin").write_bytes(os.urandom(256 * 1024))
+        git(self.origin, "init", "-q")
+        git(self.origin, "add", "-A")
+        git(self.origin, "commit", "-q", "-m", "init")
+        git(self.origin, "config", "uploadpack.allowFilter", "true")
+        self.url = Path(self.origin).as_uri()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fetches_only_python_blobs(self):
+        sparse_dir = os.path.join(self.temp_dir.name, "sparse")
+        report = sparse_clone(self.url, sparse_dir)
+        self.assertFalse(os.path.exists(os.path.join(sparse_dir, "assets")))
+        self.assertLess(report["clone_object_bytes"] + report["checkout_object_bytes"], 64 * 1024)
+        self.assertGreater(report["checkout_object_bytes"], 0)
+
+        full_dir = os.path.join(self.temp_dir.name, "full")
+        git(self.temp_dir.name, "clone", "-q", "--depth=1", self.url, full_dir)
+        self.assertGreater(clone_bytes_report(full_dir)["clone_object_bytes"], 256 * 1024)
+        self.assertEqual(build_unified_model(sparse_dir), build_unified_model(full_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
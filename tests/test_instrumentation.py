@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import json
+import tempfile
+import unittest
+from app.engine_ast.analyzer import analyze_files, build_unified_model
+from app.instrumentation import Profiler, stage
+from test_analyzer import SAMPLE_REPO, write_repo
+
+
+class ProfilerTests(unittest.TestCase):
+    def test_nested_stages_and_slowest_files(self):
+        profiler = Profiler(top_n=2)
+        with profiler.stage("outer") as record:
+            record["items"] = 3
+            with profiler.stage("inner"):
+                sum(range(10000))
+        with stage(None, "ignored") as record:
+            record["x"] = 1
+        profiler.record_files([("a.py", 0.5, 0.1), ("b.py", 0.1, 0.05), ("c.py", 0.9, 0.2)])
+
+        report = profiler.report()
+        self.assertEqual([(s["stage"], s["depth"]) for s in report["stages"]], [("outer", 0), ("inner", 1)])
+        self.assertEqual(report["stages"][0]["items"], 3)
+        self.assertGreaterEqual(report["stages"][0]["wall_s"], report["stages"][1]["wall_s"])
+        self.assertEqual([item["file"] for item in report["slowest_files"]], ["c.py", "a.py"])
+        self.assertEqual(report["files"]["analyzed"], 3)
+        json.dumps(report)
+        self.assertIn("c.py", profiler.format_report())
+
+    def test_build_records_stages_and_files(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            profiler = Profiler()
+            model = build_unified_model(repo, profiler=profiler)
+            self.assertEqual(model, build_unified_model(repo))
+        report = profiler.report()
+        self.assertEqual([s["stage"] for s in report["stages"]], ["traverse", "analyze", "resolve", "assemble"])
+        self.assertEqual(report["stages"][0]["files"], len(SAMPLE_REPO))
+        self.assertEqual(report["files"]["analyzed"], len(SAMPLE_REPO))
+        self.assertEqual(sorted(item["file"] for item in report["slowest_files"]), sorted(SAMPLE_REPO))
+
+    def test_worker_timings_reach_the_profiler(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            profiler = Profiler()
+            analyze_files(repo, sorted(SAMPLE_REPO), {}, workers=2, min_parallel_files=0, profiler=profiler)
+        self.assertEqual(profiler.file_count, len(SAMPLE_REPO))
+        self.assertGreater(profiler.parse_seconds, 0)
+
+if __name__ == "__main__":
+    unittest.main()
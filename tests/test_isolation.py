@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import multiprocessing
+import signal
+import tempfile
+import unittest
+from unittest import mock
+from app.engine_ast import analyzer
+from app.engine_ast.analyzer import analysis_results_from_model, analyze_source, build_unified_model
+from app.engine_ast.isolation import FileLimits, analyze_isolated
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Long call chains overflow the parser's recursion limit.
+DEEP_SOURCE = "f" + "(x)" * 100000 + "\n"
+
+GOOD_SOURCE = "import os\n\ndef run():\n    return os.getcwd()\n"
+
+real_analyze_tree = analyzer.analyze_tree
+
+
+def misbehaving_analyze_tree(tree, rel_path, module_alias_map, skim=False):
+    """Stand-in analyze_tree that burns CPU, memory or the worker itself for marked files."""
+    if rel_path.endswith("spin.py"):
+        while True:
+            pass
+    if rel_path.endswith("hog.py"):
+        hoard = []
+        while True:
+            hoard.append(bytearray(16 * 1024 * 1024))
+    if rel_path.endswith("crash.py"):
+        os.kill(os.getpid(), signal.SIGKILL)
+    return real_analyze_tree(tree, rel_path, module_alias_map, skim=skim)
+
+
+@unittest.skipUnless(
+    resource is not None and multiprocessing.get_start_method() == "fork",
+    "needs resource limits and forked workers"
+)
+class IsolatedAnalysisTests(unittest.TestCase):
+    def test_limits_fail_single_files_and_the_rest_continues(self):
+        items = [
+            ("a_crash.py", GOOD_SOURCE),
+            ("b_good.py", GOOD_SOURCE),
+            ("c_spin.py", GOOD_SOURCE),
+            ("d_hog.py", GOOD_SOURCE),
+            ("e_deep.py", DEEP_SOURCE),
+            ("f_good.py", GOOD_SOURCE),
+        ]
+        limits = FileLimits(cpu_seconds=1, memory_mb=128)
+        with mock.patch.object(analyzer, "analyze_tree", misbehaving_analyze_tree):
+            results, timings = analyze_isolated(items, {}, limits, worker_count=2)
+
+        reasons = {path: result.get("failure_reason") for path, result in results.items()}
+        self.assertEqual(reasons, {
+            "a_crash.py": "worker_crash",
+            "b_good.py": None,
+            "c_spin.py": "cpu_limit",
+            "d_hog.py": "memory_limit",
+            "e_deep.py": "recursion_limit",
+            "f_good.py": None,
+        })
+        self.assertEqual(results["b_good.py"], analyze_source(GOOD_SOURCE, "b_good.py", {}))
+        self.assertEqual(sorted(path for path, _, _ in timings), [path for path, _ in items])
+
+    def test_wall_clock_watchdog(self):
+        items = [("sleep.py", GOOD_SOURCE), ("good.py", GOOD_SOURCE)]
+
+        def sleeping_analyze_tree(tree, rel_path, module_alias_map, skim=False):
+            if rel_path == "sleep.py":
+                signal.pause()
+            return real_analyze_tree(tree, rel_path, module_alias_map, skim=skim)
+
+        limits = FileLimits(cpu_seconds=1, memory_mb=None)
+        with mock.patch("app.engine_ast.isolation.WALL_LIMIT_SLACK_SECONDS", 0), \
+                mock.patch.object(analyzer, "analyze_tree", sleeping_analyze_tree):
+            results, _ = analyze_isolated(items, {}, limits)
+        self.assertEqual(results["sleep.py"]["failure_reason"], "timeout")
+        self.assertNotIn("failure_reason", results["good.py"])
+
+    def test_worker_exit_after_last_result(self):
+        items = [("a.py", GOOD_SOURCE), ("b.py", GOOD_SOURCE)]
+
+        def exiting_worker(conn, module_alias_map, skim, limits):
+            for file_rel_path, source in conn.recv():
+                conn.send((file_rel_path, analyze_source(source, file_rel_path, module_alias_map), 0.0, 0.0))
+            os._exit(0)
+
+        with mock.patch("app.engine_ast.isolation.isolated_worker", exiting_worker):
+            results, timings = analyze_isolated(items, {}, FileLimits(cpu_seconds=1, memory_mb=None))
+        self.assertEqual(results, {path: analyze_source(source, path, {}) for path, source in items})
+        self.assertEqual(len(timings), 2)
+
+    def test_model_records_reasons_in_parse_errors(self):
+        with tempfile.TemporaryDirectory() as repo:
+            for name, source in [("main.py", GOOD_SOURCE), ("deep.py", DEEP_SOURCE), ("spin.py", GOOD_SOURCE)]:
+                with open(os.path.join(repo, name), "w", encoding="utf-8") as f:
+                    f.write(source)
+            with mock.patch.object(analyzer, "analyze_tree", misbehaving_analyze_tree):
+                model = build_unified_model(repo, limits=FileLimits(cpu_seconds=1, memory_mb=256))
+
+        parse_errors = {item["file"]: item.get("reason") for item in model["metadata"]["parse_errors"]}
+        self.assertEqual(parse_errors, {"deep.py": "recursion_limit", "spin.py": "cpu_limit"})
+        self.assertIn("run", model["files"]["main.py"]["functions"])
+        self.assertEqual(analysis_results_from_model(model)["spin.py"]["failure_reason"], "cpu_limit")
+
+
+class FileLimitsTests(unittest.TestCase):
+    def test_from_env(self):
+        with mock.patch.dict(os.environ, {"SHERPA_FILE_LIMITS": "off"}):
+            self.assertIsNone(FileLimits.from_env())
+        with mock.patch.dict(os.environ, {"SHERPA_FILE_CPU_SECONDS": "5"}):
+            os.environ.pop("SHERPA_FILE_LIMITS", None)
+            self.assertIsNone(FileLimits.from_env())
+        with mock.patch.dict(
+            os.environ, {"SHERPA_FILE_LIMITS": "on", "SHERPA_FILE_CPU_SECONDS": "5", "SHERPA_FILE_MEMORY_MB": "0"}
+        ):
+            limits = FileLimits.from_env()
+        self.assertEqual((limits.cpu_seconds, limits.memory_mb), (5, None))
+
+    def test_in_process_recursion_failure_has_reason(self):
+        result = analyze_source(DEEP_SOURCE, "deep.py", {})
+        self.assertEqual(result["failure_reason"], "recursion_limit")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import shutil
+import subprocess
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from app.engine_ast.parser import FileTraverser, get_python_files, iter_python_files
+
+
+def touch(root: str, *rel_paths: str) -> None:
+    for rel_path in rel_paths:
+        path = Path(root) / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n", encoding="utf-8")
+
+
+def walk_and_sort(root: str) -> list:
+    """Reference: the os.walk + global sort traversal with the built-in excludes."""
+    root_path = Path(root).resolve()
+    found = []
+    for current, dirs, files in os.walk(root_path):
+        dirs[:] = [
+            d for d in dirs
+            if d not in FileTraverser.EXCLUDED_DIRS and not d.startswith(".") and not d.endswith(".egg-info")
+        ]
+        for file_name in files:
+            if file_name.endswith(".py") and not file_name.startswith("."):
+                rel = os.path.relpath(os.path.join(current, file_name), root_path)
+                found.append(rel.replace(os.sep, "/"))
+    return sorted(found)
+
+
+class IterPythonFilesTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        touch(
+            self.root,
+            "a.py", "a/b.py", "a-b.py", "a0.py", "a/c/d.py", "A.py",
+            "pkg.egg-info/x.py", "venv/lib.py", ".hidden/y.py", ".dot.py",
+            "notes.txt", "z/__init__.py",
+        )
+        os.symlink(os.path.join(self.root, "a"), os.path.join(self.root, "linked"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_sorted_stream_matches_walk_and_sort(self):
+        self.assertEqual(list(iter_python_files(self.root, sort=True)), walk_and_sort(self.root))
+        self.assertEqual(get_python_files(self.root), walk_and_sort(self.root))
+
+    def test_unsorted_stream_yields_same_set_lazily(self):
+        stream = iter_python_files(self.root)
+        self.assertIsInstance(stream, types.GeneratorType)
+        self.assertEqual(sorted(stream), walk_and_sort(self.root))
+
+
+class IgnoreRulesTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        touch(
+            self.root,
+            "app/main.py", "app/api_pb2.py", "app/keep_pb2.py", "app/gen/out.py",
+            "vendor/lib/x.py", "lib/vendor/y.py", "deep/a/b/cache/z.py",
+            "pkg/sub/data.py", "pkg/sub/kept.py", "root_only.py", "nested/root_only.py",
+            "pkg.egg-info/meta.py", "notes/#memo.py",
+        )
+        Path(self.root, ".gitignore").write_text(
+            "# generated stubs\n*_pb2.py\n!keep_pb2.py\n/vendor/\n**/cache/\n/root_only.py\n\\#memo.py\n",
+            encoding="utf-8"
+        )
+        Path(self.root, "pkg/sub/.gitignore").write_text("*.py\n!kept.py\n", encoding="utf-8")
+        Path(self.root, "app/.gitignore").write_text("gen\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_gitignore_rules(self):
+        self.assertEqual(get_python_files(self.root), [
+            "app/keep_pb2.py",
+            "app/main.py",
+            "lib/vendor/y.py",
+            "nested/root_only.py",
+            "pkg/sub/kept.py",
+        ])
+
+    @unittest.skipUnless(shutil.which("git"), "git not installed")
+    def test_agrees_with_git_check_ignore(self):
+        subprocess.run(["git", "init", "-q", self.root], check=True)
+        listed = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard", "--", "*.py"],
+            cwd=self.root, capture_output=True, text=True, check=True
+        ).stdout.split()
+        expected = sorted(path for path in listed if not path.startswith("pkg.egg-info/"))
+        self.assertEqual(get_python_files(self.root, discovery="walk"), expected)
+
+    def test_bracket_expressions(self):
+        with tempfile.TemporaryDirectory() as root:
+            touch(root, "]x.py", "ax.py", "bx.py", "1n.py", "n1.py", "b]c.py", "bqc.py")
+            Path(root, ".gitignore").write_text("[]a]x.py\n[[:digit:]]*.py\nb[!]]c.py\n", encoding="utf-8")
+            self.assertEqual(get_python_files(root), ["b]c.py", "bx.py", "n1.py"])
+
+    def test_invalid_patterns_are_skipped(self):
+        with tempfile.TemporaryDirectory() as root:
+            touch(root, "a.py", "z.py", "[].py", "gone.py")
+            Path(root, ".gitignore").write_text("[z-a].py\n[]\n[[:bogus:]].py\ngone.py\n", encoding="utf-8")
+            self.assertEqual(get_python_files(root), ["[].py", "a.py", "z.py"])
+
+    def test_gitignore_can_be_disabled(self):
+        files = get_python_files(self.root, use_gitignore=False)
+        self.assertIn("vendor/lib/x.py", files)
+        self.assertNotIn("pkg.egg-info/meta.py", files)
+
+    def test_project_config_include_and_exclude(self):
+        Path(self.root, "pyproject.toml").write_text(
+            "[tool.codesherpa]\ninclude = [\"app/\", \"nested/\"]\nexclude = [\"nested/\", \"!app/gen/\"]\n",
+            encoding="utf-8"
+        )
+        self.assertEqual(get_python_files(self.root), ["app/gen/out.py", "app/keep_pb2.py", "app/main.py"])
+        self.assertEqual(get_python_files(self.root, include=["lib/"]), [
+            "app/gen/out.py", "app/keep_pb2.py", "app/main.py", "lib/vendor/y.py"
+        ])
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class GitIndexDiscoveryTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        touch(self.root, "app/main.py", "app/util.py", "tests/test_main.py", "venv/site.py", "data/big.csv")
+        subprocess.run(["git", "init", "-q", self.root], check=True)
+        subprocess.run(["git", "add", "-f", "app", "tests", "venv", "data"], cwd=self.root, check=True)
+        touch(self.root, "app/untracked.py", "scratch/junk.py", "build_out/gen.py")
+        Path(self.root, ".gitignore").write_text("scratch/\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lists_tracked_python_files_only(self):
+        self.assertEqual(get_python_files(self.root), ["app/main.py", "app/util.py"])
+        self.assertEqual(get_python_files(self.root, discovery="git"), ["app/main.py", "app/util.py"])
+
+    def test_untracked_files_are_opt_in(self):
+        expected = ["app/main.py", "app/untracked.py", "app/util.py", "build_out/gen.py"]
+        self.assertEqual(get_python_files(self.root, include_untracked=True), expected)
+        self.assertEqual(get_python_files(self.root, discovery="walk"), expected)
+
+    def test_skips_tracked_files_deleted_from_working_tree(self):
+        os.remove(os.path.join(self.root, "app/util.py"))
+        self.assertEqual(get_python_files(self.root), ["app/main.py"])
+
+    def test_subdirectory_and_non_repo_fallback(self):
+        self.assertEqual(get_python_files(os.path.join(self.root, "app"), discovery="git"), ["main.py", "util.py"])
+        with tempfile.TemporaryDirectory() as plain_dir:
+            touch(plain_dir, "solo.py")
+            self.assertEqual(get_python_files(plain_dir, discovery="git"), ["solo.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
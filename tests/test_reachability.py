@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import random
+import tempfile
+import unittest
+from app.engine_ast.analyzer import build_unified_model
+from app.engine_ast.callgraph import IndexedGraph
+from app.engine_ast.reachability import ReachabilityIndex, find_dead_code_candidates
+from test_analyzer import SAMPLE_REPO, write_repo
+
+
+def walk(adjacency, start):
+    seen, stack = set(), [start]
+    while stack:
+        for nxt in adjacency.get(stack.pop(), []):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+class ReachabilityIndexTests(unittest.TestCase):
+    def test_matches_graph_walks(self):
+        rng = random.Random(7)
+        names = [f"n{i}" for i in range(40)]
+        pairs = [(rng.choice(names), rng.choice(names)) for _ in range(70)]
+        forward, backward = {}, {}
+        for src, dst in pairs:
+            forward.setdefault(src, []).append(dst)
+            backward.setdefault(dst, []).append(src)
+        index = ReachabilityIndex(IndexedGraph.from_name_pairs(pairs, nodes=names))
+        for name in names:
+            with self.subTest(name=name):
+                self.assertEqual(index.reachable_from(name), sorted(walk(forward, name) - {name}))
+                self.assertEqual(index.impact_set(name), sorted(walk(backward, name) - {name}))
+                for other in names[:10]:
+                    self.assertEqual(index.reaches(name, other), other == name or other in walk(forward, name))
+
+
+class ModelReachabilityTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        write_repo(self.temp_dir.name, dict(SAMPLE_REPO, **{
+            "legacy.py": "from utils.helpers import format_name\n\n\ndef old():\n    return format_name('x')\n",
+        }))
+        self.model = build_unified_model(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_file_impact_set(self):
+        index = ReachabilityIndex.for_file_graph(self.model)
+        self.assertEqual(index.impact_set("utils/helpers.py"), ["legacy.py", "main.py"])
+        self.assertEqual(index.impact_set("service.py"), ["main.py"])
+        self.assertTrue(index.reaches("main.py", "utils/helpers.py"))
+        self.assertFalse(index.reaches("utils/helpers.py", "main.py"))
+
+    def test_dead_code_candidates(self):
+        self.assertEqual(find_dead_code_candidates(self.model), ["legacy.old"])
+        calls = ReachabilityIndex.for_call_graph(self.model)
+        self.assertEqual(calls.impact_set("service.Service.log"), ["main.run", "service.Service.handle"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import json
+import tempfile
+import unittest
+from app.engine_ast.analyzer import build_unified_model
+from app.engine_ast.serialization import MAGIC, detect_format, read_model, write_model
+from app.engine_rag.chunker import SmartChunker
+from test_analyzer import write_repo
+
+
+class SerializationTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.repo = os.path.join(self.temp_dir.name, "repo")
+        os.makedirs(self.repo)
+        write_repo(self.repo)
+        self.model = build_unified_model(self.repo)
+        self.model["files"]["main.py"]["source"] = "print('héllo')\n"
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_round_trip_in_both_formats(self):
+        for fmt in ("json", "binary"):
+            with self.subTest(format=fmt):
+                write_model(self.model, self.path(fmt), format=fmt)
+                self.assertEqual(detect_format(self.path(fmt)), fmt)
+                # Key order survives too, not just equality.
+                self.assertEqual(json.dumps(read_model(self.path(fmt))), json.dumps(self.model))
+
+        with open(self.path("binary"), "rb") as f:
+            self.assertEqual(f.read(len(MAGIC)), MAGIC)
+        self.assertLess(os.path.getsize(self.path("binary")), os.path.getsize(self.path("json")))
+
+    def test_unexpected_shapes_survive(self):
+        model = {
+            "metadata": {"called_by": {"f": [1]}, "resolved_call_edges": [{"to": "x", "from": "y"}]},
+            "files": [],
+            "extra": None,
+        }
+        write_model(model, self.path("odd"))
+        self.assertEqual(json.dumps(read_model(self.path("odd"))), json.dumps(model))
+        write_model({}, self.path("empty"))
+        self.assertEqual(read_model(self.path("empty")), {})
+
+    def test_truncated_file_raises(self):
+        write_model(self.model, self.path("model"))
+        with open(self.path("model"), "rb") as f:
+            data = f.read()
+        with open(self.path("model"), "wb") as f:
+            f.write(data[:-3])
+        with self.assertRaises(ValueError):
+            read_model(self.path("model"))
+
+    def test_chunker_reads_binary(self):
+        write_model(self.model, self.path("analysis.json"), format="json")
+        write_model(self.model, self.path("analysis.bin"), format="binary")
+        self.assertEqual(
+            SmartChunker(self.path("analysis.bin"), self.repo).extract_chunks(),
+            SmartChunker(self.path("analysis.json"), self.repo).extract_chunks()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import ast
+import glob
+import textwrap
+import unittest
+from app.engine_ast.analyzer import analyze_tree
+from app.engine_ast.skim import hollow_function_bodies, parse_outline
+
+
+TRICKY_SOURCE = '''
+import os
+
+
+@decorator(
+    option="(",
+)
+def decorated(a,
+              b=")"):
+    """Docstring with def inside
+def fake():
+    pass
+"""
+    text = "# not a comment ["
+    value = (a +
+b)
+    return \\
+        value
+    # trailing comment at function level
+
+
+# comment at module level
+class Outer:
+    attr = {"key": [1, 2,
+        3]}
+
+    async def method(self):
+        return f"{self!r:>{10}}"
+
+    def one_liner(self): return 1
+
+    class Inner:
+        def deep(self):
+            if True:
+                return r"\\\\"
+
+try:
+    from fast import thing
+except ImportError:
+    def thing():
+        return None
+else:
+    pass
+
+if __name__ == "__main__":
+    decorated(1, 2)
+'''
+
+
+def statement_spans(statements):
+    spans = []
+    for node in statements:
+        spans.append((type(node).__name__, node.lineno, node.end_lineno))
+        if isinstance(node, ast.ClassDef):
+            spans.extend(statement_spans(node.body))
+        for field in ("orelse", "finalbody", "handlers"):
+            spans.extend(statement_spans(getattr(node, field, [])))
+    return spans
+
+
+class SkimParseTests(unittest.TestCase):
+    def assert_outline_matches(self, source, rel_path="mod.py"):
+        full = ast.parse(source)
+        outline = parse_outline(source, rel_path)
+        self.assertEqual(statement_spans(outline.body), statement_spans(full.body))
+        self.assertEqual(
+            analyze_tree(outline, rel_path, {}, skim=True),
+            analyze_tree(full, rel_path, {}, skim=True)
+        )
+
+    def test_tricky_source(self):
+        source = textwrap.dedent(TRICKY_SOURCE)
+        self.assert_outline_matches(source)
+        hollowed, end_lines = hollow_function_bodies(source)
+        self.assertNotIn("fake", hollowed)
+        self.assertEqual(len(hollowed.split("\n")), len(source.split("\n")))
+        self.assertEqual(len(end_lines), 4)
+
+    def test_backend_sources(self):
+        backend = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+        for file_path in sorted(glob.glob(os.path.join(backend, "app", "**", "*.py"), recursive=True)):
+            with open(file_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            with self.subTest(file=file_path):
+                self.assert_outline_matches(source)
+
+    def test_syntax_errors_still_raise(self):
+        with self.assertRaises(SyntaxError):
+            parse_outline("def oops(:\n", "broken.py")
+        with self.assertRaises(SyntaxError):
+            parse_outline("x = '''unterminated\n", "broken.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
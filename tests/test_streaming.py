@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import tempfile
+import threading
+import unittest
+from app.engine_ast.analyzer import build_unified_model
+from app.engine_rag.chunker import SmartChunker
+from app.engine_rag.streaming import prefetch
+from test_analyzer import write_repo
+
+
+class StreamingTests(unittest.TestCase):
+    def test_prefetch_preserves_order_and_stays_bounded(self):
+        produced = []
+        consumed = []
+        lead = []
+
+        def numbers():
+            for number in range(50):
+                produced.append(number)
+                yield number
+
+        for number in prefetch(numbers(), max_pending=3):
+            # Produced but not yet consumed: at most the queue plus the item in hand.
+            lead.append(len(produced) - len(consumed))
+            consumed.append(number)
+        self.assertEqual(consumed, list(range(50)))
+        self.assertLessEqual(max(lead), 5)
+
+    def test_prefetch_reraises_producer_errors(self):
+        def failing():
+            yield 1
+            raise RuntimeError("boom")
+
+        stream = prefetch(failing())
+        self.assertEqual(next(stream), 1)
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            next(stream)
+
+    def test_closing_early_stops_producer(self):
+        before = threading.active_count()
+        stream = prefetch(iter(range(10 ** 9)), max_pending=2)
+        self.assertEqual(next(stream), 0)
+        stream.close()
+        self.assertEqual(threading.active_count(), before)
+
+    def test_chunk_stream_matches_extract_chunks(self):
+        with tempfile.TemporaryDirectory() as repo:
+            write_repo(repo)
+            chunker = SmartChunker(model=build_unified_model(repo), repo_base_path=repo)
+            self.assertEqual(list(prefetch(chunker.iter_chunks(), max_pending=1)), chunker.extract_chunks())
+
+
+if __name__ == "__main__":
+    unittest.main()
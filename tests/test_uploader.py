@@ -0,0 +1,108 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import threading
+import time
+import unittest
+from app.engine_rag.uploader import MIN_BATCH_BYTES, BatchUploader, UploadError, chunk_payload_bytes
+
+
+def make_chunks(count, text_size=100):
+    return [
+        {"id": f"mod.f{index}", "text": "x" * text_size, "metadata": {"file_path": "mod.py", "start_line": index}}
+        for index in range(count)
+    ]
+
+
+class FakeCollection:
+    """In-process stand-in for a vector store collection: idempotent upsert keyed by id."""
+
+    def __init__(self, failures=0, latency=0.0):
+        self.records = {}
+        self.calls = 0
+        self.failures = failures
+        self.latency = latency
+        self.active = 0
+        self.peak_active = 0
+        self.lock = threading.Lock()
+
+    def upsert(self, batch):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        try:
+            time.sleep(self.latency)
+            if fail:
+                raise ConnectionError("transient")
+            with self.lock:
+                for chunk in batch:
+                    self.records[chunk["id"]] = chunk
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class BatchUploaderTests(unittest.TestCase):
+    def test_concurrent_upload_is_bounded_and_complete(self):
+        store = FakeCollection(latency=0.01)
+        chunks = make_chunks(1000)
+        stats = BatchUploader(store.upsert, max_in_flight=3, max_records=50).upload(iter(chunks))
+        self.assertEqual(set(store.records), {chunk["id"] for chunk in chunks})
+        self.assertEqual((stats["chunks"], stats["batches"], stats["retries"]), (1000, 20, 0))
+        self.assertEqual(stats["bytes"], sum(chunk_payload_bytes(chunk) for chunk in chunks))
+        self.assertLessEqual(store.peak_active, 3)
+        self.assertGreater(store.peak_active, 1)
+        self.assertGreater(stats["chunks_per_second"], 0)
+
+    def test_transient_failures_are_retried_and_shrink_batches(self):
+        store = FakeCollection(failures=2)
+        delays = []
+        uploader = BatchUploader(store.upsert, max_in_flight=1, max_batch_bytes=MIN_BATCH_BYTES * 4, sleep=delays.append)
+        stats = uploader.upload(make_chunks(300, text_size=2000))
+        self.assertEqual(len(store.records), 300)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(len(delays), 2)
+        # Exponential backoff from 0.5 s, with up to 50% jitter.
+        self.assertTrue(0.25 <= delays[0] <= 0.5 and 0.5 <= delays[1] <= 1.0)
+        first_batch = MIN_BATCH_BYTES * 4 // chunk_payload_bytes(make_chunks(1, text_size=2000)[0])
+        self.assertGreater(stats["batches"], 300 // first_batch + 1)
+
+    def test_oversized_batches_are_split_on_retry(self):
+        limit = MIN_BATCH_BYTES * 2
+        accepted = {}
+
+        def size_limited_upsert(batch):
+            if sum(map(chunk_payload_bytes, batch)) > limit:
+                raise ValueError("payload too large")
+            for chunk in batch:
+                accepted[chunk["id"]] = chunk
+
+        chunks = make_chunks(300, text_size=2000)
+        uploader = BatchUploader(
+            size_limited_upsert, max_in_flight=1, max_batch_bytes=MIN_BATCH_BYTES * 16, sleep=lambda seconds: None
+        )
+        stats = uploader.upload(chunks)
+        self.assertEqual(set(accepted), {chunk["id"] for chunk in chunks})
+        self.assertEqual(stats["chunks"], 300)
+        self.assertGreater(stats["retries"], 0)
+
+    def test_exhausted_retries_raise(self):
+        store = FakeCollection(failures=100)
+        uploader = BatchUploader(store.upsert, max_attempts=3, sleep=lambda seconds: None)
+        with self.assertRaises(UploadError):
+            uploader.upload(make_chunks(10))
+        self.assertEqual(store.calls, 3)
+
+    def test_byte_budget_splits_batches(self):
+        uploader = BatchUploader(lambda batch: None, max_records=1000, max_batch_bytes=MIN_BATCH_BYTES)
+        batches = list(uploader.iter_batches(make_chunks(100, text_size=4000)))
+        self.assertTrue(all(sum(map(chunk_payload_bytes, batch)) <= MIN_BATCH_BYTES for batch in batches))
+        self.assertEqual(sum(map(len, batches)), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+import importlib.util
+import tempfile
+import unittest
+from unittest import mock
+
+
+@unittest.skipUnless(importlib.util.find_spec("chromadb"), "chromadb not installed")
+class LocalVectorStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def chunk(self, node_id, text):
+        from app.engine_rag.delta import CONTENT_HASH_KEY, content_hash
+        return {"id": node_id, "text": text, "metadata": {"node_id": node_id, CONTENT_HASH_KEY: content_hash(text)}}
+
+    def test_backend_from_env_and_delta_ingest(self):
+        from app.engine_rag.vector_db import LocalChromaDB, get_vector_store
+
+        env = {"SHERPA_VECTOR_BACKEND": "local", "SHERPA_CHROMA_PATH": self.temp_dir.name}
+        with mock.patch.dict(os.environ, env):
+            db = get_vector_store("test_local")
+        self.assertIsInstance(db, LocalChromaDB)
+
+        first = db.ingest_chunks([self.chunk("m.a", "def a(): pass"), self.chunk("m.b", "def b(): pass")])
+        self.assertEqual((first["chunks"], first["deleted"]), (2, 0))
+        second = db.ingest_chunks([self.chunk("m.a", "def a(): pass")])
+        self.assertEqual((second["chunks"], second["unchanged"], second["deleted"]), (0, 1, 1))
+        self.assertEqual(db.collection.get(ids=["m.a", "m.b"])["ids"], ["m.a"])
+
+    def test_unknown_backend(self):
+        from app.engine_rag.vector_db import get_vector_store
+
+        with self.assertRaises(ValueError):
+            get_vector_store("x", backend="nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,23 +19,12 @@ chunks = chunker.extract_chunks()
 print(f"Extracted {len(chunks)} chunks.")
 
 print("Validating retriever...")
-# To not mess with user's db, we just instantiate a local persistent client
-import chromadb
-client = chromadb.PersistentClient(path="./chroma_test_data")
-collection = client.get_or_create_collection("test_collection")
+# To not mess with user's db, we just use a local persistent store
+from app.engine_rag.vector_db import LocalChromaDB
+db = LocalChromaDB("test_collection", path="./chroma_test_data")
+db.ingest_chunks(chunks)
 
-ids = [c["id"] for c in chunks]
-docs = [c["text"] for c in chunks]
-metas = [c["metadata"] for c in chunks]
-
-# upsert
-collection.upsert(ids=ids, documents=docs, metadatas=metas)
-
-class MockDB:
-    def __init__(self):
-        self.collection = collection
-
-retriever = GraphRetriever(MockDB())
+retriever = GraphRetriever(db)
 result = retriever.retrieve_with_graph_context("what does the file vector_db.py do?", n_results=1)
 print("PRIMARY NODES:")
 for node in result["primary_nodes"]: